@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Generates a batch of hurricane track maps (plot_hurricane_tracks.py) from a job matrix of year ranges, basins, impact
+countries and projections, using a pool of worker processes. Writes a manifest.json of the outputs with the time
+taken by each job.
+
+Example job matrix file:
+{
+  "years": [[2000, 2019], [2010, 2019]],
+  "each_year": [2000, 2019],
+  "basins": ["NA"],
+  "impact": ["US", "na"],
+  "projections": ["PlateCarree", "Robinson"]
+}
+"each_year" adds one job for every year in the [start, end] range. All keys are optional.
+
+Usage: python batch_maps.py IBTrACS.NA.v04r00.nc jobs.json --outdir maps --workers 8 --basemap-cache maps/basemaps
+
+The country index (build_country_index.py) is read from country_index.pkl in the directory of the IBTrACS file unless
+--country-index is given.
+"""
+
+import argparse
+import datetime as dt
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import matplotlib
+matplotlib.use('Agg')
+import plot_hurricane_tracks
+from functions.ragged import get_ragged_tracks
+from functions.countries import load_country_index
+from functions.trace import span, traced
+
+# track data and country index shared by the worker processes
+_shared = dict()
+
+
+def expand_jobs(matrix):
+    """
+    Expands a job matrix into a list of jobs (every combination of years, basin, impact country and projection)
+    :param matrix: dictionary with optional keys years, each_year, basins, impact, projections
+    """
+    years = [list(y) for y in matrix.get('years', [])]
+    if 'each_year' in matrix:
+        years.extend([[yr] for yr in range(matrix['each_year'][0], matrix['each_year'][1] + 1)])
+
+    jobs = []
+    for yrs, bsin, ic, proj in itertools.product(years, matrix.get('basins', ['all']), matrix.get('impact', ['US']),
+                                                 matrix.get('projections', ['PlateCarree'])):
+        jobs.append(dict(years=yrs, basin=bsin, impact=ic, projection=proj))
+    return jobs
+
+
+def job_filename(job):
+    return 'hurricanes{}_{}_{}impact_{}.png'.format('-'.join([str(y) for y in job['years']]), job['basin'],
+                                                   job['impact'], job['projection'])
+
+
+def load_tracks(f):
+    """
+    Loads the track variables used by the maps as memory-mapped ragged arrays. This is done once in the parent process
+    before the worker pool starts (building the track files if needed), so all workers share the same pages instead
+    of each reading the file
+    """
+    return get_ragged_tracks(f, ['time', 'lat', 'lon'])
+
+
+def country_index_file(f, index_file=None):
+    return index_file or os.path.join(os.path.dirname(f), 'country_index.pkl')
+
+
+def init_worker(f, index_file=None):
+    # workers started with the spawn method don't inherit the parent's memory
+    if 'tracks' not in _shared:
+        _shared['tracks'] = load_tracks(f)
+    if 'country_index' not in _shared:
+        _shared['country_index'] = load_country_index(country_index_file(f, index_file))
+
+
+def run_job(f, job, outdir, basemap_cache):
+    """
+    Runs one map job and returns its manifest entry
+    """
+    start = time.time()
+    start_cpu = time.process_time()
+    record = dict(job, output=os.path.join(outdir, job_filename(job)), pid=os.getpid())
+    try:
+        plot_hurricane_tracks.main(f, job['years'], job['impact'], basemap_cache, projection=job['projection'],
+                                   basin=job['basin'], savefile=record['output'], tracks=_shared['tracks'],
+                                   country_index=_shared['country_index'])
+        record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = repr(e)
+    record['seconds'] = round(time.time() - start, 3)
+    record['cpu_seconds'] = round(time.process_time() - start_cpu, 3)
+    return record
+
+
+def print_record(record):
+    if record['status'] == 'ok':
+        print('ok {} ({} s)'.format(record['output'], record['seconds']))
+    else:
+        print('error {}: {}'.format(record['output'], record['error']))
+
+
+@traced()
+def main(f, matrix_file, outdir, workers=None, basemap_cache=None, index_file=None):
+    with open(matrix_file) as fp:
+        jobs = expand_jobs(json.load(fp))
+    # plot_hurricane_tracks saves relative file names in the directory of f, so the outputs need absolute paths
+    outdir = os.path.abspath(outdir)
+    os.makedirs(outdir, exist_ok=True)
+
+    start = time.time()
+    with span('load ragged tracks'):
+        _shared['tracks'] = load_tracks(f)
+    # the country index is read once here (a missing index fails before any job runs) instead of by every job
+    with span('load country index'):
+        _shared['country_index'] = load_country_index(country_index_file(f, index_file))
+
+    # render the first job for each projection before starting the pool, so the basemap cache is populated once
+    # instead of by several workers at the same time
+    manifest = []
+    if basemap_cache is not None:
+        first = dict()
+        for job in jobs:
+            first.setdefault(job['projection'], job)
+        for job in first.values():
+            manifest.append(run_job(f, job, outdir, basemap_cache))
+            print_record(manifest[-1])
+        jobs = [job for job in jobs if job not in first.values()]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(f, index_file)) as executor:
+        futures = [executor.submit(run_job, f, job, outdir, basemap_cache) for job in jobs]
+        for future in as_completed(futures):
+            manifest.append(future.result())
+            print_record(manifest[-1])
+
+    summary = dict(source=os.path.abspath(f), created=dt.datetime.now().isoformat(timespec='seconds'),
+                   workers=workers or os.cpu_count(), njobs=len(manifest),
+                   nerrors=sum([r['status'] != 'ok' for r in manifest]),
+                   total_seconds=round(time.time() - start, 3), jobs=manifest)
+    summary['failed'] = [r['output'] for r in manifest if r['status'] != 'ok']
+    with open(os.path.join(outdir, 'manifest.json'), 'w') as fp:
+        json.dump(summary, fp, indent=2)
+    if summary['nerrors'] > 0:
+        print('{} of {} jobs failed, see {}'.format(summary['nerrors'], summary['njobs'],
+                                                   os.path.join(outdir, 'manifest.json')))
+    return summary
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('file', help='IBTrACS NetCDF file or track store directory')
+    arg_parser.add_argument('matrix', help='JSON job matrix file')
+    arg_parser.add_argument('--outdir', default='.', help='output directory for maps and manifest.json')
+    arg_parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: all cores)')
+    arg_parser.add_argument('--basemap-cache', default=None, help='optional directory for pre-rendered basemaps')
+    arg_parser.add_argument('--country-index', default=None,
+                            help='country index file from build_country_index.py (default: country_index.pkl in the '
+                                 'directory of the file)')
+    args = arg_parser.parse_args()
+    batch = main(args.file, args.matrix, args.outdir, args.workers, args.basemap_cache, args.country_index)
+    sys.exit(1 if batch['nerrors'] > 0 else 0)
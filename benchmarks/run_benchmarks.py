@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Benchmarks the main entry points of the repository on synthetic IBTrACS files (synthetic_ibtracs.py) at one or more
+scales. Each benchmark runs in a fresh process: the first call (which also builds the ragged track files) is timed
+separately, then the best of the repeated calls is recorded with the tracemalloc peak and the maximum resident memory of
+the process. Results are appended to a history file with the git commit and package versions, and a benchmark that is
+slower than the previous result for the same scale by more than the regression threshold is flagged.
+"""
+
+import datetime as dt
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from synthetic_ibtracs import write_synthetic_ibtracs, write_synthetic_country_index
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+
+SYNTHETIC_FILE = 'IBTrACS.synthetic.nc'
+
+
+def summary_args(sDir, scale):
+    return os.path.join(sDir, SYNTHETIC_FILE), list(scale['years']), 'NA'
+
+
+def landfall_args(sDir, scale):
+    return os.path.join(sDir, SYNTHETIC_FILE), list(scale['years'])
+
+
+def effect_size_args(sDir, scale):
+    return (os.path.join(sDir, 'specific_landfall_storms-raw.csv'),
+            os.path.join(sDir, 'NA_landfall_summary_1970-2019.csv'), 1)
+
+
+def hurricane_map_args(sDir, scale):
+    return os.path.join(sDir, SYNTHETIC_FILE), [max(scale['years'][0], scale['years'][1] - 19), scale['years'][1]], 'US'
+
+
+def global_map_args(sDir, scale):
+    return os.path.join(sDir, SYNTHETIC_FILE), [scale['years'][1]], 'global_storms'
+
+
+# benchmark name: (script relative to the repository, function that returns the arguments of main)
+BENCHMARKS = {
+    'hurricane_summary': ('hurricane_summary.py', summary_args),
+    'storms_summary': ('storms_1970-2019/storms_1970-2019_summary.py', landfall_args),
+    'storms_analysis': ('storms_1970-2019/storms_1970-2019_analysis.py', landfall_args),
+    'effect_size_storms': ('storms_1970-2019/effect_size_storms.py', effect_size_args),
+    'plot_hurricane_tracks': ('plot_hurricane_tracks.py', hurricane_map_args),
+    'plot_storm_tracks_global': ('plot_storm_tracks_global.py', global_map_args),
+}
+
+
+def import_script(script):
+    """
+    Imports a script of the repository as a module (some script names contain hyphens)
+    """
+    path = os.path.join(REPO, script)
+    name = os.path.splitext(os.path.basename(path))[0].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def no_basemap(ax, axes_limits=None, dpi=300):
+    # replaces add_map_features: the bathymetry files and Natural Earth coastlines aren't available everywhere
+    if axes_limits is None:
+        ax.set_global()
+    else:
+        ax.set_extent(axes_limits)
+
+
+def scale_name(scale):
+    return '{}storms_{}obs_{}'.format(scale['nstorms'], scale['obs_per_storm'], '-'.join(scale['basins']))
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def package_versions():
+    import xarray as xr
+    import matplotlib
+    return dict(python=platform.python_version(), numpy=np.__version__, pandas=pd.__version__, xarray=xr.__version__,
+                matplotlib=matplotlib.__version__)
+
+
+def prepare_inputs(sDir, scale):
+    """
+    Writes the synthetic IBTrACS file and the summary files the entry points read from the same directory:
+    summary_1970-2019.csv, NA_landfall_summary_1970-2019.csv, summary_northatlantic2000_2019_mod.csv,
+    summary_globalstorms2019_2020.csv and specific_landfall_storms-raw.csv, and a synthetic country_index.pkl
+    :param sDir: directory for the scale
+    :param scale: dictionary of synthetic_ibtracs parameters (nstorms, obs_per_storm, years, basins, landfall_fraction,
+    seed)
+    """
+    import hurricane_summary
+    from functions.track_store import open_tracks, load_track_arrays
+    os.makedirs(sDir, exist_ok=True)
+    f = os.path.join(sDir, SYNTHETIC_FILE)
+    write_synthetic_ibtracs(f, scale['nstorms'], scale['obs_per_storm'], scale['years'], scale['basins'],
+                            scale['landfall_fraction'], scale['seed'])
+    write_synthetic_country_index(os.path.join(sDir, 'country_index.pkl'))
+
+    hurricane_summary.main(*summary_args(sDir, scale))
+    import_script(BENCHMARKS['storms_summary'][0]).main(*landfall_args(sDir, scale))
+
+    # impact flags: storms that come within 111 km of land west of 60W
+    sf = pd.read_csv(os.path.join(sDir, 'summary_1970-2019.csv'), keep_default_na=False, na_values=[''])
+    arrays = load_track_arrays(f, ['lon', 'landfall'], storms=sf['findex'].values)
+    impact = np.any((arrays['landfall'] < 111) & (arrays['lon'] < -60), axis=1)
+    sf['usimpact'] = np.where(impact, 'yes', 'no')
+    sf['canadaimpact'] = 'no'
+    sf['mexicoimpact'] = 'no'
+    sf.to_csv(os.path.join(sDir, 'summary_northatlantic2000_2019_mod.csv'), index=False)
+
+    ncfile = open_tracks(f, variables=['time', 'basin'], decode_times=False)
+    gf = hurricane_summary.summarize_storms(ncfile, [scale['years'][1]], 'all')
+    gf.to_csv(os.path.join(sDir, 'summary_globalstorms2019_2020.csv'))
+
+    # locations near a sample of the landfalls (longitude in positive degrees west)
+    rng = np.random.default_rng(scale['seed'])
+    lf = pd.read_csv(os.path.join(sDir, 'NA_landfall_summary_1970-2019.csv'))
+    lf = lf.sample(n=min(len(lf), 200), random_state=scale['seed'])
+    locs = pd.DataFrame(dict(Year=lf['year'].values, Name=lf['name'].str.title().values,
+                             Lat=np.round(lf['landfall_lat'].values + rng.normal(0, 1, len(lf)), 2),
+                             Lon=np.round(-lf['landfall_lon'].values + rng.normal(0, 1, len(lf)), 2)))
+    locs.to_csv(os.path.join(sDir, 'specific_landfall_storms-raw.csv'), index=False)
+
+
+def run_benchmark(name, sDir, scale, repeat=3, basemap=False):
+    """
+    Runs one benchmark (in a worker process)
+    :param name: benchmark name in BENCHMARKS
+    :param sDir: directory of the scale prepared by prepare_inputs
+    :param scale: dictionary of synthetic_ibtracs parameters
+    :param repeat: number of timed calls after the first call
+    :param basemap: if False (default), add_map_features is replaced by no_basemap
+    :returns dictionary of results (times in seconds, memory in MB)
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    script, get_args = BENCHMARKS[name]
+    module = import_script(script)
+    if not basemap and hasattr(module, 'add_map_features'):
+        module.add_map_features = no_basemap
+    args = get_args(sDir, scale)
+
+    def call():
+        start = time.perf_counter()
+        module.main(*args)
+        plt.close('all')
+        return time.perf_counter() - start
+
+    first = call()
+    seconds = [call() for _ in range(repeat)]
+
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    maxrss = maxrss / 1024 ** 2 if sys.platform == 'darwin' else maxrss / 1024
+    return dict(first_seconds=round(first, 4), seconds=round(min(seconds or [first]), 4),
+                median_seconds=round(float(np.median(seconds or [first])), 4),
+                peak_traced_mb=round(peak / 1024 ** 2, 2), maxrss_mb=round(maxrss, 2))
+
+
+def read_history(history_file):
+    if not os.path.isfile(history_file):
+        return []
+    with open(history_file) as fp:
+        return [json.loads(line) for line in fp if line.strip()]
+
+
+def find_regressions(results, history, threshold=0.2):
+    """
+    Compares each result with the most recent result in the history for the same benchmark and scale
+    :param results: list of result dictionaries of this run
+    :param history: list of result dictionaries of previous runs, oldest first
+    :param threshold: fractional slow-down flagged as a regression, default is 0.2 (20%)
+    :returns dataframe of the results with the previous time, commit and the change
+    """
+    previous = dict()
+    for r in history:
+        previous[(r['benchmark'], json.dumps(r['scale'], sort_keys=True))] = r
+
+    rows = []
+    for r in results:
+        prev = previous.get((r['benchmark'], json.dumps(r['scale'], sort_keys=True)))
+        row = dict(benchmark=r['benchmark'], scale=scale_name(r['scale']), seconds=r['seconds'],
+                   first_seconds=r['first_seconds'], peak_traced_mb=r['peak_traced_mb'], maxrss_mb=r['maxrss_mb'],
+                   previous_seconds=None, previous_commit=None, change=None, regression=False)
+        if prev is not None:
+            row.update(previous_seconds=prev['seconds'], previous_commit=prev['commit'],
+                       change=round(r['seconds'] / prev['seconds'] - 1, 3))
+            row['regression'] = row['change'] > threshold
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def main(outdir, scales, benchmarks=None, repeat=3, basemap=False, threshold=0.2):
+    """
+    :param outdir: output directory for the synthetic files (one directory per scale) and benchmark_history.jsonl
+    :param scales: list of dictionaries of synthetic_ibtracs parameters
+    :param benchmarks: optional list of benchmark names, default is all BENCHMARKS
+    :param repeat: number of timed calls of each benchmark after the first call
+    :param basemap: if True, the maps are drawn with the bathymetry and coastlines (needs the bathymetry files and
+    Natural Earth data)
+    :param threshold: fractional slow-down flagged as a regression
+    """
+    benchmarks = benchmarks or list(BENCHMARKS)
+    history_file = os.path.join(outdir, 'benchmark_history.jsonl')
+    history = read_history(history_file)
+    run_info = dict(commit=git_commit(), created=dt.datetime.now().isoformat(timespec='seconds'),
+                    platform=platform.platform(), versions=package_versions())
+
+    results = []
+    for scale in scales:
+        sDir = os.path.join(outdir, scale_name(scale))
+        prepare_inputs(sDir, scale)
+        for name in benchmarks:
+            # each benchmark runs in a new process so imports, caches and memory don't carry over
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                result = executor.submit(run_benchmark, name, sDir, scale, repeat, basemap).result()
+            results.append(dict(run_info, benchmark=name, scale=scale, repeat=repeat, basemap=basemap, **result))
+            print('{} {}: {} s'.format(scale_name(scale), name, result['seconds']))
+
+    with open(history_file, 'a') as fp:
+        for r in results:
+            fp.write(json.dumps(r) + '\n')
+
+    df = find_regressions(results, history, threshold)
+    print(df)
+    if df['regression'].any():
+        print('Regressions (> {:.0%} slower): {}'.format(threshold, ', '.join(
+            df.loc[df['regression'], 'benchmark'] + ' (' + df.loc[df['regression'], 'scale'] + ')')))
+    return df
+
+
+if __name__ == '__main__':
+    savedir = '/Users/lgarzio/Documents/rucool/hurricanes/benchmarks'
+    benchmark_scales = [dict(nstorms=1000, obs_per_storm=60, years=(1970, 2019), basins=('NA', ), landfall_fraction=0.4,
+                             seed=0),
+                        dict(nstorms=10000, obs_per_storm=60, years=(1970, 2019), basins=('NA', 'EP', 'WP'),
+                             landfall_fraction=0.4, seed=0)]
+    nrepeat = 3  # timed calls of each benchmark after the first call
+    main(savedir, benchmark_scales, repeat=nrepeat)
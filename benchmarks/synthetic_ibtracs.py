@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Generates synthetic IBTrACS-shaped NetCDF files for benchmarks: same dimensions, variable names, data types, units and
+fill values (-9999, -9999000 for time, -15 for usa_sshs) as the IBTrACS v04 files for the variables used in this
+repository. Storms are 3-hourly tracks that drift west and recurve north-east from a genesis region of their basin,
+with a windspeed life cycle, the matching usa_sshs category and pressure, and a configurable fraction of storms that
+make landfall.
+"""
+
+import numpy as np
+import netCDF4
+
+TIME_UNITS = 'days since 1858-11-17 00:00:00'
+NDATE_TIME = 360
+
+# genesis region [min lon, max lon, min lat, max lat] and mean motion (degrees per 3 hours, west and north) of each basin
+BASINS = dict(NA=dict(genesis=[-80, -20, 10, 25], motion=[-0.45, 0.2]),
+              EP=dict(genesis=[-120, -95, 10, 18], motion=[-0.4, 0.12]),
+              WP=dict(genesis=[120, 160, 8, 20], motion=[-0.4, 0.25]),
+              NI=dict(genesis=[60, 95, 8, 18], motion=[-0.2, 0.2]),
+              SI=dict(genesis=[50, 100, -18, -8], motion=[-0.35, -0.2]),
+              SP=dict(genesis=[150, 200, -18, -8], motion=[-0.2, -0.25]))
+
+
+def wind_category(wind):
+    """
+    Saffir-Simpson category (usa_sshs) of each windspeed (kt): -1 TD, 0 TS, 1-5 hurricane categories
+    """
+    return np.searchsorted([34, 64, 83, 96, 113, 137], wind, side='right').astype('int8') - 1
+
+
+def synthetic_tracks(nstorms, obs_per_storm=60, years=(1970, 2019), basins=('NA', ), landfall_fraction=0.4, seed=0):
+    """
+    Generates synthetic storm tracks
+    :param nstorms: number of storms
+    :param obs_per_storm: mean number of 3-hourly observations per storm (at most 360)
+    :param years: (first year, last year) of the storms
+    :param basins: list of basin codes in BASINS, storms are spread evenly over the basins
+    :param landfall_fraction: fraction of storms that make landfall (landfall distance < 111 km)
+    :param seed: random seed
+    :returns dictionary of storm and storm x date_time arrays with IBTrACS fill values
+    """
+    rng = np.random.default_rng(seed)
+    shape = (nstorms, NDATE_TIME)
+    numobs = np.clip(rng.poisson(obs_per_storm, nstorms), 4, NDATE_TIME).astype('int16')
+    valid = np.arange(NDATE_TIME)[None, :] < numobs[:, None]
+    step = np.broadcast_to(np.arange(NDATE_TIME, dtype='float64'), shape)
+
+    # storms sorted by start time, like IBTrACS
+    first = np.datetime64('{}-01-01T00'.format(years[0]), 'h')
+    nsteps = (np.datetime64('{}-01-01T00'.format(years[1] + 1), 'h') - first).astype('int64') // 3
+    t0 = first + np.sort(rng.integers(0, nsteps, nstorms)) * np.timedelta64(3, 'h')
+    tdays = (t0 - np.datetime64('1858-11-17T00', 'h')).astype('float64') / 24
+    time = np.where(valid, tdays[:, None] + step / 8, -9999000.)
+
+    # tracks: drift west, then recurve (away from the equator) and move east
+    basin = np.array(basins)[np.arange(nstorms) % len(basins)]
+    genesis = np.array([BASINS[b]['genesis'] for b in basin], dtype='float64')
+    motion = np.array([BASINS[b]['motion'] for b in basin], dtype='float64')
+    lon0 = rng.uniform(genesis[:, 0], genesis[:, 1])
+    lat0 = rng.uniform(genesis[:, 2], genesis[:, 3])
+    recurve = rng.uniform(0.3, 0.8, nstorms) * numobs
+    turned = np.clip((step - recurve[:, None]) / 16, 0, 1)
+    dlon = motion[:, :1] * (1 - 2 * turned) + rng.normal(0, 0.08, shape)
+    dlat = motion[:, 1:] * (1 + turned) + rng.normal(0, 0.05, shape)
+    lon = lon0[:, None] + np.cumsum(dlon, axis=1)
+    lat = np.clip(lat0[:, None] + np.cumsum(dlat, axis=1), -70, 70)
+    lon = (lon + 180) % 360 - 180
+
+    # windspeed life cycle: rises to a peak and decays, rounded to 5 kt like the best tracks
+    peak = rng.gamma(2.5, 28, nstorms) + 25
+    tpeak = rng.uniform(0.3, 0.7, nstorms) * numobs
+    width = numobs / 3
+    wind = 20 + (peak[:, None] - 20) * np.exp(-((step - tpeak[:, None]) / width[:, None]) ** 2)
+    wind = np.clip(np.round(wind / 5) * 5, 10, 185)
+    pres = np.round(1010 - (wind / 6.7) ** (1 / 0.644))  # Atkinson and Holliday (1977) wind-pressure relationship
+
+    # landfall: distance to land stays above 111 km except for one or more stretches for landfalling storms
+    dist = rng.uniform(150, 1500, nstorms)[:, None] + 300 * np.sin(step / rng.uniform(8, 30, nstorms)[:, None]) ** 2
+    lands = rng.random(nstorms) < landfall_fraction
+    lf_start = (rng.uniform(0.4, 0.9, nstorms) * numobs).astype(int)
+    lf_len = rng.integers(1, 12, nstorms)
+    over_land = lands[:, None] & (step >= lf_start[:, None]) & (step < (lf_start + lf_len)[:, None])
+    dist = np.where(over_land, rng.uniform(0, 100, shape), dist)
+    dist2land = np.round(dist)
+    landfall = dist2land.copy()
+    landfall[np.arange(nstorms), numobs - 1] = -9999  # landfall is missing at the last observation, like IBTrACS
+
+    # a few missing pressures
+    pres[rng.random(shape) < 0.05] = -9999
+
+    def fill(values, fillvalue, dtype):
+        return np.where(valid, values, fillvalue).astype(dtype)
+
+    # SID: year, number of the storm in the year, hemisphere, latitude and longitude of genesis (13 characters)
+    year = t0.astype('datetime64[Y]').astype(int) + 1970
+    number = np.arange(nstorms) - np.searchsorted(year, year)
+    sid = ['{}{:03d}{}{:02d}{:03d}'.format(y, (n + 1) % 1000, 'N' if la >= 0 else 'S', int(abs(la)), int(lo % 360))
+           for y, n, la, lo in zip(year, number, lat0, lon0)]
+    return dict(numobs=numobs,
+                season=year.astype('int16'),
+                sid=np.array(sid),
+                name=np.array(['STORM{}'.format(i) if w >= 34 else 'NOT_NAMED' for i, w in enumerate(peak)]),
+                basin=np.where(valid, basin[:, None], ''),
+                time=time,
+                lat=fill(lat, -9999, 'float32'),
+                lon=fill(lon, -9999, 'float32'),
+                dist2land=fill(dist2land, -9999, 'int16'),
+                landfall=fill(landfall, -9999, 'int16'),
+                usa_wind=fill(wind, -9999, 'int16'),
+                usa_pres=fill(pres, -9999, 'int16'),
+                usa_sshs=fill(wind_category(wind), -15, 'int8'))
+
+
+def write_synthetic_ibtracs(f, nstorms, obs_per_storm=60, years=(1970, 2019), basins=('NA', ), landfall_fraction=0.4,
+                            seed=0):
+    """
+    Writes a synthetic IBTrACS NetCDF file (see synthetic_tracks for the parameters)
+    """
+    data = synthetic_tracks(nstorms, obs_per_storm, years, basins, landfall_fraction, seed)
+
+    with netCDF4.Dataset(f, 'w') as nc:
+        nc.title = 'Synthetic IBTrACS-shaped storm tracks for benchmarks'
+        nc.createDimension('storm', nstorms)
+        nc.createDimension('date_time', NDATE_TIME)
+        for dim, size in [('charsn', 13), ('char2', 2), ('char128', 128)]:
+            nc.createDimension(dim, size)
+
+        def char_var(name, dims, values, nchar, long_name):
+            var = nc.createVariable(name, 'S1', dims)
+            var.long_name = long_name
+            var[:] = values.astype('S{}'.format(nchar)).view('S1').reshape(values.shape + (nchar, ))
+
+        def num_var(name, values, fillvalue, attrs):
+            dims = ('storm', ) if values.ndim == 1 else ('storm', 'date_time')
+            var = nc.createVariable(name, values.dtype, dims, fill_value=fillvalue, zlib=True)
+            var.setncatts(attrs)
+            var.set_auto_maskandscale(False)
+            var[:] = values
+
+        num_var('numobs', data['numobs'], np.int16(-9999), dict(long_name='Number of observations per system', units='1'))
+        char_var('sid', ('storm', 'charsn'), data['sid'], 13, 'SID (IBTrACS Serial ID)')
+        num_var('season', data['season'], np.int16(-9999), dict(long_name='Season', units='Year'))
+        char_var('basin', ('storm', 'date_time', 'char2'), data['basin'], 2, 'Current basin')
+        char_var('name', ('storm', 'char128'), data['name'], 128, 'Name of system')
+        num_var('time', data['time'], -9999000., dict(long_name='time', units=TIME_UNITS, calendar='standard'))
+        num_var('lat', data['lat'], np.float32(-9999), dict(long_name='latitude', units='degrees_north'))
+        num_var('lon', data['lon'], np.float32(-9999), dict(long_name='longitude', units='degrees_east'))
+        num_var('dist2land', data['dist2land'], np.int16(-9999),
+                dict(long_name='Distance to Land at current location', units='km'))
+        num_var('landfall', data['landfall'], np.int16(-9999),
+                dict(long_name='Minimum distance to land between current location and next.', units='km'))
+        num_var('usa_wind', data['usa_wind'], np.int16(-9999),
+                dict(long_name='Maximum sustained wind speed', units='kts', coordinates='time lon lat'))
+        num_var('usa_pres', data['usa_pres'], np.int16(-9999), dict(long_name='Minimum central pressure', units='mb'))
+        num_var('usa_sshs', data['usa_sshs'], np.int8(-15),
+                dict(long_name='Saffir-Simpson Hurricane Wind Scale Category', units='1'))
+
+
+# box-shaped countries [min lon, max lon, min lat, max lat] for the synthetic country index (the North Atlantic storms
+# cross into them), with more than one polygon for some countries
+SYNTHETIC_COUNTRIES = dict(USA=('United States of America', [[-100, -75, 25, 45], [-82, -80, 24, 25]]),
+                           PRI=('Puerto Rico', [[-67.3, -65.6, 17.9, 18.5]]),
+                           MEX=('Mexico', [[-110, -97, 15, 25]]),
+                           CUB=('Cuba', [[-85, -74, 20, 23]]),
+                           CAN=('Canada', [[-100, -52, 45, 60]]))
+
+
+def write_synthetic_country_index(index_file):
+    """
+    Writes a country index (see functions/countries.py) of box-shaped countries, used in place of the Natural Earth
+    countries (which need a download)
+    """
+    import pickle
+    import shapely
+    from functions.countries import country_index
+
+    geoms = []
+    codes = []
+    names = []
+    for code, (name, boxes) in SYNTHETIC_COUNTRIES.items():
+        for x0, x1, y0, y1 in boxes:
+            geoms.append(shapely.box(x0, y0, x1, y1))
+            codes.append(code)
+            names.append(name)
+    with open(index_file, 'wb') as fp:
+        pickle.dump(country_index(geoms, codes, names, 'synthetic'), fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+if __name__ == '__main__':
+    sfile = '/Users/lgarzio/Documents/rucool/hurricanes/benchmarks/IBTrACS.synthetic.nc'
+    write_synthetic_ibtracs(sfile, nstorms=5000, obs_per_storm=60, years=(1970, 2019), basins=('NA', 'EP', 'WP'))
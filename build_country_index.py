@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Builds the country index (Natural Earth admin 0 country polygons and their STRtree, see functions/countries.py) used by
+landfall_countries.py and plot_hurricane_tracks.py. The Natural Earth shapefile is downloaded by cartopy unless a local
+copy is given, so run this once on a machine with network access (or with the shapefile) and copy the index file next
+to the IBTrACS files: the scripts then run offline.
+"""
+
+import os
+from functions.countries import build_country_index
+from functions.trace import traced
+
+
+@traced()
+def main(index_file, shapefile=None):
+    build_country_index(index_file, shapefile)
+    print(index_file)
+
+
+if __name__ == '__main__':
+    ifile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'files', 'country_index.pkl')
+    shpfile = None  # optional local ne_10m_admin_0_countries.shp
+    main(ifile, shpfile)
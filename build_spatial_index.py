@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Builds a spatial index of every track point in one or more IBTrACS NetCDF files, used for questions like "which storms
+passed within 200 km of this site" or "which storms entered this box" (see functions/spatial_index.py)
+"""
+
+import glob
+import os
+from functions.spatial_index import build_spatial_index
+from functions.trace import traced
+
+
+@traced()
+def main(files, index_file):
+    build_spatial_index(files, index_file)
+    print(index_file)
+
+
+if __name__ == '__main__':
+    fdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'files')
+    flist = sorted(glob.glob(os.path.join(fdir, 'IBTrACS*.nc')))
+    ifile = os.path.join(fdir, 'IBTrACS_spatial_index.pkl')
+    main(flist, ifile)
@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Converts an IBTrACS NetCDF file to a Parquet track store (one row per track point, no fill values) partitioned by
+storm basin and year. The track store directory can be used in place of the NetCDF file path in hurricane_summary.py,
+plot_hurricane_tracks.py, plot_storm_tracks_global.py and the storms_1970-2019 scripts.
+"""
+
+import os
+from functions.track_store import build_track_store
+from functions.trace import traced
+
+
+@traced()
+def main(f, store_dir=None, overwrite=False):
+    if store_dir is None:
+        store_dir = os.path.join(os.path.dirname(f), '{}.parquet'.format(os.path.splitext(os.path.basename(f))[0]))
+    build_track_store(f, store_dir, overwrite=overwrite)
+    print(store_dir)
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/IBTrACS.NA.v04r00.nc'
+    main(fpath, overwrite=True)
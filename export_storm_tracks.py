@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Exports the storm tracks of an IBTrACS file (e.g. the whole IBTrACS.ALL archive) to KML, newline-delimited GeoJSON or
+GeoParquet, one storm at a time (see functions/export.py), separately from the plotting scripts
+"""
+
+import os
+from functions.ragged import get_ragged_tracks
+from functions.track_store import load_track_arrays
+from functions.export import export_tracks
+from functions.trace import span, traced
+
+
+@traced()
+def main(f, savefile, years=None, basins=None, tolerance=None):
+    """
+    :param f: IBTrACS NetCDF file or track store directory
+    :param savefile: output file, the format is chosen from the extension (.kml, .geojson, .parquet)
+    :param years: optional list of years (year of the first observation of the storm), default is all years
+    :param basins: optional list of basin codes, default is all basins
+    :param tolerance: optional Douglas-Peucker tolerance (degrees), default is no simplification
+    """
+    with span('load ragged tracks'):
+        tracks = get_ragged_tracks(f, ['time', 'lat', 'lon'])
+        if years is not None or basins is not None:
+            tracks = tracks.select(load_track_arrays(f, [], years=years, basins=basins)['findex'])
+
+    with span('export tracks') as sp:
+        n = export_tracks(tracks, savefile, tolerance)
+        sp.count(storms=n)
+    print('{} storms: {}'.format(n, savefile))
+
+
+if __name__ == '__main__':
+    fpath = '/home/lgarzio/repo/lgarzio/hurricane-tools/files/IBTrACS.ALL.v04r00.nc'  # on server
+    sfile = os.path.join(os.path.dirname(fpath), 'IBTrACS_tracks.parquet')  # .kml, .geojson or .parquet
+    yrs = None  # e.g. range(1970, 2020)
+    bsins = None  # e.g. ['NA']
+    dp_tolerance = None  # e.g. 0.05 degrees
+    main(fpath, sfile, yrs, bsins, dp_tolerance)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Builds and reads a cache of GEBCO bathymetry at several resolutions (every nth grid point), stored as memory-mapped
+.npy files so map scripts only read the levels and rows needed for the map extent instead of the full GEBCO file
+"""
+
+import numpy as np
+import os
+import json
+import xarray as xr
+
+# decimation factors (every nth grid point) stored in the cache by default. Levels wider than MAX_COLUMNS grid points
+# are skipped unless the factors are given explicitly (8192 points is ~27 inches at 300 dpi)
+CACHE_FACTORS = [1, 2, 4, 8, 16, 32, 64, 128]
+MAX_COLUMNS = 8192
+
+
+def build_bathymetry_cache(bath_file, cache_dir, factors=None, block_rows=1024):
+    """
+    One-time build of the bathymetry cache: for each decimation factor n, elevation[::n, ::n] is written to
+    level<n>_elevation.npy with the matching latitudes and longitudes. The GEBCO file is read in blocks of rows so
+    the full grid is never held in memory
+    :param bath_file: GEBCO NetCDF file (variables lat, lon, elevation)
+    :param cache_dir: output directory for the cache
+    :param factors: optional list of decimation factors, default is the CACHE_FACTORS up to MAX_COLUMNS wide
+    :param block_rows: number of full resolution rows read from the GEBCO file at a time
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    ncbath = xr.open_dataset(bath_file)
+    lat = ncbath['lat'].values
+    lon = ncbath['lon'].values
+    elev = ncbath['elevation']
+
+    if factors is None:
+        factors = [n for n in CACHE_FACTORS if len(lon[::n]) <= MAX_COLUMNS] or CACHE_FACTORS[-1:]
+    factors = sorted(factors)
+
+    levels = dict()
+    outputs = dict()
+    for n in factors:
+        name = 'level{}'.format(n)
+        np.save(os.path.join(cache_dir, '{}_lat.npy'.format(name)), lat[::n])
+        np.save(os.path.join(cache_dir, '{}_lon.npy'.format(name)), lon[::n])
+        shape = (len(lat[::n]), len(lon[::n]))
+        outputs[n] = np.lib.format.open_memmap(os.path.join(cache_dir, '{}_elevation.npy'.format(name)), mode='w+',
+                                               dtype=elev.dtype, shape=shape)
+        levels[n] = dict(name=name, shape=shape)
+
+    # block_rows is rounded to a multiple of all factors so each block starts on a row of every level
+    step = int(np.lcm.reduce(factors))
+    block_rows = max(step, block_rows // step * step)
+    for r0 in np.arange(0, len(lat), block_rows):
+        block = elev[r0:r0 + block_rows].values
+        for n in factors:
+            sub = block[::n, ::n]
+            outputs[n][r0 // n:r0 // n + sub.shape[0]] = sub
+
+    for n in factors:
+        outputs[n].flush()
+
+    with open(os.path.join(cache_dir, 'index.json'), 'w') as fp:
+        json.dump(dict(source=os.path.abspath(bath_file), source_stamp=_source_stamp(bath_file), factors=factors,
+                       resolution=float(np.abs(np.median(np.diff(lon)))), levels=levels), fp, indent=2)
+
+
+def _source_stamp(bath_file):
+    stat = os.stat(bath_file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _cache_is_current(bath_file, cache_dir):
+    # the cache is rebuilt when the GEBCO file is replaced (or the cache was built from another file)
+    index_file = os.path.join(cache_dir, 'index.json')
+    if not os.path.isfile(index_file):
+        return False
+    if not os.path.isfile(bath_file):
+        # the cache can be used without the GEBCO file (e.g. copied to another machine)
+        return True
+    with open(index_file) as fp:
+        index = json.load(fp)
+    return index.get('source_stamp') == _source_stamp(bath_file)
+
+
+def load_bathymetry(cache_dir, extent, npixels=None):
+    """
+    Reads bathymetry for a map extent from the cache, at the coarsest level that still has at least npixels grid
+    points across the extent. Only the rows and columns within the extent are read from the memory-mapped level
+    :param cache_dir: bathymetry cache directory created by build_bathymetry_cache
+    :param extent: [min lon, max lon, min lat, max lat]
+    :param npixels: optional number of pixels across the map, default is the full resolution level
+    :returns arrays of longitude, latitude and elevation
+    """
+    with open(os.path.join(cache_dir, 'index.json')) as fp:
+        index = json.load(fp)
+
+    factor = index['factors'][0]
+    if npixels is not None:
+        for n in index['factors']:
+            if (extent[1] - extent[0]) / (index['resolution'] * n) >= npixels:
+                factor = n
+
+    name = 'level{}'.format(factor)
+    lat = np.load(os.path.join(cache_dir, '{}_lat.npy'.format(name)))
+    lon = np.load(os.path.join(cache_dir, '{}_lon.npy'.format(name)))
+    elev = np.load(os.path.join(cache_dir, '{}_elevation.npy'.format(name)), mmap_mode='r')
+
+    # include one grid point outside the extent on each side
+    lat0, lat1 = np.searchsorted(lat, [extent[2], extent[3]])
+    lon0, lon1 = np.searchsorted(lon, [extent[0], extent[1]])
+    lat0, lon0 = max(lat0 - 1, 0), max(lon0 - 1, 0)
+    lat1, lon1 = lat1 + 1, lon1 + 1
+
+    return lon[lon0:lon1], lat[lat0:lat1], np.asarray(elev[lat0:lat1, lon0:lon1])
+
+
+def get_bathymetry(bath_file, extent, npixels=None, cache_dir=None):
+    """
+    Reads bathymetry for a map extent from the cache of a GEBCO file, building the cache the first time it is used
+    and again when the GEBCO file changes
+    :param bath_file: GEBCO NetCDF file
+    :param extent: [min lon, max lon, min lat, max lat]
+    :param npixels: optional number of pixels across the map
+    :param cache_dir: optional cache directory, default is <bath_file without extension>_cache
+    :returns arrays of longitude, latitude and elevation
+    """
+    if cache_dir is None:
+        cache_dir = '{}_cache'.format(os.path.splitext(bath_file)[0])
+    if not _cache_is_current(bath_file, cache_dir):
+        build_bathymetry_cache(bath_file, cache_dir)
+
+    return load_bathymetry(cache_dir, extent, npixels)
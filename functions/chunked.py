@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Chunked processing of large IBTrACS files (e.g. IBTrACS.ALL) along the storm dimension. Each chunk reads only the
+variables it needs for a range of storms, and the chunks are processed by a pool of worker processes, so peak memory
+depends on the chunk size and number of workers instead of the size of the file
+"""
+
+import numpy as np
+import xarray as xr
+from concurrent.futures import ProcessPoolExecutor
+
+
+def storm_chunks(nstorms, chunk_size):
+    return [(start, min(start + chunk_size, nstorms)) for start in range(0, nstorms, chunk_size)]
+
+
+def read_chunk(f, variables, start, stop):
+    """
+    Reads a range of storms from an IBTrACS NetCDF file
+    :param f: IBTrACS NetCDF file
+    :param variables: list of variables to read
+    :param start: first storm index
+    :param stop: storm index after the last storm
+    :returns dataset opened with mask_and_scale=False and decode_times=False, with the storm coordinate set to the
+    storm index in the file
+    """
+    ncfile = xr.open_dataset(f, mask_and_scale=False, decode_times=False)
+    ds = ncfile[variables].isel(storm=slice(start, stop)).load()
+    ncfile.close()
+    return ds.assign_coords(storm=np.arange(start, stop))
+
+
+def _run_chunk(f, variables, start, stop, func, args):
+    return func(read_chunk(f, variables, start, stop), *args)
+
+
+def map_storm_chunks(f, func, variables, args=(), chunk_size=1000, workers=None):
+    """
+    Applies a function to each chunk of storms in an IBTrACS NetCDF file
+    :param f: IBTrACS NetCDF file
+    :param func: function called as func(chunk, *args), must be defined at the module level so it can be sent to the
+    worker processes
+    :param variables: list of variables read for each chunk
+    :param args: optional additional arguments for func
+    :param chunk_size: number of storms in each chunk
+    :param workers: number of worker processes, default is all cores. Chunks are processed in this process if 1
+    :returns list of the results for each chunk, in storm order
+    """
+    with xr.open_dataset(f, decode_times=False) as ncfile:
+        chunks = storm_chunks(ncfile.sizes['storm'], chunk_size)
+
+    if workers == 1:
+        return [_run_chunk(f, variables, start, stop, func, args) for start, stop in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_chunk, f, variables, start, stop, func, args) for start, stop in chunks]
+        return [future.result() for future in futures]
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Gridded storm climatology: track points and landfalls binned into a lat/lon grid by year and storm category with one
+bincount over the flat point arrays. The result is a (year x category x lat x lon) cube, so maps of any period only
+depend on the size of the grid, not on the number of storms. Counts are cumulative over category: the value at
+category c counts track points, storms and landfalls at category c or higher (category -1 includes every point,
+including points below TS and points without a category).
+"""
+
+import numpy as np
+import xarray as xr
+from concurrent.futures import ProcessPoolExecutor
+from functions.track_store import load_track_arrays, first_last_times, datetime_year
+
+CATEGORIES = [-1, 0, 1, 2, 3, 4, 5]
+
+
+def grid_edges(extent, resolution):
+    """
+    :param extent: [min lon, max lon, min lat, max lat]
+    :param resolution: grid spacing (degrees)
+    :returns arrays of longitude and latitude cell edges
+    """
+    lon_edges = np.arange(extent[0], extent[1] + resolution / 2, resolution)
+    lat_edges = np.arange(extent[2], extent[3] + resolution / 2, resolution)
+    return lon_edges, lat_edges
+
+
+def grid_cells(lon, lat, lon_edges, lat_edges):
+    """
+    Finds the grid cell of each point. Longitudes are wrapped to the longitude range of the grid
+    :returns flat array of cell indices (lat index * number of lon cells + lon index), -1 for points outside the grid
+    """
+    lon = (np.asarray(lon, dtype='float64') - lon_edges[0]) % 360 + lon_edges[0]
+    lat = np.asarray(lat, dtype='float64')
+    nlon = len(lon_edges) - 1
+    nlat = len(lat_edges) - 1
+
+    ix = np.searchsorted(lon_edges, lon, side='right') - 1
+    iy = np.searchsorted(lat_edges, lat, side='right') - 1
+    # points on the last edge are in the last cell (same as np.histogram2d)
+    ix[lon == lon_edges[-1]] = nlon - 1
+    iy[lat == lat_edges[-1]] = nlat - 1
+    inside = np.logical_and.reduce([ix >= 0, ix < nlon, iy >= 0, iy < nlat])
+    return np.where(inside, iy * nlon + ix, -1)
+
+
+def category_index(cats, categories=None):
+    # index of the category of each point (-1 for points below the lowest category). All categories below TS and
+    # missing categories are -1
+    categories = np.asarray(categories or CATEGORIES)
+    cats = np.maximum(np.nan_to_num(np.asarray(cats, dtype='float64'), nan=-1), -1)
+    return np.searchsorted(categories, cats, side='right') - 1
+
+
+def cumulative_counts(group, cat_index, cell, ngroups, ncats, ncells, unique_key=None):
+    """
+    Counts points by group (e.g. year), category and grid cell with one bincount, cumulative over category
+    :param group: group index of each point
+    :param cat_index: category index of each point
+    :param cell: grid cell of each point (-1 is outside the grid)
+    :param ngroups: number of groups
+    :param ncats: number of categories
+    :param ncells: number of grid cells
+    :param unique_key: optional key (e.g. storm index) of each point. Each key is counted once per group and cell, at
+    its highest category
+    :returns (group x category x cell) array of counts
+    """
+    keep = np.logical_and(cell >= 0, cat_index >= 0)
+    group = group[keep]
+    cat_index = cat_index[keep]
+    cell = cell[keep]
+
+    if unique_key is not None:
+        # highest category of each key in each cell
+        key = (unique_key[keep].astype('int64') * ngroups + group) * ncells + cell
+        order = np.lexsort([cat_index, key])
+        last = np.append(key[order][1:] != key[order][:-1], True)
+        group = group[order][last]
+        cat_index = cat_index[order][last]
+        cell = cell[order][last]
+
+    flat = (group.astype('int64') * ncats + cat_index) * ncells + cell
+    counts = np.bincount(flat, minlength=ngroups * ncats * ncells).reshape(ngroups, ncats, ncells)
+    return np.cumsum(counts[:, ::-1], axis=1)[:, ::-1]
+
+
+def _bin_year_storms(f, storms, lon_edges, lat_edges, categories):
+    # track point and storm counts (category x cell) of one year of storms
+    ncells = (len(lon_edges) - 1) * (len(lat_edges) - 1)
+    arrays = load_track_arrays(f, ['lat', 'lon', 'usa_sshs'], storms=storms)
+    valid = np.logical_and(~np.isnan(arrays['lat']), ~np.isnan(arrays['lon']))
+    srow, sobs = np.nonzero(valid)
+
+    cell = grid_cells(arrays['lon'][srow, sobs], arrays['lat'][srow, sobs], lon_edges, lat_edges)
+    cat_index = category_index(arrays['usa_sshs'][srow, sobs], categories)
+    group = np.zeros(len(srow), dtype='int64')
+    points = cumulative_counts(group, cat_index, cell, 1, len(categories), ncells)[0]
+    storms = cumulative_counts(group, cat_index, cell, 1, len(categories), ncells, unique_key=srow)[0]
+    return points, storms
+
+
+def track_climatology(f, hindex, extent, resolution=1, categories=None, workers=None):
+    """
+    Bins the track points of the storms in hindex into a lat/lon grid by year (year of the first observation of the
+    storm) and category. Years are binned in parallel by a pool of worker processes
+    :param f: IBTrACS NetCDF file or track store directory
+    :param hindex: array of storm indices (findex)
+    :param extent: grid extent [min lon, max lon, min lat, max lat]
+    :param resolution: grid spacing (degrees), default is 1
+    :param categories: optional list of categories (usa_sshs), default is CATEGORIES
+    :param workers: number of worker processes, default is all cores. Years are binned in this process if 1
+    :returns xarray dataset with track_points and storm_count (year x category x lat x lon)
+    """
+    categories = list(categories or CATEGORIES)
+    lon_edges, lat_edges = grid_edges(extent, resolution)
+    hindex = np.asarray(hindex)
+
+    t0, _ = first_last_times(load_track_arrays(f, ['time'], storms=hindex)['time'])
+    year = datetime_year(t0)
+    years = np.unique(year)
+    args = (lon_edges, lat_edges, categories)
+    if workers == 1:
+        results = [_bin_year_storms(f, hindex[year == yr], *args) for yr in years]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_bin_year_storms, f, hindex[year == yr], *args) for yr in years]
+            results = [future.result() for future in futures]
+
+    shape = (len(years), len(categories), len(lat_edges) - 1, len(lon_edges) - 1)
+    ds = climatology_dataset(years, categories, lon_edges, lat_edges)
+    ds['track_points'] = (('year', 'category', 'lat', 'lon'),
+                          np.stack([r[0] for r in results]).reshape(shape).astype('int32'))
+    ds['storm_count'] = (('year', 'category', 'lat', 'lon'),
+                         np.stack([r[1] for r in results]).reshape(shape).astype('int32'))
+    ds['track_points'].attrs['long_name'] = 'Number of track points at or above category'
+    ds['storm_count'].attrs['long_name'] = 'Number of storms with a track point at or above category in the grid cell'
+    return ds
+
+
+def landfall_climatology(sf, ds):
+    """
+    Bins the landfalls in a landfall summary into the grid of a climatology dataset by year and landfall category
+    :param sf: landfall summary dataframe created by storms_1970-2019_summary.py
+    :param ds: climatology dataset from track_climatology
+    :returns xarray DataArray of landfall counts (year x category x lat x lon)
+    """
+    categories = list(ds['category'].values)
+    lon_edges, lat_edges = ds.attrs['lon_edges'], ds.attrs['lat_edges']
+    ncells = (len(lon_edges) - 1) * (len(lat_edges) - 1)
+    years = ds['year'].values
+
+    group = np.searchsorted(years, sf['year'].values)
+    group[group == len(years)] = 0
+    cell = np.where(years[group] == sf['year'].values,
+                    grid_cells(sf['landfall_lon'].values, sf['landfall_lat'].values, lon_edges, lat_edges), -1)
+    cat_index = category_index(sf['landfall_cat'].values, categories)
+    counts = cumulative_counts(group, cat_index, cell, len(years), len(categories), ncells)
+
+    dims = ('year', 'category', 'lat', 'lon')
+    da = xr.DataArray(counts.reshape([ds.sizes[d] for d in dims]).astype('int32'), dims=dims,
+                      coords={d: ds[d].values for d in dims})
+    da.attrs['long_name'] = 'Number of landfalls at or above category'
+    return da
+
+
+def climatology_dataset(years, categories, lon_edges, lat_edges):
+    ds = xr.Dataset(coords=dict(year=np.asarray(years), category=np.asarray(categories),
+                                lat=(lat_edges[:-1] + lat_edges[1:]) / 2, lon=(lon_edges[:-1] + lon_edges[1:]) / 2))
+    ds['category'].attrs['long_name'] = 'Minimum storm category (usa_sshs), -1 includes all points'
+    ds['lat'].attrs['units'] = 'degrees_north'
+    ds['lon'].attrs['units'] = 'degrees_east'
+    ds.attrs['lon_edges'] = lon_edges
+    ds.attrs['lat_edges'] = lat_edges
+    return ds
+
+
+def write_climatology(ds, path):
+    """
+    Saves a climatology dataset as NetCDF, or as Zarr if path ends with .zarr (requires the zarr package)
+    """
+    if path.endswith('.zarr'):
+        ds.to_zarr(path, mode='w')
+    else:
+        ds.to_netcdf(path, encoding={v: dict(zlib=True, complevel=4) for v in ds.data_vars})
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Country landfall classifier: storm track segments are intersected with Natural Earth country polygons through an
+STRtree, and each segment that enters a country from outside it is a crossing tagged with that country (a landfall if
+the segment starts over the ocean). The
+country polygons and their tree are built once from the Natural Earth admin 0 countries shapefile and saved to an index
+file, so later runs work offline.
+"""
+
+import numpy as np
+import os
+import pickle
+import pandas as pd
+import shapely
+from shapely.strtree import STRtree
+
+# Natural Earth country codes (ADM0_A3) for each impact column of the storm summary files
+IMPACT_COUNTRIES = dict(usimpact=['USA', 'PRI'], canadaimpact=['CAN'], mexicoimpact=['MEX'])
+
+
+def country_index(geoms, codes, names, source=None):
+    """
+    :param geoms: list of polygons (one per polygon part of a country)
+    :param codes: country code of each polygon
+    :param names: country name of each polygon
+    :param source: optional name of the source of the polygons
+    :returns country index (dictionary of the polygons, their country code and name, and an STRtree of the polygons)
+    """
+    geoms = np.array(geoms, dtype=object)
+    return dict(source=source, geoms=geoms, codes=np.array(codes), names=np.array(names), tree=STRtree(geoms))
+
+
+def build_country_index(index_file, shapefile=None, resolution='10m'):
+    """
+    Builds the country index from the Natural Earth admin 0 countries shapefile: every polygon part of every country
+    with its country code and name, and an STRtree of the polygons
+    :param index_file: output file (pickle)
+    :param shapefile: optional path to a local admin 0 countries shapefile, default is the cartopy Natural Earth file
+    (downloaded to the cartopy data directory the first time it is used)
+    :param resolution: Natural Earth resolution if shapefile is None, default is '10m'
+    """
+    import cartopy.io.shapereader as shpreader
+    if shapefile is None:
+        shapefile = shpreader.natural_earth(resolution=resolution, category='cultural', name='admin_0_countries')
+
+    geoms = []
+    codes = []
+    names = []
+    for record in shpreader.Reader(shapefile).records():
+        parts = shapely.get_parts(record.geometry)
+        geoms.extend(parts)
+        codes.extend([record.attributes['ADM0_A3']] * len(parts))
+        names.extend([record.attributes['NAME']] * len(parts))
+
+    index = country_index(geoms, codes, names, os.path.basename(shapefile))
+    with open(index_file, 'wb') as fp:
+        pickle.dump(index, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_country_index(index_file):
+    """
+    Loads a country index built with build_country_index.py
+    """
+    if not os.path.isfile(index_file):
+        raise FileNotFoundError('Country index not found: {} (build it with build_country_index.py)'.format(index_file))
+    with open(index_file, 'rb') as fp:
+        return pickle.load(fp)
+
+
+def get_country_index(index_file, shapefile=None):
+    """
+    Loads the country index, building it the first time it is used
+    """
+    if not os.path.isfile(index_file):
+        build_country_index(index_file, shapefile)
+    return load_country_index(index_file)
+
+
+def track_crossings(index, tracks):
+    """
+    Finds every crossing into a country (track segment that enters a polygon of a country from outside the country) of
+    a set of storms with one STRtree query for all track segments. Crossings from the ocean are landfalls, the others
+    are crossings of a land border. Segments that cross the antimeridian are skipped
+    :param index: country index returned by get_country_index
+    :param tracks: RaggedTracks with time, lat and lon
+    :returns dataframe with one row per crossing (findex, sid, name, obs, time, lon, lat, country, country_name,
+    landfall), sorted by storm and time
+    """
+    storm, flat = tracks.flat_index()
+    lon = tracks.data['lon'][flat].astype('float64')
+    lat = tracks.data['lat'][flat].astype('float64')
+    tm = tracks.data['time'][flat]
+
+    # segments between consecutive valid points of the same storm
+    start = np.flatnonzero(storm[1:] == storm[:-1])
+    end = start + 1
+    ok = np.logical_and.reduce([np.isfinite(lon[start]), np.isfinite(lat[start]), np.isfinite(lon[end]),
+                                np.isfinite(lat[end]), np.abs(lon[end] - lon[start]) <= 180])
+    start = start[ok]
+    end = end[ok]
+    p0 = np.column_stack([lon[start], lat[start]])
+    p1 = np.column_stack([lon[end], lat[end]])
+    segments = shapely.linestrings(np.stack([p0, p1], axis=1))
+
+    # segment-country pairs where the segment intersects a polygon of the country, minus the pairs where the segment
+    # starts in (or on the border of) the country
+    ncountries = len(np.unique(index['codes']))
+    country = np.unique(index['codes'], return_inverse=True)[1]
+    seg, geom = index['tree'].query(segments, predicate='intersects')
+    pseg, pgeom = index['tree'].query(shapely.points(p0), predicate='intersects')
+    entry = ~np.isin(seg.astype('int64') * ncountries + country[geom],
+                     pseg.astype('int64') * ncountries + country[pgeom])
+    seg = seg[entry]
+    geom = geom[entry]
+
+    # the crossing point is the first point of the part of the segment inside the polygon
+    inside = shapely.get_geometry(shapely.intersection(segments[seg], index['geoms'][geom]), 0)
+    point = np.where(shapely.get_type_id(inside) == 0, inside, shapely.get_point(inside, 0))
+    frac = shapely.line_locate_point(segments[seg], point, normalized=True)
+    xy = shapely.get_coordinates(point)
+    s0 = start[seg]
+    dt = tm[end[seg]] - tm[s0]
+
+    crossings = pd.DataFrame(dict(storm=storm[s0],
+                                  findex=tracks.findex[storm[s0]],
+                                  sid=tracks.sid[storm[s0]],
+                                  name=tracks.name[storm[s0]],
+                                  obs=s0 - np.searchsorted(storm, storm[s0]),
+                                  time=(tm[s0] + dt * frac).astype('datetime64[s]'),
+                                  lon=xy[:, 0],
+                                  lat=xy[:, 1],
+                                  country=index['codes'][geom],
+                                  country_name=index['names'][geom],
+                                  landfall=~np.isin(seg, pseg)))
+
+    # a segment that enters more than one polygon of the same country (e.g. islands) is one crossing
+    crossings = crossings.sort_values(['storm', 'time'], kind='mergesort')
+    crossings = crossings.drop_duplicates(subset=['storm', 'obs', 'country'], keep='first')
+    return crossings.drop(columns='storm').reset_index(drop=True)
+
+
+def impact_flags(crossings, findex, impact_countries=None):
+    """
+    Flags the storms that cross into each impact country (landfalls and land border crossings)
+    :param crossings: dataframe returned by track_crossings
+    :param findex: list of storm indices (findex)
+    :param impact_countries: optional dictionary of column name: list of country codes, default is IMPACT_COUNTRIES
+    :returns dataframe with findex and one 'yes'/'no' column per impact country
+    """
+    impact_countries = impact_countries or IMPACT_COUNTRIES
+    flags = dict(findex=np.asarray(findex))
+    for col, codes in impact_countries.items():
+        impacted = crossings.loc[crossings['country'].isin(codes), 'findex'].unique()
+        flags[col] = np.where(np.isin(flags['findex'], impacted), 'yes', 'no')
+    return pd.DataFrame(flags)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Streaming export of storm tracks to KML, newline-delimited GeoJSON and GeoParquet. Tracks are read one storm at a time
+from the memory-mapped ragged track files (functions/ragged.py) and written as they are read, so the whole IBTrACS
+archive can be exported in bounded memory. Tracks can optionally be simplified with the Douglas-Peucker algorithm.
+"""
+
+import numpy as np
+import os
+import json
+import struct
+import pyarrow as pa
+import pyarrow.parquet as pq
+from xml.sax.saxutils import escape
+
+# decimal places of the coordinates written to KML and GeoJSON
+PRECISION = 5
+
+
+def douglas_peucker(x, y, tolerance):
+    """
+    Simplifies a line with the Douglas-Peucker algorithm
+    :param x: array of x coordinates (e.g. longitude)
+    :param y: array of y coordinates (e.g. latitude)
+    :param tolerance: maximum distance of a removed point from the simplified line (same units as x and y)
+    :returns array of the indices of the points that are kept
+    """
+    n = len(x)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i0, i1 = stack.pop()
+        if i1 - i0 < 2:
+            continue
+        dx = x[i1] - x[i0]
+        dy = y[i1] - y[i0]
+        px = x[i0 + 1:i1] - x[i0]
+        py = y[i0 + 1:i1] - y[i0]
+        norm = np.hypot(dx, dy)
+        if norm == 0:
+            dist = np.hypot(px, py)
+        else:
+            dist = np.abs(dx * py - dy * px) / norm
+        k = np.argmax(dist)
+        if dist[k] > tolerance:
+            keep[i0 + 1 + k] = True
+            stack.extend([(i0, i0 + 1 + k), (i0 + 1 + k, i1)])
+    return np.flatnonzero(keep)
+
+
+def track_coordinates(track, tolerance=None):
+    """
+    :param track: dictionary of track arrays with lon and lat
+    :param tolerance: optional Douglas-Peucker tolerance (degrees), default is no simplification
+    :returns (n x 2) float64 array of [lon, lat]
+    """
+    xy = np.column_stack([track['lon'], track['lat']]).astype('float64')
+    xy = xy[np.all(np.isfinite(xy), axis=1)]
+    if tolerance and len(xy) > 2:
+        xy = xy[douglas_peucker(xy[:, 0], xy[:, 1], tolerance)]
+    return xy
+
+
+class KmlWriter(object):
+    """
+    Writes storm tracks as KML Placemarks, one at a time
+    """
+    def __init__(self, path):
+        self.fp = open(path, 'w', encoding='utf-8')
+        self.fp.write('<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="http://www.opengis.net/kml/2.2">\n'
+                      '<Document>\n')
+
+    def write(self, xy, properties):
+        coords = ' '.join(['{},{},0'.format(x, y) for x, y in np.round(xy, PRECISION).tolist()])
+        data = ''.join(['<Data name="{}"><value>{}</value></Data>'.format(k, escape(str(v)))
+                        for k, v in properties.items() if k != 'name'])
+        geom = '<Point>' if len(xy) == 1 else '<LineString>'
+        self.fp.write('<Placemark><name>{}</name><ExtendedData>{}</ExtendedData>{}<coordinates>{}</coordinates>{}'
+                      '</Placemark>\n'.format(escape(str(properties['name'])), data, geom, coords,
+                                              geom.replace('<', '</')))
+
+    def close(self):
+        self.fp.write('</Document>\n</kml>\n')
+        self.fp.close()
+
+
+class GeoJsonWriter(object):
+    """
+    Writes storm tracks as newline-delimited GeoJSON, one Feature per line
+    """
+    def __init__(self, path):
+        self.fp = open(path, 'w', encoding='utf-8')
+
+    def write(self, xy, properties):
+        coords = np.round(xy, PRECISION).tolist()
+        if len(xy) == 1:
+            geometry = dict(type='Point', coordinates=coords[0])
+        else:
+            geometry = dict(type='LineString', coordinates=coords)
+        self.fp.write(json.dumps(dict(type='Feature', properties=properties, geometry=geometry)) + '\n')
+
+    def close(self):
+        self.fp.close()
+
+
+class GeoParquetWriter(object):
+    """
+    Writes storm tracks to a GeoParquet file (WKB geometry column), one row group every batch_size storms
+    """
+    schema = pa.schema([('findex', pa.int64()), ('sid', pa.string()), ('name', pa.string()), ('t0', pa.string()),
+                        ('tf', pa.string()), ('npoints', pa.int32()), ('geometry', pa.binary())])
+
+    def __init__(self, path, batch_size=1000):
+        geo = dict(version='1.0.0', primary_column='geometry',
+                   columns=dict(geometry=dict(encoding='WKB', geometry_types=['LineString', 'Point'])))
+        self.schema = self.schema.with_metadata({'geo': json.dumps(geo)})
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.batch_size = batch_size
+        self.rows = []
+
+    def write(self, xy, properties):
+        if len(xy) == 1:
+            wkb = struct.pack('<bI', 1, 1) + xy[0].astype('<f8').tobytes()
+        else:
+            wkb = struct.pack('<bII', 1, 2, len(xy)) + xy.astype('<f8').tobytes()
+        self.rows.append(dict(properties, geometry=wkb))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            self.writer.write_table(pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+WRITERS = {'.kml': KmlWriter, '.geojson': GeoJsonWriter, '.ndjson': GeoJsonWriter, '.geojsonl': GeoJsonWriter,
+           '.parquet': GeoParquetWriter}
+
+
+def export_tracks(tracks, path, tolerance=None):
+    """
+    Exports storm tracks one storm at a time. The format is chosen from the file extension: .kml, .geojson (or
+    .ndjson, .geojsonl) for newline-delimited GeoJSON, or .parquet for GeoParquet
+    :param tracks: RaggedTracks with time, lat and lon (functions/ragged.py)
+    :param path: output file
+    :param tolerance: optional Douglas-Peucker tolerance (degrees), default is no simplification
+    :returns number of storms written
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError('Unsupported export format: {} (use {})'.format(ext, ', '.join(WRITERS)))
+
+    t0 = np.datetime_as_string(tracks.first('time'), unit='s')
+    tf = np.datetime_as_string(tracks.last('time'), unit='s')
+    findex = tracks.findex
+    sids = tracks.sid
+    names = tracks.name
+
+    writer = WRITERS[ext](path)
+    count = 0
+    try:
+        for i, track in enumerate(tracks):
+            xy = track_coordinates(track, tolerance)
+            if len(xy) == 0:
+                continue
+            properties = dict(findex=int(findex[i]), sid=str(sids[i]), name=str(names[i]), t0=str(t0[i]),
+                              tf=str(tf[i]), npoints=len(xy))
+            writer.write(xy, properties)
+            count += 1
+    finally:
+        writer.close()
+    return count
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Figure specs: each figure variant is a dictionary with the output file name and a set of filters on the columns of a
+dataframe (e.g. category thresholds, lifetime or landfall category, basin, longitude region). The filters of all specs
+are evaluated as boolean masks in one pass over the data, the figures are drawn from the masks, either as separate
+files or as small multiples, and the figures are saved (rendered and encoded) by a pool of worker processes.
+
+A spec is a dictionary:
+    name: output file name
+    title: optional title of the panel when the specs are drawn as small multiples, default is the file name
+    filters: optional dictionary of column: condition, rows matching all conditions are selected (default is all rows)
+        (min, max): min <= value < max, either bound can be None
+        list: value is one of the list
+        string: value contains the string (e.g. a basin code in a list of basins)
+"""
+
+import numpy as np
+import os
+import pickle
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from functions.trace import span
+
+
+def condition_mask(values, condition):
+    """
+    :param values: array of column values
+    :param condition: (min, max) tuple, list of values or string, see the module docstring
+    :returns boolean array
+    """
+    values = np.asarray(values)
+    if isinstance(condition, str):
+        return np.char.find(values.astype(str), condition) >= 0
+    if isinstance(condition, tuple):
+        vmin, vmax = condition
+        mask = np.ones(len(values), dtype=bool)
+        with np.errstate(invalid='ignore'):
+            if vmin is not None:
+                mask &= values >= vmin
+            if vmax is not None:
+                mask &= values < vmax
+        return mask
+    return np.isin(values, list(condition))
+
+
+def spec_masks(df, specs):
+    """
+    Evaluates the filters of all specs in one pass over the dataframe. Each distinct condition on a column is
+    evaluated once and shared by the specs that use it
+    :param df: pandas dataframe
+    :param specs: list of figure specs
+    :returns (number of specs x number of rows) boolean array
+    """
+    conditions = dict()
+    masks = np.ones((len(specs), len(df)), dtype=bool)
+    for i, spec in enumerate(specs):
+        for col, condition in spec.get('filters', dict()).items():
+            key = (col, repr(condition))
+            if key not in conditions:
+                conditions[key] = condition_mask(df[col].values, condition)
+            masks[i] &= conditions[key]
+    return masks
+
+
+def _save_figure(data, sfile, dpi):
+    # runs in a worker process: figures are only saved to files, so no display is needed
+    plt.switch_backend('Agg')
+    fig = pickle.loads(data)
+    fig.savefig(sfile, dpi=dpi)
+    plt.close(fig)
+    return sfile
+
+
+def save_figures(figures, dpi=300, workers=None):
+    """
+    Saves and closes a list of figures. The figures are pickled and saved by a pool of worker processes, so the
+    rendering and encoding of the image files (most of the time of a figure with many artists at a high dpi) run in
+    parallel
+    :param figures: list of (figure, output file)
+    :param dpi: resolution of the saved figures, default is 300
+    :param workers: number of worker processes, default is all cores (at most one per figure). Figures are saved in
+    this process if 1
+    :returns list of output files
+    """
+    sfiles = [sfile for _, sfile in figures]
+    with span('savefig', files=len(figures)):
+        if workers == 1 or len(figures) < 2:
+            for fig, sfile in figures:
+                fig.savefig(sfile, dpi=dpi)
+                plt.close(fig)
+            return sfiles
+
+        data = []
+        for fig, sfile in figures:
+            data.append(pickle.dumps(fig))
+            plt.close(fig)
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(figures))) as executor:
+            futures = [executor.submit(_save_figure, d, sfile, dpi) for d, sfile in zip(data, sfiles)]
+            return [future.result() for future in futures]
+
+
+def render_figures(specs, masks, draw, sDir, layout='files', panel_file=None, ncols=3, subplot_kw=None, dpi=300,
+                   workers=None):
+    """
+    Draws one figure per spec (layout='files') or one figure with a panel per spec (layout='panels') and saves them
+    :param specs: list of figure specs
+    :param masks: boolean masks of the specs returned by spec_masks
+    :param draw: function that draws a spec, called as draw(ax, mask, spec)
+    :param sDir: output directory
+    :param layout: 'files' for separate files named by the specs, or 'panels' for small multiples in panel_file
+    :param panel_file: output file name of the small multiples figure
+    :param ncols: number of columns of the small multiples, default is 3
+    :param subplot_kw: optional dictionary of subplot keywords (e.g. dict(projection=ccrs.Robinson()))
+    :param dpi: resolution of the saved figures, default is 300
+    :param workers: number of worker processes used to save the figures (see save_figures)
+    :returns list of output files
+    """
+    figures = []
+    if layout == 'files':
+        for spec, mask in zip(specs, masks):
+            fig, ax = plt.subplots(subplot_kw=subplot_kw)
+            draw(ax, mask, spec)
+            figures.append((fig, os.path.join(sDir, spec['name'])))
+    elif layout == 'panels':
+        if panel_file is None:
+            raise ValueError('panel_file is required for layout=panels')
+        ncols = min(ncols, len(specs))
+        nrows = int(np.ceil(len(specs) / ncols))
+        share = subplot_kw is None
+        fig, axs = plt.subplots(nrows, ncols, figsize=(4 * ncols, 3 * nrows), sharex=share, sharey=share,
+                                squeeze=False, subplot_kw=subplot_kw)
+        for ax, spec, mask in zip(axs.flat, specs, masks):
+            draw(ax, mask, spec)
+            ax.set_title(spec.get('title', os.path.splitext(spec['name'])[0]), fontsize=10)
+        for ax in axs.flat[len(specs):]:
+            ax.remove()
+        if share:
+            # x tick labels for the panels above the removed panels
+            for ax in axs.flat[max(len(specs) - ncols, 0):len(specs)]:
+                ax.xaxis.set_tick_params(labelbottom=True)
+        fig.tight_layout()
+        figures.append((fig, os.path.join(sDir, panel_file)))
+    else:
+        raise ValueError('Unsupported layout: {} (use files or panels)'.format(layout))
+
+    return save_figures(figures, dpi, workers)
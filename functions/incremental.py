@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Functions for incremental updates of storm summaries when a new IBTrACS release is published. Each storm is
+fingerprinted by its SID and a hash of its track data, so only new or changed storms need to be summarized again and
+the rows of unchanged storms are carried over from the previous outputs
+"""
+
+import numpy as np
+import os
+import json
+import hashlib
+import pandas as pd
+
+
+def storm_fingerprints(ncfile, variables, chunk_size=1000):
+    """
+    Calculates a content hash of the track data of every storm in an IBTrACS dataset
+    :param ncfile: IBTrACS dataset opened with mask_and_scale=False and decode_times=False
+    :param variables: list of variables included in the hash (storm or storm x date_time)
+    :param chunk_size: number of storms read at a time
+    :returns pandas dataframe with columns sid, findex, hash
+    """
+    findex = ncfile['storm'].values
+    sids = []
+    hashes = []
+    for start in np.arange(0, ncfile.sizes['storm'], chunk_size):
+        nc = ncfile[list(variables) + ['sid']].isel(storm=slice(start, start + chunk_size))
+        nstorms = nc.sizes['storm']
+
+        # the bytes of all variables for each storm, as one row of a (storm x bytes) array
+        data = np.hstack([np.ascontiguousarray(nc[v].values).reshape(nstorms, -1).view(np.uint8)
+                          for v in variables])
+        hashes.extend([hashlib.sha1(row.tobytes()).hexdigest() for row in data])
+        sids.extend(np.char.decode(nc['sid'].values, 'utf-8').tolist())
+
+    return pd.DataFrame(dict(sid=sids, findex=findex, hash=hashes))
+
+
+def read_fingerprints(fp_file):
+    """
+    Reads the storm fingerprints and parameters saved by write_fingerprints
+    :returns dictionary of parameters and pandas dataframe of fingerprints, or (None, None) if the file doesn't exist
+    """
+    if not os.path.isfile(fp_file):
+        return None, None
+    with open(fp_file) as fp:
+        saved = json.load(fp)
+    return saved['params'], pd.DataFrame(saved['storms'], columns=['sid', 'findex', 'hash'])
+
+
+def write_fingerprints(fp_file, params, fingerprints):
+    with open(fp_file, 'w') as fp:
+        json.dump(dict(params=params, storms=fingerprints[['sid', 'findex', 'hash']].values.tolist()), fp)
+
+
+def compare_fingerprints(old, new):
+    """
+    Compares the storm fingerprints of two IBTrACS releases
+    :param old: fingerprints of the previous release
+    :param new: fingerprints of the new release
+    :returns array of findex (new release) of new or changed storms, array of SIDs of changed or removed storms, and
+    dictionary of findex in the previous release: findex in the new release for unchanged storms
+    """
+    merged = old.merge(new, on='sid', how='outer', suffixes=('_old', '_new'), indicator=True)
+    unchanged = np.logical_and(merged['_merge'] == 'both', merged['hash_old'] == merged['hash_new'])
+
+    updated = np.sort(merged.loc[np.logical_and(~unchanged, merged['_merge'] != 'left_only'),
+                                 'findex_new'].values.astype(int))
+    dropped = merged.loc[np.logical_and(~unchanged, merged['_merge'] != 'right_only'), 'sid'].values
+    remap = dict(zip(merged.loc[unchanged, 'findex_old'].astype(int), merged.loc[unchanged, 'findex_new'].astype(int)))
+    return updated, dropped, remap
+
+
+def merge_rows(df, new_rows, remap):
+    """
+    Merges the summary rows of new or changed storms into an existing summary. Rows of storms that are not in remap
+    (changed or removed) are dropped, the findex of the remaining rows is updated to the new release, and the rows are
+    sorted by findex (the order of a full rebuild). Row order within each storm is kept
+    :param df: existing summary dataframe with a findex column
+    :param new_rows: summary dataframe of the new or changed storms
+    :param remap: dictionary of previous findex: new findex for unchanged storms
+    """
+    df = df[df['findex'].isin(list(remap))].copy()
+    df['findex'] = df['findex'].map(remap).astype(int)
+    merged = pd.concat([df, new_rows], ignore_index=True)
+    return merged.sort_values('findex', kind='mergesort').reset_index(drop=True)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Vectorized intensity change statistics for all storms at once from padded (storm x date_time) IBTrACS arrays:
+windspeed and pressure change over fixed time windows, rapid intensification (RI) episodes, RI before landfall and time
+spent at each storm category. Rapid intensification is defined as an increase in maximum sustained wind of at least
+30 kt in 24 hours.
+"""
+
+import numpy as np
+import pandas as pd
+from functions.landfall import landfall_runs
+
+# storm x date_time variables used for the intensity summary
+INTENSITY_VARIABLES = ['time', 'landfall', 'usa_sshs', 'usa_wind', 'usa_pres']
+
+
+def _minutes(tm):
+    # minutes since the first valid time in the array, -1 for NaT
+    valid = ~np.isnat(tm)
+    minutes = np.full(tm.shape, -1, dtype='int64')
+    if np.any(valid):
+        t = tm[valid].astype('datetime64[m]').astype('int64')
+        minutes[valid] = t - t.min()
+    return minutes
+
+
+def window_change(tm, values, hours):
+    """
+    Calculates the change in a variable over a fixed time window starting at each observation, for every storm at once.
+    The end of the window is matched to the observation of the same storm exactly hours later, so off-synoptic
+    observations (e.g. landfall) don't shift the window
+    :param tm: 2-D (storm x date_time) datetime64 array with NaT for missing times
+    :param values: 2-D (storm x date_time) array with NaN for missing values
+    :param hours: length of the window (hours)
+    :returns 2-D array of values[t + hours] - values[t], NaN where either value is missing
+    """
+    minutes = _minutes(tm)
+    valid = np.logical_and(minutes >= 0, ~np.isnan(values))
+    srow, sobs = np.nonzero(valid)
+
+    # one sorted key for all storms: storms are separated by more than the length of a storm plus the window
+    span = minutes.max() + hours * 60 + 1
+    key = srow * span + minutes[srow, sobs]
+    target = key + hours * 60
+    pos = np.minimum(np.searchsorted(key, target), len(key) - 1)
+    match = key[pos] == target
+
+    change = np.full(values.shape, np.nan)
+    change[srow[match], sobs[match]] = values[srow[pos[match]], sobs[pos[match]]] - values[srow[match], sobs[match]]
+    return change
+
+
+def _nanmax_rows(values, fillvalue=np.nan):
+    # row maximum, fillvalue for rows with no valid values (without the all-NaN warning)
+    result = np.full(values.shape[0], fillvalue, dtype='float')
+    has_values = np.any(~np.isnan(values), axis=1)
+    result[has_values] = np.nanmax(values[has_values], axis=1)
+    return result
+
+
+def episode_starts(mask, valid=None):
+    """
+    Finds the first observation of each run of consecutive True values in a 2-D (storm x date_time) boolean array
+    :param mask: 2-D (storm x date_time) boolean array
+    :param valid: optional 2-D boolean array of the observations that make up the runs, default is all observations.
+    Other observations (e.g. off-synoptic observations without a window match) are skipped and don't split a run
+    :returns 2-D boolean array, True at the first observation of each run
+    """
+    if valid is None:
+        valid = np.ones(mask.shape, dtype=bool)
+    srow, sobs = np.nonzero(valid)
+    values = mask[srow, sobs]
+    previous = np.zeros(len(values), dtype=bool)
+    previous[1:] = np.logical_and(values[:-1], srow[1:] == srow[:-1])
+    starts = np.zeros(mask.shape, dtype=bool)
+    starts[srow, sobs] = np.logical_and(values, ~previous)
+    return starts
+
+
+def hours_at_category(tm, cats, categories=(0, 1, 2, 3, 4, 5)):
+    """
+    Calculates the time each storm spends at each category. Each observation is assigned the time until the next
+    observation of the storm
+    :param tm: 2-D (storm x date_time) datetime64 array with NaT for missing times
+    :param cats: 2-D (storm x date_time) array of storm categories (usa_sshs) with NaN for missing values
+    :param categories: categories to include, default is TS (0) and hurricane categories 1-5
+    :returns 2-D (storm x category) array of hours
+    """
+    duration = np.zeros(tm.shape)
+    duration[:, :-1] = (tm[:, 1:] - tm[:, :-1]) / np.timedelta64(1, 'h')
+    duration[np.isnan(duration)] = 0  # last observation of each storm
+    return np.column_stack([np.sum(np.where(cats == c, duration, 0), axis=1) for c in categories])
+
+
+def intensity_summary(arrays, ri_threshold=30, ri_hours=24, lf_threshold=111, pre_landfall_hours=48):
+    """
+    Summarizes the intensity changes of every storm
+    :param arrays: dictionary of arrays from load_track_arrays with (at least) INTENSITY_VARIABLES
+    :param ri_threshold: windspeed increase that defines rapid intensification (kt), default is 30
+    :param ri_hours: rapid intensification window (hours), default is 24
+    :param lf_threshold: landfall distance from shore (km), default is 111 (60 nmile)
+    :param pre_landfall_hours: RI episodes that end within this many hours before (or at) the beginning of a landfall
+    are counted as RI before landfall, default is 48
+    :returns pandas dataframe with one row per storm
+    """
+    tm = arrays['time']
+    wspd = arrays['usa_wind']
+    pres = arrays['usa_pres']
+    nstorms = tm.shape[0]
+
+    dwind24 = window_change(tm, wspd, 24)
+    dwind48 = window_change(tm, wspd, 48)
+    dpres24 = window_change(tm, pres, 24)
+
+    # RI episodes: runs of consecutive observations where the windspeed increase over the next ri_hours is at least
+    # ri_threshold. Observations without a change over the window (e.g. off-synoptic observations) don't split a run
+    dwind_ri = dwind24 if ri_hours == 24 else window_change(tm, wspd, ri_hours)
+    matched = ~np.isnan(dwind_ri)
+    ri = dwind_ri >= ri_threshold
+    ri_start = episode_starts(ri, matched)
+    srow, sobs = np.nonzero(ri_start)
+    first_ri = np.full(nstorms, np.datetime64('NaT'), dtype=tm.dtype)
+    rows, first = np.unique(srow, return_index=True)  # srow is sorted, so this is the first episode of each storm
+    first_ri[rows] = tm[rows, sobs[first]]
+
+    # RI episodes that end between pre_landfall_hours before and the beginning of any landfall of the storm
+    ri_end = episode_starts(ri[:, ::-1], matched[:, ::-1])[:, ::-1]
+    erow, eobs = np.nonzero(ri_end)
+    ri_end_time = tm[erow, eobs] + np.timedelta64(ri_hours, 'h')
+    lrow, lobs, _ = landfall_runs(arrays['landfall'], threshold=lf_threshold)
+    pairs = pd.DataFrame(dict(row=erow, ri_end=ri_end_time)).merge(
+        pd.DataFrame(dict(row=lrow, lf_time=tm[lrow, lobs])), on='row')
+    before = np.logical_and(pairs['ri_end'] <= pairs['lf_time'],
+                            pairs['ri_end'] >= pairs['lf_time'] - np.timedelta64(pre_landfall_hours, 'h'))
+    # an episode is counted once even if it precedes more than one landfall
+    ri_before_landfall = np.bincount(pairs.loc[before, ['row', 'ri_end']].drop_duplicates()['row'],
+                                     minlength=nstorms)
+
+    hours = hours_at_category(tm, arrays['usa_sshs'])
+    summary = dict(findex=arrays['findex'],
+                   sid=arrays['sid'],
+                   name=arrays['name'],
+                   max_wspd_kts=_nanmax_rows(wspd),
+                   min_pres=-_nanmax_rows(-pres),
+                   max_dwind_24h=_nanmax_rows(dwind24),
+                   max_dwind_48h=_nanmax_rows(dwind48),
+                   min_dpres_24h=-_nanmax_rows(-dpres24),
+                   ri_episodes=np.sum(ri_start, axis=1),
+                   first_ri_time=first_ri,
+                   ri_before_landfall=ri_before_landfall)
+    for i, cat in enumerate(['ts', 'cat1', 'cat2', 'cat3', 'cat4', 'cat5']):
+        summary['hours_{}'.format(cat)] = hours[:, i]
+    return pd.DataFrame(summary)
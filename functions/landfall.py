@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Functions to find landfalls in IBTrACS storm tracks. Landfall is defined as the eye of the storm < 60 nmile (111 km)
+from land.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def consecutive_runs(ind):
+    """
+    Breaks an array of indices into runs of consecutive indices
+    :param ind: sorted array of indices
+    :returns list of arrays, one per run of consecutive indices
+    """
+    ind = np.asarray(ind)
+    if len(ind) == 0:
+        return []
+    return np.split(ind, np.flatnonzero(np.diff(ind) > 1) + 1)
+
+
+def landfall_runs(landfall, threshold=111, fillvalue=-9999):
+    """
+    Finds the beginning and end of each individual landfall (run of consecutive points where the landfall distance is
+    < threshold) for every storm at once
+    :param landfall: 2-D (storm x date_time) array of IBTrACS landfall distance (km), fill values or NaN are ignored
+    :param threshold: landfall distance threshold (km), default is 111 km (60 nmile)
+    :param fillvalue: landfall fill value, default is -9999
+    :returns flat arrays of the storm (row) index, the index of the first point and the index of the last point of
+    each landfall, ordered by storm then time
+    """
+    lf = np.atleast_2d(landfall)
+    lf_mask = np.logical_and(lf != fillvalue, lf < threshold)
+
+    # pad with False on both sides so every run has a rising and a falling edge
+    padded = np.zeros((lf_mask.shape[0], lf_mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = lf_mask
+    edges = np.diff(padded, axis=1)
+
+    srow, start = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    return srow, start, end - 1
+
+
+def prelandfall_windows(tm, offsets, storm, first, last=None, days=3):
+    """
+    Finds the observations from days before to the time of each landfall, for all landfalls of all storms at once, with
+    one np.searchsorted on a key that sorts every observation by storm then time
+    :param tm: flat datetime64 array of the observations of all storms (see functions/ragged.py), sorted by time within
+    each storm
+    :param offsets: int array of the start of each storm in tm, plus the total length
+    :param storm: storm (row in offsets) of each landfall
+    :param first: index in tm of the first point of each landfall
+    :param last: optional index in tm of the last point of each landfall, default is first
+    :param days: length of the window before landfall (days), default is 3
+    :returns arrays of the start (inclusive) and stop (exclusive) index in tm of each window
+    """
+    first = np.asarray(first, dtype='int64')
+    last = first if last is None else np.asarray(last, dtype='int64')
+    if len(first) == 0:
+        return first, last
+
+    minutes = tm.astype('datetime64[m]').astype('int64')
+    minutes = minutes - minutes.min()
+    window = days * 24 * 60
+
+    # storms are separated by more than the length of a storm plus the window
+    span = minutes.max() + window + 1
+    key = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)) * span + minutes
+    storm = np.asarray(storm, dtype='int64')
+    start = np.searchsorted(key, storm * span + minutes[first] - window, side='left')
+    stop = np.searchsorted(key, storm * span + minutes[last], side='right')
+    return start, stop
+
+
+def window_index(start, stop):
+    """
+    Converts index ranges to flat index arrays
+    :returns array of the window number and array of the index of every observation in the windows
+    """
+    lengths = stop - start
+    window = np.repeat(np.arange(len(start)), lengths)
+    return window, np.arange(np.sum(lengths)) - np.repeat(np.cumsum(lengths) - lengths, lengths) + start[window]
+
+
+def prelandfall_points(tracks, storm, first, last=None, days=3):
+    """
+    Exports the track points before each landfall as a table
+    :param tracks: RaggedTracks (functions/ragged.py)
+    :param storm: storm (position in the tracks) of each landfall
+    :param first: index within the storm of the first point of each landfall
+    :param last: optional index within the storm of the last point of each landfall, default is first
+    :param days: length of the window before landfall (days), default is 3
+    :returns dataframe with one row per track point (window, findex, sid, name and the track variables)
+    """
+    row = tracks.rows[np.asarray(storm, dtype='int64')]
+    first = tracks.offsets[row] + np.asarray(first, dtype='int64')
+    last = first if last is None else tracks.offsets[row] + np.asarray(last, dtype='int64')
+    start, stop = prelandfall_windows(tracks.data['time'], tracks.offsets, row, first, last, days)
+    window, ind = window_index(start, stop)
+
+    points = dict(window=window, findex=tracks.all_findex[row[window]], sid=tracks.all_sid[row[window]],
+                  name=tracks.all_name[row[window]])
+    points.update({v: values[ind] for v, values in tracks.data.items()})
+    return pd.DataFrame(points)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Minimal pipeline runner with a content-addressed artifact cache. Each step declares the steps it depends on and the
+parameters it uses. The key of a step's artifact is a hash of the step name, its parameters, the keys of its inputs
+and (for steps that read it) the content of the source file, so a step only runs again when something it depends on
+changes. Table artifacts are cached as Parquet, file artifacts (e.g. figures) as a list of the files written with
+their size and modification time, so a file artifact is no longer valid once another run overwrites its files.
+
+A step is a dictionary:
+    func: function called as func(source, inputs, params, outdir), where inputs is a dictionary of the artifacts of
+          the input steps. Table steps return a pandas dataframe, file steps return a list of files written
+    inputs: optional list of input step names
+    params: optional list of parameter names used by the step
+    kind: 'table' or 'files'
+    source: optional, False if the step doesn't read the source file directly (default is True)
+"""
+
+import os
+import json
+import time
+import hashlib
+import pandas as pd
+from functions.trace import span
+
+
+def directory_digest(path):
+    sha = hashlib.sha1()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            fpath = os.path.join(root, name)
+            stat = os.stat(fpath)
+            stamp = '{}:{}:{}\n'.format(os.path.relpath(fpath, path), stat.st_size, stat.st_mtime_ns)
+            sha.update(stamp.encode('utf-8'))
+    return sha.hexdigest()
+
+
+def file_digest(f, cache_dir, chunk_size=2 ** 24):
+    """
+    Calculates the sha1 of the content of a file. Digests are saved in cache_dir, keyed by path, size and modification
+    time, so each version of a file is only read once. The digest of a directory (e.g. a Parquet track store) is the
+    sha1 of the relative path, size and modification time of every file in it, so rebuilding the store changes it
+    """
+    if os.path.isdir(f):
+        return directory_digest(f)
+
+    digest_file = os.path.join(cache_dir, 'digests.json')
+    digests = dict()
+    if os.path.isfile(digest_file):
+        with open(digest_file) as fp:
+            digests = json.load(fp)
+
+    stat = os.stat(f)
+    stamp = '{}:{}:{}'.format(os.path.abspath(f), stat.st_size, stat.st_mtime_ns)
+    if stamp not in digests:
+        sha = hashlib.sha1()
+        with open(f, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(chunk_size), b''):
+                sha.update(chunk)
+        digests[stamp] = sha.hexdigest()
+        with open(digest_file, 'w') as fp:
+            json.dump(digests, fp, indent=2)
+    return digests[stamp]
+
+
+def step_order(steps, targets=None):
+    """
+    Returns the names of the steps needed for the targets, in dependency order
+    :param steps: dictionary of step name: step
+    :param targets: optional list of step names, default is all steps
+    """
+    order = []
+
+    def visit(name, path):
+        if name in path:
+            raise ValueError('Pipeline has a cycle: {}'.format(' -> '.join(path + [name])))
+        if name in order:
+            return
+        for dep in steps[name].get('inputs', []):
+            visit(dep, path + [name])
+        order.append(name)
+
+    for name in targets or list(steps):
+        visit(name, [])
+    return order
+
+
+def _artifact_file(cache_dir, name, key, kind):
+    return os.path.join(cache_dir, '{}-{}.{}'.format(name, key, 'parquet' if kind == 'table' else 'json'))
+
+
+def _file_stamp(f):
+    stat = os.stat(f)
+    return [os.path.abspath(f), stat.st_size, stat.st_mtime_ns]
+
+
+def _is_valid(artifact_file, kind):
+    if not os.path.isfile(artifact_file):
+        return False
+    if kind == 'files':
+        with open(artifact_file) as fp:
+            stamps = json.load(fp)
+        return all([os.path.isfile(x[0]) and _file_stamp(x[0]) == x for x in stamps])
+    return True
+
+
+def _load(artifact_file, kind):
+    if kind == 'table':
+        return pd.read_parquet(artifact_file)
+    with open(artifact_file) as fp:
+        return [x[0] for x in json.load(fp)]
+
+
+def run_pipeline(steps, source, params, outdir, cache_dir, targets=None, force=False):
+    """
+    Runs the steps needed for the targets, skipping steps with a valid cached artifact
+    :param steps: dictionary of step name: step
+    :param source: source data file (e.g. IBTrACS NetCDF file) or track store directory
+    :param params: dictionary of parameters
+    :param outdir: output directory for file artifacts
+    :param cache_dir: artifact cache directory
+    :param targets: optional list of step names to run, default is all steps
+    :param force: optional list of step names to run even if their artifact is cached
+    :returns dictionary of step name: artifact file, and dictionary of step name: 'cached' or run time (s)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(outdir, exist_ok=True)
+    source_digest = file_digest(source, cache_dir)
+
+    keys = dict()
+    artifacts = dict()
+    loaded = dict()
+    status = dict()
+    for name in step_order(steps, targets):
+        step = steps[name]
+        kind = step.get('kind', 'table')
+        inputs = step.get('inputs', [])
+        step_params = {p: params[p] for p in step.get('params', [])}
+        key = dict(step=name, params=step_params, inputs=[keys[i] for i in inputs])
+        if step.get('source', True):
+            key['source'] = source_digest
+        if kind == 'files':
+            key['outdir'] = os.path.abspath(outdir)
+        keys[name] = hashlib.sha1(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+        artifacts[name] = _artifact_file(cache_dir, name, keys[name], kind)
+
+        if _is_valid(artifacts[name], kind) and name not in (force or []):
+            status[name] = 'cached'
+            continue
+
+        # artifacts of the input steps are only read when a step has to run
+        for i in inputs:
+            if i not in loaded:
+                loaded[i] = _load(artifacts[i], steps[i].get('kind', 'table'))
+
+        start = time.time()
+        with span('pipeline step {}'.format(name)):
+            result = step['func'](source, {i: loaded[i] for i in inputs}, step_params, outdir)
+
+        # write to a temporary file first so an interrupted run doesn't leave a partial artifact
+        tmp_file = '{}.tmp'.format(artifacts[name])
+        if kind == 'table':
+            result.to_parquet(tmp_file, index=False)
+        else:
+            with open(tmp_file, 'w') as fp:
+                json.dump([_file_stamp(x) for x in result], fp, indent=2)
+        os.replace(tmp_file, artifacts[name])
+        loaded[name] = result
+        status[name] = round(time.time() - start, 3)
+
+    return artifacts, status
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Functions for drawing storm tracks on cartopy maps. All tracks in a style group are projected with one
+transform_points call and drawn as a single LineCollection instead of one ax.plot call per storm. Static basemaps can
+be rendered once and reused as a cached image.
+"""
+
+import numpy as np
+import os
+import json
+import hashlib
+import matplotlib.pyplot as plt
+import cartopy.crs as ccrs
+from matplotlib.collections import LineCollection
+
+
+def track_segments(projection, lons, lats):
+    """
+    Projects a list of storm tracks in one call and splits them into line segments at track boundaries, missing
+    values, and where a track crosses the edge of the map (the antimeridian of the projection)
+    :param projection: cartopy projection of the map
+    :param lons: list of longitude arrays, one per track
+    :param lats: list of latitude arrays, one per track
+    :returns list of projected (n x 2) segment arrays and (n x 2) array of all valid projected points
+    """
+    if len(lons) == 0:
+        return [], np.empty((0, 2))
+
+    lengths = np.array([len(x) for x in lons])
+    lon = np.concatenate(lons).astype('float64')
+    lat = np.concatenate(lats).astype('float64')
+    valid = np.logical_and(np.isfinite(lon), np.isfinite(lat))
+
+    # longitude relative to the center of the map, so a jump of > 180 degrees is a crossing of the map edge
+    lon0 = projection.proj4_params.get('lon_0', 0)
+    rel_lon = (lon - lon0 + 180) % 360 - 180
+
+    brk = np.zeros(len(lon), dtype=bool)
+    brk[np.cumsum(lengths)[:-1]] = True
+    brk[1:] = np.logical_or.reduce([brk[1:], np.abs(np.diff(rel_lon)) > 180, ~valid[:-1]])
+
+    xy = projection.transform_points(ccrs.PlateCarree(), lon, lat)[:, :2]
+    valid = np.logical_and(valid, np.all(np.isfinite(xy), axis=1))
+
+    segment_id = np.cumsum(brk)[valid]
+    xy = xy[valid]
+    segments = np.split(xy, np.flatnonzero(np.diff(segment_id)) + 1)
+    return [s for s in segments if len(s) > 1], xy
+
+
+def add_tracks(ax, lons, lats, color, linewidth=None, alpha=None, marker=None, markersize=1, zorder=2):
+    """
+    Draws a group of storm tracks with the same style on a cartopy map as a single LineCollection (plus a single
+    marker artist if a marker is specified)
+    :param ax: cartopy map axis object
+    :param lons: list of longitude arrays, one per track
+    :param lats: list of latitude arrays, one per track
+    :param color: line color
+    :param linewidth: line width, default is the matplotlib default (rcParams['lines.linewidth']), as with ax.plot
+    :param alpha: optional transparency
+    :param marker: optional marker drawn at every track point
+    :param markersize: marker size, default is 1
+    :param zorder: drawing order, default is 2
+    """
+    if linewidth is None:
+        linewidth = plt.rcParams['lines.linewidth']
+    segments, points = track_segments(ax.projection, lons, lats)
+    lc = LineCollection(segments, colors=color, linewidths=linewidth, alpha=alpha, zorder=zorder)
+    ax.add_collection(lc, autolim=False)
+
+    if marker not in [None, 'None', '']:
+        ax.plot(points[:, 0], points[:, 1], linestyle='none', marker=marker, markersize=markersize, c=color,
+                alpha=alpha, zorder=zorder, transform=ax.projection)
+
+
+def add_cached_basemap(ax, add_features, cache_dir, args=(), dpi=300, sources=(), version=None):
+    """
+    Adds a static basemap (e.g. bathymetry, coastlines and borders drawn by add_map_features) to a cartopy map as a
+    pre-rendered image. The basemap is rendered once for each combination of features function (its name and code),
+    arguments, data files (path, size and modification time), version, projection, figure size, axes position and dpi,
+    and saved to cache_dir. Later maps with the same layout display the cached image so the map cost only depends on
+    the tracks drawn on top of it. Replacing a data file or editing the features function renders a new basemap
+    :param ax: cartopy map axis object
+    :param add_features: function that draws the basemap, called as add_features(ax, *args, dpi=dpi)
+    :param cache_dir: directory where rendered basemaps are saved
+    :param args: optional arguments passed to add_features
+    :param dpi: resolution of the basemap (passed to add_features) and of the saved figure, default is 300
+    :param sources: optional list of data files read by add_features (e.g. the bathymetry file)
+    :param version: optional version string of the basemap, change it to render the basemap again
+    """
+    fig = ax.figure
+    figsize = tuple(np.round(fig.get_size_inches(), 4))
+    position = tuple(np.round(ax.get_position().bounds, 4))
+    code = add_features.__code__
+    code = hashlib.sha1(code.co_code + repr(code.co_consts).encode('utf-8')).hexdigest()
+    stamps = []
+    for f in sources:
+        stat = os.stat(f) if os.path.exists(f) else None
+        stamps.append((os.path.abspath(f), stat and stat.st_size, stat and stat.st_mtime_ns))
+    key = repr((add_features.__module__, add_features.__name__, code, args, stamps, version, ax.projection.proj4_init,
+                figsize, position, dpi))
+    key = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    image_file = os.path.join(cache_dir, 'basemap_{}.png'.format(key))
+    extent_file = os.path.join(cache_dir, 'basemap_{}.json'.format(key))
+
+    if not os.path.isfile(extent_file):
+        os.makedirs(cache_dir, exist_ok=True)
+        bfig = plt.figure(figsize=figsize, dpi=dpi)
+        bax = bfig.add_axes(position, projection=ax.projection)
+        add_features(bax, *args, dpi=dpi)
+        bax.apply_aspect()
+        extent = bax.get_extent()
+
+        # resize the figure to the final axes box so the saved image covers exactly the map extent
+        pos = bax.get_position()
+        bfig.set_size_inches(pos.width * figsize[0], pos.height * figsize[1])
+        bax.set_position([0, 0, 1, 1])
+        bax.axis('off')
+        bfig.savefig(image_file, dpi=dpi, transparent=True)
+        plt.close(bfig)
+        with open(extent_file, 'w') as fp:
+            json.dump(dict(extent=list(extent), features=add_features.__name__, args=repr(args)), fp)
+
+    with open(extent_file) as fp:
+        extent = json.load(fp)['extent']
+    ax.imshow(plt.imread(image_file), origin='upper', extent=extent, transform=ax.projection, zorder=0,
+              interpolation='none')
+    ax.set_extent(extent, crs=ax.projection)
+
+
+def add_heatmap(ax, da, cmap='YlOrRd', vmax=None, label=None):
+    """
+    Draws a gridded field (e.g. storm counts from functions/climatology.py) on a cartopy map. Cells with a value of 0
+    are transparent. The cost of the map only depends on the size of the grid
+    :param ax: cartopy map axis object
+    :param da: 2-D (lat x lon) xarray DataArray
+    :param cmap: colormap, default is 'YlOrRd'
+    :param vmax: optional maximum of the color scale, default is the maximum of the field
+    :param label: optional colorbar label
+    """
+    values = np.ma.masked_equal(da.values, 0)
+    pc = ax.pcolormesh(da['lon'].values, da['lat'].values, values, cmap=cmap, vmin=0, vmax=vmax, shading='nearest',
+                       transform=ccrs.PlateCarree(), zorder=1)
+    cb = plt.colorbar(pc, ax=ax, shrink=0.7, pad=0.02)
+    if label:
+        cb.set_label(label)
+    return pc
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Compact (ragged) storm track container: one flat array per variable with the valid observations of all storms, storm
+after storm, and an int64 offsets array (the observations of storm i are offsets[i]:offsets[i + 1]). The arrays are
+saved as .npy files and memory-mapped when loaded, so each storm is a view into the flat arrays instead of a padded
+360 observation copy with -9999 fill values
+"""
+
+import numpy as np
+import os
+import json
+from functions.track_store import load_track_arrays
+
+# variables saved in the ragged track files by default
+RAGGED_VARIABLES = ['time', 'lat', 'lon', 'landfall', 'dist2land', 'usa_sshs', 'usa_wind', 'usa_pres']
+
+
+class RaggedTracks(object):
+    """
+    Storm tracks stored as flat arrays with an offsets array. Missing values are NaN (NaT for time)
+    :param data: dictionary of variable: flat array
+    :param offsets: int64 array of the start of each storm in the flat arrays, plus the total length
+    :param findex: storm index in the IBTrACS file of each storm (sorted)
+    :param sid: storm id of each storm
+    :param name: name of each storm
+    :param rows: optional selection of storms (positions in findex), default is all storms
+    """
+    def __init__(self, data, offsets, findex, sid, name, rows=None):
+        self.data = data
+        self.offsets = offsets
+        self.all_findex = findex
+        self.all_sid = sid
+        self.all_name = name
+        self.rows = np.arange(len(findex)) if rows is None else np.asarray(rows, dtype='int64')
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for i in range(len(self.rows)):
+            yield self.storm(i)
+
+    @property
+    def findex(self):
+        return self.all_findex[self.rows]
+
+    @property
+    def sid(self):
+        return self.all_sid[self.rows]
+
+    @property
+    def name(self):
+        return self.all_name[self.rows]
+
+    @property
+    def lengths(self):
+        return self.offsets[self.rows + 1] - self.offsets[self.rows]
+
+    def storm(self, i):
+        """
+        Returns a dictionary of variable: view of the observations of the ith selected storm
+        """
+        row = self.rows[i]
+        obs = slice(self.offsets[row], self.offsets[row + 1])
+        return {v: values[obs] for v, values in self.data.items()}
+
+    def first(self, variable):
+        # first observation of each selected storm (storms always have at least one observation)
+        return self.data[variable][self.offsets[self.rows]]
+
+    def last(self, variable):
+        return self.data[variable][self.offsets[self.rows + 1] - 1]
+
+    def flat_index(self):
+        """
+        Returns the position of the storm (in the selection) and the index in the flat arrays of every observation of
+        the selected storms, storm after storm
+        """
+        lengths = self.lengths
+        storm = np.repeat(np.arange(len(self.rows)), lengths)
+        obs = np.arange(np.sum(lengths)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return storm, self.offsets[self.rows][storm] + obs
+
+    def select(self, findex):
+        """
+        Selects storms by their storm index in the IBTrACS file, in the order given
+        :param findex: list of storm indices
+        :returns RaggedTracks that shares the flat arrays
+        """
+        findex = np.asarray(findex, dtype='int64')
+        rows = np.searchsorted(self.all_findex, findex)
+        found = rows < len(self.all_findex)
+        found[found] = self.all_findex[rows[found]] == findex[found]
+        if not np.all(found):
+            raise KeyError('Storms not found in the tracks: {}'.format(findex[~found].tolist()))
+        return RaggedTracks(self.data, self.offsets, self.all_findex, self.all_sid, self.all_name, rows)
+
+
+def ragged_from_arrays(arrays, variables):
+    """
+    Converts dense (storm x date_time) arrays from load_track_arrays to RaggedTracks. Valid observations are the
+    observations with a valid time
+    """
+    valid = ~np.isnat(arrays['time'])
+    offsets = np.concatenate([[0], np.cumsum(np.sum(valid, axis=1))]).astype('int64')
+    data = {v: arrays[v][valid] for v in variables}
+    return RaggedTracks(data, offsets, arrays['findex'], arrays['sid'], arrays['name'])
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return dict(source=os.path.abspath(path), size=stat.st_size, mtime=stat.st_mtime_ns)
+
+
+def build_ragged_tracks(path, track_dir, variables=None, chunk_size=1000):
+    """
+    Converts an IBTrACS NetCDF file (or track store) to ragged track files in track_dir. Storms are read in chunks so
+    only the compact arrays are held in memory
+    :param path: IBTrACS NetCDF file or track store directory
+    :param track_dir: output directory
+    :param variables: optional list of storm x date_time variables, default is RAGGED_VARIABLES
+    :param chunk_size: number of storms read at a time
+    """
+    variables = list(dict.fromkeys(['time'] + list(variables or RAGGED_VARIABLES)))
+    os.makedirs(track_dir, exist_ok=True)
+
+    findex = load_track_arrays(path, [])['findex']
+    parts = []
+    for start in range(0, len(findex), chunk_size):
+        arrays = load_track_arrays(path, variables, storms=findex[start:start + chunk_size])
+        parts.append(ragged_from_arrays(arrays, variables))
+
+    lengths = np.concatenate([np.diff(p.offsets) for p in parts])
+    np.save(os.path.join(track_dir, 'offsets.npy'), np.concatenate([[0], np.cumsum(lengths)]).astype('int64'))
+    for key in ['findex', 'sid', 'name']:
+        np.save(os.path.join(track_dir, '{}.npy'.format(key)), np.concatenate([getattr(p, key) for p in parts]))
+    for v in variables:
+        np.save(os.path.join(track_dir, '{}.npy'.format(v)), np.concatenate([p.data[v] for p in parts]))
+
+    with open(os.path.join(track_dir, 'index.json'), 'w') as fp:
+        json.dump(dict(_source_stamp(path), variables=variables), fp, indent=2)
+
+
+def load_ragged_tracks(track_dir, variables=None, mmap_mode='r'):
+    """
+    Loads ragged track files as memory-mapped arrays
+    :param track_dir: directory created by build_ragged_tracks
+    :param variables: optional list of variables to load, default is all variables in the files
+    :param mmap_mode: memory-map mode passed to np.load, default is read-only
+    """
+    with open(os.path.join(track_dir, 'index.json')) as fp:
+        index = json.load(fp)
+
+    def load(key):
+        return np.load(os.path.join(track_dir, '{}.npy'.format(key)), mmap_mode=mmap_mode)
+
+    data = {v: load(v) for v in (variables or index['variables'])}
+    return RaggedTracks(data, np.asarray(load('offsets')), np.asarray(load('findex')), load('sid'), load('name'))
+
+
+def get_ragged_tracks(path, variables=None, track_dir=None):
+    """
+    Loads the ragged tracks of an IBTrACS file, building the track files the first time they are used or when the
+    IBTrACS file has changed
+    :param path: IBTrACS NetCDF file or track store directory
+    :param variables: optional list of variables, default is RAGGED_VARIABLES
+    :param track_dir: optional directory for the track files, default is <path without extension>_ragged
+    """
+    variables = list(variables or RAGGED_VARIABLES)
+    if track_dir is None:
+        track_dir = '{}_ragged'.format(os.path.splitext(path.rstrip(os.sep))[0])
+
+    index_file = os.path.join(track_dir, 'index.json')
+    rebuild = True
+    if os.path.isfile(index_file):
+        with open(index_file) as fp:
+            index = json.load(fp)
+        rebuild = {k: index[k] for k in ['source', 'size', 'mtime']} != _source_stamp(path) or \
+            not set(variables).issubset(index['variables'])
+    if rebuild:
+        build_ragged_tracks(path, track_dir, list(dict.fromkeys(RAGGED_VARIABLES + variables)))
+
+    return load_ragged_tracks(track_dir, variables)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Spatial index over every IBTrACS track point (KD-tree of the points on the unit sphere) for radius, bounding box and
+polygon queries, optionally limited to a time window
+"""
+
+import numpy as np
+import os
+import pickle
+import pandas as pd
+import xarray as xr
+from scipy.spatial import cKDTree
+from matplotlib.path import Path
+from functions.track_store import decode_time_days
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def lonlat_to_xyz(lon, lat):
+    lon = np.radians(np.asarray(lon, dtype='float64'))
+    lat = np.radians(np.asarray(lat, dtype='float64'))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def read_track_points(f):
+    """
+    Reads every valid track point from an IBTrACS NetCDF file as flat arrays
+    :param f: IBTrACS NetCDF file
+    :returns dataframe with columns sid, findex, obs, time, lat, lon
+    """
+    ncfile = xr.open_dataset(f, mask_and_scale=False, decode_times=False)
+    nc = ncfile[['sid', 'numobs', 'time', 'lat', 'lon']]
+    numobs = nc['numobs'].values.astype('int64')
+    srow, sobs = np.nonzero(np.arange(nc.sizes['date_time'])[None, :] < numobs[:, None])
+    tm = nc['time']
+    points = pd.DataFrame(dict(sid=np.char.decode(nc['sid'].values, 'utf-8')[srow],
+                               findex=srow.astype('int32'),
+                               obs=sobs.astype('int16'),
+                               time=decode_time_days(tm.values[srow, sobs], tm.attrs['units'], tm.attrs['_FillValue']),
+                               lat=nc['lat'].values[srow, sobs],
+                               lon=nc['lon'].values[srow, sobs]))
+    ncfile.close()
+    return points[points['lat'] != nc['lat'].attrs['_FillValue']]
+
+
+def build_spatial_index(files, index_file):
+    """
+    Builds a spatial index of all track points in one or more IBTrACS NetCDF files and saves it to index_file. Points
+    of storms that are in more than one file (same SID and time) are only indexed once
+    :param files: list of IBTrACS NetCDF files
+    :param index_file: output file (pickle)
+    """
+    points = []
+    for fi, f in enumerate(files):
+        p = read_track_points(f)
+        p['source'] = np.int16(fi)
+        points.append(p)
+    points = pd.concat(points, ignore_index=True).drop_duplicates(subset=['sid', 'time'], keep='first')
+    points = points.reset_index(drop=True)
+
+    index = dict(files=[os.path.basename(f) for f in files],
+                 points=points,
+                 tree=cKDTree(lonlat_to_xyz(points['lon'].values, points['lat'].values)))
+    with open(index_file, 'wb') as fp:
+        pickle.dump(index, fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_spatial_index(index_file):
+    with open(index_file, 'rb') as fp:
+        return pickle.load(fp)
+
+
+def _time_filter(points, ind, t0, t1):
+    # limit point indices to the time window [t0, t1]
+    tm = points['time'].values[ind]
+    keep = np.ones(len(ind), dtype=bool)
+    if t0 is not None:
+        keep = np.logical_and(keep, tm >= np.datetime64(pd.Timestamp(t0)))
+    if t1 is not None:
+        keep = np.logical_and(keep, tm <= np.datetime64(pd.Timestamp(t1)))
+    return ind[keep]
+
+
+def query_radius(index, lon, lat, radius_km, t0=None, t1=None):
+    """
+    Finds all track points within radius_km of a location (great circle distance)
+    :param index: spatial index returned by load_spatial_index
+    :param lon: longitude of the location
+    :param lat: latitude of the location
+    :param radius_km: search radius (km)
+    :param t0: optional start of the time window
+    :param t1: optional end of the time window
+    :returns dataframe of matching track points (sid, findex, source, obs, time, lat, lon, dist_km), sorted by distance
+    """
+    xyz = lonlat_to_xyz(lon, lat)[0]
+    chord = 2 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2)
+    ind = np.array(index['tree'].query_ball_point(xyz, chord), dtype='int64')
+    ind = _time_filter(index['points'], ind, t0, t1)
+
+    result = index['points'].iloc[ind].copy()
+    dist = np.linalg.norm(index['tree'].data[ind] - xyz, axis=1)
+    result['dist_km'] = 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(dist / 2, 0, 1))
+    return result.sort_values('dist_km')
+
+
+def query_box(index, extent, t0=None, t1=None):
+    """
+    Finds all track points inside a bounding box. Box queries compare the longitude and latitude of every point (the
+    KD-tree is only used by query_radius)
+    :param index: spatial index returned by load_spatial_index
+    :param extent: [min lon, max lon, min lat, max lat], a box that crosses the antimeridian has min lon > max lon
+    (e.g. [170, -170, -30, 0])
+    :param t0: optional start of the time window
+    :param t1: optional end of the time window
+    :returns dataframe of matching track points
+    """
+    points = index['points']
+    lon = points['lon'].values
+    lat = points['lat'].values
+    if extent[0] > extent[1]:
+        inlon = np.logical_or(lon >= extent[0], lon <= extent[1])
+    else:
+        inlon = np.logical_and(lon >= extent[0], lon <= extent[1])
+    inbox = np.logical_and.reduce([inlon, lat >= extent[2], lat <= extent[3]])
+    ind = _time_filter(points, np.flatnonzero(inbox), t0, t1)
+    return points.iloc[ind].copy()
+
+
+def query_polygon(index, polygon, t0=None, t1=None):
+    """
+    Finds all track points inside a polygon
+    :param index: spatial index returned by load_spatial_index
+    :param polygon: (n x 2) array of polygon vertices [[lon, lat], ...], a polygon can cross the antimeridian (e.g.
+    [[170, -30], [-170, -30], [-170, 0], [170, 0]])
+    :param t0: optional start of the time window
+    :param t1: optional end of the time window
+    :returns dataframe of matching track points
+    """
+    polygon = np.array(polygon, dtype='float64')
+    # longitude jumps of more than 180 degrees between vertices cross the antimeridian: the vertices are unwrapped to a
+    # continuous longitude range, and the bounding box of a polygon that extends past +/-180 crosses the antimeridian
+    polygon[:, 0] = np.unwrap(polygon[:, 0], period=360)
+    lonmin = polygon[:, 0].min()
+    lonmax = polygon[:, 0].max()
+    extent = [lonmin, lonmax, polygon[:, 1].min(), polygon[:, 1].max()]
+    if lonmin < -180 or lonmax > 180:
+        extent[:2] = [(lonmin + 180) % 360 - 180, (lonmax + 180) % 360 - 180]
+    candidates = query_box(index, extent, t0, t1)
+
+    # candidate longitudes in the longitude range of the unwrapped polygon
+    lon = (candidates['lon'].values - lonmin) % 360 + lonmin
+    inside = Path(polygon).contains_points(np.column_stack([lon, candidates['lat'].values]))
+    return candidates[inside]
+
+
+def matching_storms(points):
+    """
+    Summarizes query results by storm
+    :param points: dataframe returned by query_radius, query_box or query_polygon
+    :returns dataframe with one row per storm (sid, source, findex, npoints, first and last matching time)
+    """
+    agg = dict(npoints=('obs', 'size'), t0=('time', 'min'), tf=('time', 'max'))
+    if 'dist_km' in points.columns:
+        agg['min_dist_km'] = ('dist_km', 'min')
+    return points.groupby(['sid', 'source', 'findex'], as_index=False).agg(**agg).sort_values('t0')
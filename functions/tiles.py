@@ -0,0 +1,228 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Renders storm tracks as XYZ (slippy map) tiles in Web Mercator for web map viewers, at several zoom levels. The tiles
+are transparent PNG overlays of the tracks (the viewer provides the base map). Only tiles crossed by a track are
+rendered, and tiles that are still empty after rendering (e.g. a track that only passes the corner of a tile) are
+skipped, so the open ocean and land without storms don't produce any files. The tiles are rendered by a pool of worker
+processes and written to a directory (<z>/<x>/<y>.png) or to an MBTiles (SQLite) file.
+
+A layer is a dictionary of a group of tracks drawn with the same style (see functions/plotting.add_tracks):
+    lons: list of longitude arrays, one per track
+    lats: list of latitude arrays, one per track
+    style: dictionary of add_tracks keywords (color, linewidth, alpha, marker, markersize)
+"""
+
+import numpy as np
+import os
+import io
+import json
+import sqlite3
+import matplotlib.pyplot as plt
+import cartopy.crs as ccrs
+from concurrent.futures import ProcessPoolExecutor
+from functions.plotting import add_tracks
+from functions.trace import span
+
+TILE_SIZE = 256
+HALF_WORLD = 20037508.342789244  # half the width of the Web Mercator world (m)
+MAX_LAT = 85.0511287798
+
+
+def mercator(lon, lat):
+    """
+    Converts longitude and latitude to Web Mercator (EPSG:3857) coordinates
+    :param lon: longitude array (degrees east)
+    :param lat: latitude array (degrees north), clipped to the latitude limits of the tiles
+    :returns x and y arrays (m)
+    """
+    lon = (np.asarray(lon, dtype='float64') + 180) % 360 - 180
+    lat = np.clip(np.asarray(lat, dtype='float64'), -MAX_LAT, MAX_LAT)
+    x = HALF_WORLD * lon / 180
+    y = HALF_WORLD / np.pi * np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+    return x, y
+
+
+def tile_bounds(z, x, y):
+    """
+    :param z: zoom level
+    :param x: tile column (0 at 180W)
+    :param y: tile row (0 at the top of the map, XYZ convention)
+    :returns [min x, max x, min y, max y] of the tile in Web Mercator coordinates (m)
+    """
+    size = 2 * HALF_WORLD / 2 ** z
+    return [-HALF_WORLD + x * size, -HALF_WORLD + (x + 1) * size, HALF_WORLD - (y + 1) * size, HALF_WORLD - y * size]
+
+
+def track_tiles(layers, z, buffer=2):
+    """
+    Finds the tiles crossed by the tracks at a zoom level from the bounding boxes of the track segments
+    :param layers: list of track layers (see the module docstring)
+    :param z: zoom level
+    :param buffer: margin around the segments in pixels (for line widths and markers), default is 2
+    :returns sorted list of (x, y) tiles
+    """
+    ntiles = 2 ** z
+    pad = buffer / TILE_SIZE
+    boxes = []
+    for layer in layers:
+        if len(layer['lons']) == 0:
+            continue
+        lengths = np.array([len(x) for x in layer['lons']])
+        lon = np.concatenate(layer['lons']).astype('float64')
+        lat = np.concatenate(layer['lats']).astype('float64')
+        valid = np.logical_and(np.isfinite(lon), np.isfinite(lat))
+        mx, my = mercator(np.where(valid, lon, 0), np.where(valid, lat, 0))
+        tx = (mx + HALF_WORLD) / (2 * HALF_WORLD) * ntiles
+        ty = (HALF_WORLD - my) / (2 * HALF_WORLD) * ntiles
+
+        # pairs of consecutive points of the same track, except across the antimeridian (drawn as separate segments)
+        pair = np.logical_and(valid[:-1], valid[1:])
+        pair[np.cumsum(lengths)[:-1] - 1] = False
+        pair &= np.abs(np.diff(tx)) < ntiles / 2
+        start = np.flatnonzero(pair)
+        single = valid & ~np.append(pair, False) & ~np.insert(pair, 0, False)
+        first = np.concatenate([start, np.flatnonzero(single)])
+        last = np.concatenate([start + 1, np.flatnonzero(single)])
+
+        box = np.column_stack([np.minimum(tx[first], tx[last]) - pad, np.maximum(tx[first], tx[last]) + pad,
+                               np.minimum(ty[first], ty[last]) - pad, np.maximum(ty[first], ty[last]) + pad])
+        boxes.append(np.clip(np.floor(box), 0, ntiles - 1).astype('int64'))
+
+    if len(boxes) == 0:
+        return []
+
+    # most segments are inside one tile, so the tiles of each distinct box are only listed once
+    tiles = set()
+    for x0, x1, y0, y1 in np.unique(np.concatenate(boxes), axis=0):
+        tiles.update([(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)])
+    return sorted(tiles)
+
+
+def _render_tiles(layers, tiles, tile_size=TILE_SIZE):
+    """
+    Renders a list of tiles (in a worker process): the tracks are drawn once on a Web Mercator map and each tile is
+    rendered by moving the map extent to the tile
+    :param layers: list of track layers
+    :param tiles: list of (z, x, y) tiles
+    :param tile_size: tile width and height in pixels, default is 256
+    :returns list of (z, x, y, png bytes) of the tiles that aren't empty
+    """
+    plt.switch_backend('Agg')
+    dpi = 100
+    fig = plt.figure(figsize=(tile_size / dpi, tile_size / dpi), dpi=dpi)
+    ax = fig.add_axes([0, 0, 1, 1], projection=ccrs.Mercator.GOOGLE)
+    ax.set_aspect('auto')
+    ax.axis('off')
+    fig.patch.set_visible(False)
+    ax.patch.set_visible(False)
+    for layer in layers:
+        add_tracks(ax, layer['lons'], layer['lats'], **layer['style'])
+
+    rendered = []
+    for z, x, y in tiles:
+        bounds = tile_bounds(z, x, y)
+        ax.set_xlim(bounds[:2])
+        ax.set_ylim(bounds[2:])
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        if not rgba[:, :, 3].any():
+            continue
+        buf = io.BytesIO()
+        plt.imsave(buf, rgba, format='png')
+        rendered.append((z, x, y, buf.getvalue()))
+    plt.close(fig)
+    return rendered
+
+
+class TileWriter(object):
+    """
+    Writes tiles to a directory (<z>/<x>/<y>.png, with a metadata.json file) or to an MBTiles file (if the path ends
+    with .mbtiles). MBTiles store the rows in the TMS convention (0 at the bottom of the map)
+    """
+    def __init__(self, path, metadata):
+        self.path = path
+        self.metadata = metadata
+        self.mbtiles = path.endswith('.mbtiles')
+        if self.mbtiles:
+            if os.path.isfile(path):
+                os.remove(path)
+            self.db = sqlite3.connect(path)
+            self.db.execute('CREATE TABLE metadata (name text, value text)')
+            self.db.execute('CREATE TABLE tiles (zoom_level integer, tile_column integer, tile_row integer, '
+                            'tile_data blob)')
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def write(self, z, x, y, data):
+        if self.mbtiles:
+            self.db.execute('INSERT INTO tiles VALUES (?, ?, ?, ?)', (z, x, 2 ** z - 1 - y, sqlite3.Binary(data)))
+        else:
+            tdir = os.path.join(self.path, str(z), str(x))
+            os.makedirs(tdir, exist_ok=True)
+            with open(os.path.join(tdir, '{}.png'.format(y)), 'wb') as fp:
+                fp.write(data)
+
+    def close(self):
+        if self.mbtiles:
+            self.db.executemany('INSERT INTO metadata VALUES (?, ?)', [(k, str(v)) for k, v in self.metadata.items()])
+            self.db.execute('CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)')
+            self.db.commit()
+            self.db.close()
+        else:
+            with open(os.path.join(self.path, 'metadata.json'), 'w') as fp:
+                json.dump(self.metadata, fp, indent=2)
+
+
+def write_track_tiles(layers, path, zooms=range(7), name='storm tracks', workers=None, tile_size=TILE_SIZE):
+    """
+    Renders storm track layers as XYZ tiles at several zoom levels
+    :param layers: list of track layers (see the module docstring)
+    :param path: output directory, or MBTiles file if the path ends with .mbtiles
+    :param zooms: zoom levels, default is 0 - 6
+    :param name: name of the tile set in the metadata
+    :param workers: number of worker processes, default is all cores. Tiles are rendered in this process if 1
+    :param tile_size: tile width and height in pixels, default is 256 (512 for high resolution displays)
+    :returns number of tiles written
+    """
+    zooms = sorted(zooms)
+    tiles = []
+    with span('find tiles', zooms=len(zooms)) as sp:
+        for z in zooms:
+            tiles.extend([(z, x, y) for x, y in track_tiles(layers, z)])
+        sp.count(tiles=len(tiles))
+
+    # bounds of the tracks in -180 to 180 degrees east, as the tiles (see mercator)
+    lon = np.concatenate([np.concatenate(layer['lons']) for layer in layers if len(layer['lons']) > 0] or [[]])
+    lon = (lon.astype('float64') + 180) % 360 - 180
+    lat = np.concatenate([np.concatenate(layer['lats']) for layer in layers if len(layer['lats']) > 0] or [[]])
+    bounds = [-180, -MAX_LAT, 180, MAX_LAT]
+    if np.isfinite(lon).any():
+        bounds = [np.nanmin(lon), max(np.nanmin(lat), -MAX_LAT), np.nanmax(lon), min(np.nanmax(lat), MAX_LAT)]
+    metadata = dict(name=name, format='png', type='overlay', version='1.1', minzoom=zooms[0], maxzoom=zooms[-1],
+                    bounds=','.join(['{:.4f}'.format(b) for b in bounds]),
+                    center='{:.4f},{:.4f},{}'.format((bounds[0] + bounds[2]) / 2, (bounds[1] + bounds[3]) / 2,
+                                                     zooms[0]))
+
+    writer = TileWriter(path, metadata)
+    ntiles = 0
+    with span('render tiles', tiles=len(tiles)) as sp:
+        if workers == 1 or len(tiles) < 2:
+            for z, x, y, data in _render_tiles(layers, tiles, tile_size):
+                writer.write(z, x, y, data)
+                ntiles += 1
+        else:
+            # each worker draws the tracks once per chunk of tiles, a few chunks per worker balance the load
+            nworkers = min(workers or os.cpu_count(), len(tiles))
+            nchunks = min(nworkers * 4, len(tiles))
+            chunks = [tiles[i::nchunks] for i in range(nchunks)]
+            with ProcessPoolExecutor(max_workers=nworkers) as executor:
+                for rendered in executor.map(_render_tiles, [layers] * nchunks, chunks, [tile_size] * nchunks):
+                    for z, x, y, data in rendered:
+                        writer.write(z, x, y, data)
+                    ntiles += len(rendered)
+        sp.count(written=ntiles)
+    writer.close()
+    return ntiles
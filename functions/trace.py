@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Stage-level timing and memory instrumentation. Tracing is enabled by setting the HURRICANE_TRACE environment variable
+to the path of a trace file, e.g. HURRICANE_TRACE=trace.json python hurricane_summary.py. Each span records its wall
+time, CPU time, the peak RSS of the process and optional item counts (e.g. storms processed, points drawn), and the
+spans are written as a Chrome trace file (open in chrome://tracing or https://ui.perfetto.dev) when the process exits.
+Worker processes (forked or spawned) write their own file (<trace file>.<pid>.json), which the first process merges
+into the trace file when it exits. When tracing is disabled, span returns a shared no-op object and traced returns the
+function unchanged.
+"""
+
+import atexit
+import functools
+import glob
+import json
+import multiprocessing.util
+import os
+import resource
+import sys
+import threading
+import time
+
+TRACE_ENV = 'HURRICANE_TRACE'
+_PARENT_ENV = 'HURRICANE_TRACE_PARENT'
+
+
+def maxrss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024 ** 2 if sys.platform == 'darwin' else maxrss / 1024
+
+
+class _NullSpan(object):
+    """
+    Span used when tracing is disabled
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def count(self, **counts):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """
+    A timed stage, recorded as a complete ('X') Chrome trace event when it exits
+    """
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = dict(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.start_cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.args.update(cpu_ms=round((time.process_time() - self.start_cpu) * 1000, 3),
+                         maxrss_mb=round(maxrss_mb(), 2))
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.add(dict(name=self.name, ph='X', ts=round(self.start * 1e6, 1),
+                             dur=round((end - self.start) * 1e6, 1), pid=os.getpid(),
+                             tid=threading.get_ident(), args=self.args))
+        return False
+
+    def __bool__(self):
+        return True
+
+    def count(self, **counts):
+        """
+        Adds item counts to the span, e.g. sp.count(storms=len(hindex), points=npoints)
+        """
+        for k, v in counts.items():
+            self.args[k] = self.args.get(k, 0) + int(v)
+
+
+class Tracer(object):
+    """
+    Collects the spans of a process and writes them as a Chrome trace file
+    """
+    def __init__(self, path, child=False):
+        self.trace_file = path
+        self.path = _child_path(path) if child else path
+        self.child = child
+        self.events = []
+        self.lock = threading.Lock()
+        atexit.register(self.write)
+        multiprocessing.util.register_after_fork(self, Tracer._forked)
+
+    def _forked(self):
+        # forked worker processes inherit the parent's spans, and exit without running atexit
+        self.path = _child_path(self.trace_file)
+        self.child = True
+        self.events = []
+        self.lock = threading.Lock()
+        multiprocessing.util.Finalize(None, self.write, exitpriority=10)
+
+    def add(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def write(self):
+        events = list(self.events)
+        if not self.child:
+            # merge the spans of the worker processes
+            for child_file in glob.glob(_child_path(self.trace_file, '*')):
+                with open(child_file) as fp:
+                    events.extend(json.load(fp)['traceEvents'])
+                os.remove(child_file)
+        if not events:
+            return
+        meta = [dict(name='process_name', ph='M', pid=os.getpid(), args=dict(name=' '.join(sys.argv) or 'python'))]
+        with open(self.path, 'w') as fp:
+            json.dump(dict(traceEvents=meta + events, displayTimeUnit='ms'), fp)
+
+
+def _child_path(path, pid=None):
+    return '{}.{}.json'.format(os.path.splitext(path)[0], pid or os.getpid())
+
+
+def _get_tracer():
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return None
+
+    # the first traced process writes the trace file, processes it starts (e.g. worker pools) write their own file
+    parent = os.environ.setdefault(_PARENT_ENV, str(os.getpid()))
+    return Tracer(path, child=parent != str(os.getpid()))
+
+
+_tracer = _get_tracer()
+
+
+def span(name, **args):
+    """
+    Context manager that records a stage. Counts can be given as keyword arguments or added with the count method of
+    the span:
+        with span('read tracks', variables=3) as sp:
+            ...
+            sp.count(storms=len(hindex))
+    :param name: name of the stage
+    :param args: optional item counts or other values shown with the stage
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return Span(_tracer, name, args)
+
+
+def traced(name=None):
+    """
+    Decorator that records every call of a function (e.g. a script's main) as a span
+    :param name: optional span name, default is <module>.<function>
+    """
+    def decorator(func):
+        if _tracer is None:
+            return func
+        module = func.__module__
+        if module == '__main__':
+            module = os.path.splitext(os.path.basename(sys.argv[0]))[0]
+        label = name or '{}.{}'.format(module, func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
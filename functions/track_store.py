@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Converts the padded (storm x date_time) IBTrACS NetCDF arrays to a fill-free columnar Parquet store with one row per
+track point, partitioned by storm basin and year, and reads it back
+"""
+
+import numpy as np
+import os
+import json
+import pandas as pd
+import xarray as xr
+import netCDF4
+
+# per-point variables written to the track store by default
+STORE_VARIABLES = ['time', 'lat', 'lon', 'landfall', 'dist2land', 'usa_sshs', 'usa_wind', 'usa_pres', 'basin']
+
+
+def decode_time_days(tm, units, fillvalue):
+    """
+    Converts numeric IBTrACS times (e.g. 'days since 1858-11-17 00:00:00') to datetime64, rounded to the nearest
+    second, with NaT for fill values
+    :param tm: array of numeric times
+    :param units: time units attribute
+    :param fillvalue: time fill value
+    """
+    step, origin = units.split(' since ')
+    step_seconds = dict(days=86400, hours=3600, minutes=60, seconds=1)[step.strip()]
+    origin = np.datetime64(pd.Timestamp(origin.strip()).to_datetime64(), 's')
+
+    tm = np.asarray(tm, dtype='float64')
+    fill = tm == fillvalue
+    seconds = np.round(np.where(fill, 0, tm) * step_seconds).astype('int64')
+    out = (origin + seconds.astype('timedelta64[s]')).astype('datetime64[ns]')
+    out[fill] = np.datetime64('NaT')
+    return out
+
+
+def decode_time_variable(ds):
+    """
+    Replaces the numeric time variable (or coordinate) of a dataset opened with decode_times=False with datetime64
+    values, with NaT for fill values, so time calculations are numpy reductions instead of comparisons of cftime
+    objects
+    """
+    tvar = ds['time']
+    attrs = {key: val for key, val in tvar.attrs.items() if key not in ['units', 'calendar', '_FillValue']}
+    decoded = xr.Variable(tvar.dims, decode_time_days(tvar.values, tvar.attrs['units'], tvar.attrs['_FillValue']),
+                          attrs)
+    if 'time' in ds.coords:
+        return ds.assign_coords(time=decoded)
+    return ds.assign(time=decoded)
+
+
+def first_last_times(tm):
+    """
+    Finds the first and last valid time of each storm
+    :param tm: 2-D (storm x date_time) datetime64 array with NaT for missing times
+    :returns arrays of first and last time (NaT for storms with no valid times)
+    """
+    tm = np.asarray(tm, dtype='datetime64[ns]')
+    ok = ~np.isnat(tm)
+    tint = tm.view('int64')
+    t0 = np.where(ok, tint, np.iinfo('int64').max).min(axis=1).view('datetime64[ns]')
+    t0[~np.any(ok, axis=1)] = np.datetime64('NaT')
+    # NaT is the smallest int64, so storms with no valid times are NaT
+    tf = np.where(ok, tint, np.iinfo('int64').min).max(axis=1).view('datetime64[ns]')
+    return t0, tf
+
+
+def datetime_year(tm):
+    # year of each datetime64 value (NaT values return -1)
+    tm = np.asarray(tm, dtype='datetime64[ns]')
+    year = tm.astype('datetime64[Y]').astype('int64') + 1970
+    year[np.isnat(tm)] = -1
+    return year
+
+
+def encode_time_days(tm, units, fillvalue):
+    """
+    Inverse of decode_time_days: converts datetime64 to numeric times in the units of the IBTrACS file
+    """
+    step, origin = units.split(' since ')
+    step_seconds = dict(days=86400, hours=3600, minutes=60, seconds=1)[step.strip()]
+    origin = pd.Timestamp(origin.strip()).to_datetime64()
+
+    tm = np.asarray(tm, dtype='datetime64[ns]')
+    out = (tm - origin) / np.timedelta64(1, 's') / step_seconds
+    out[np.isnat(tm)] = fillvalue
+    return out
+
+
+def _point_array(values, fillvalue):
+    # convert track point values to an arrow array with fill values stored as nulls
+    import pyarrow as pa
+    if values.dtype.kind == 'S':
+        values = np.char.decode(values, 'utf-8')
+        return pa.array(values, mask=values == '').dictionary_encode()
+    if fillvalue is None:
+        return pa.array(values)
+    return pa.array(values, mask=values == fillvalue)
+
+
+def build_track_store(f, store_dir, variables=None, chunk_size=1000, overwrite=False):
+    """
+    Converts an IBTrACS NetCDF file to a Parquet track store (one row per valid track point), partitioned by storm
+    basin (basin at the first observation) and year (year of the first observation). Each row keeps the storm index
+    in the NetCDF file (findex) and the position of the point along the track (obs)
+    :param f: IBTrACS NetCDF file
+    :param store_dir: output directory for the Parquet dataset
+    :param variables: optional list of storm x date_time variables to store, default is STORE_VARIABLES
+    :param chunk_size: number of storms read from the NetCDF file at a time
+    :param overwrite: replace an existing store, default is False
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    variables = variables or STORE_VARIABLES
+    if os.path.exists(store_dir):
+        if not overwrite:
+            raise FileExistsError('Track store already exists: {}'.format(store_dir))
+        import shutil
+        shutil.rmtree(store_dir)
+    os.makedirs(store_dir)
+
+    ncfile = xr.open_dataset(f, mask_and_scale=False, decode_times=False)
+    attrs = dict(source=os.path.basename(f),
+                 date_time=ncfile.sizes['date_time'],
+                 dtypes={v: ncfile[v].dtype.str for v in variables},
+                 variables={v: {key: (val.tolist() if hasattr(val, 'tolist') else val)
+                                for key, val in ncfile[v].attrs.items()} for v in variables})
+    tunits = ncfile['time'].attrs['units']
+    tfill = ncfile['time'].attrs['_FillValue']
+
+    for start in np.arange(0, ncfile.sizes['storm'], chunk_size):
+        nc = ncfile[variables + ['sid', 'name', 'numobs']].isel(storm=slice(start, start + chunk_size))
+
+        # valid track points are the first numobs observations of each storm
+        numobs = nc['numobs'].values.astype('int64')
+        obs = np.arange(nc.sizes['date_time'])
+        valid = obs[None, :] < numobs[:, None]
+        srow, sobs = np.nonzero(valid)
+
+        tm = decode_time_days(nc['time'].values, tunits, tfill)
+        first = tm[:, 0]
+        storm_year = pd.DatetimeIndex(first).year.values
+        storm_basin = np.char.decode(nc['basin'].values[:, 0], 'utf-8')
+
+        cols = dict(findex=pa.array((start + srow).astype('int32')),
+                    obs=pa.array(sobs.astype('int16')),
+                    sid=pa.array(np.char.decode(nc['sid'].values, 'utf-8')[srow]).dictionary_encode(),
+                    name=pa.array(np.char.decode(nc['name'].values, 'utf-8')[srow]).dictionary_encode())
+        for v in variables:
+            if v == 'time':
+                cols[v] = pa.array(tm[srow, sobs])
+            else:
+                cols[v] = _point_array(nc[v].values[srow, sobs], nc[v].attrs.get('_FillValue'))
+        cols['storm_basin'] = pa.array(storm_basin[srow])
+        cols['year'] = pa.array(storm_year[srow].astype('int32'))
+
+        table = pa.table(cols)
+        pq.write_to_dataset(table, root_path=store_dir, partition_cols=['storm_basin', 'year'],
+                            basename_template='part-{}-{{i}}.parquet'.format(start))
+
+    # files beginning with an underscore are skipped by the parquet dataset reader
+    with open(os.path.join(store_dir, '_attrs.json'), 'w') as fp:
+        json.dump(attrs, fp, indent=2)
+
+
+def read_tracks(store_dir, columns=None, filters=None):
+    """
+    Reads track points from a Parquet track store. Filters are pushed down to the partitions (storm_basin, year) and
+    to the row group statistics of the other columns (e.g. findex), so only the matching data are read
+    :param store_dir: Parquet track store directory created by build_track_store
+    :param columns: optional list of columns to read, default is all columns
+    :param filters: optional list of pyarrow filter tuples, e.g. [('year', '>=', 1970), ('storm_basin', '=', 'NA')]
+    :returns pandas dataframe with one row per track point, sorted by findex and obs
+    """
+    import pyarrow.parquet as pq
+    if columns is not None:
+        columns = list(dict.fromkeys(['findex', 'obs'] + list(columns)))
+    table = pq.read_table(store_dir, columns=columns, filters=filters, partitioning='hive')
+    df = table.to_pandas()
+    for col in ['storm_basin', 'year']:
+        if col in df.columns:
+            df[col] = np.asarray(df[col]).astype('int32' if col == 'year' else 'str')
+    return df.sort_values(['findex', 'obs']).reset_index(drop=True)
+
+
+def read_store_attrs(store_dir):
+    with open(os.path.join(store_dir, '_attrs.json')) as fp:
+        return json.load(fp)
+
+
+def tracks_to_dataset(df, attrs, decode_times=True):
+    """
+    Rebuilds padded (storm x date_time) arrays from track store points. Missing points are filled with the original
+    fill values and the storm coordinate is the storm index in the NetCDF file (findex), so the dataset can be used
+    in place of xr.open_dataset(f, mask_and_scale=False) with ncfile.sel(storm=findex)
+    :param df: dataframe returned by read_tracks
+    :param attrs: variable attributes returned by read_store_attrs
+    :param decode_times: decode the time variable to datetime64 (NaT for fill values), default is True
+    """
+    findex = np.unique(df['findex'].values)
+    row = np.searchsorted(findex, df['findex'].values)
+    col = df['obs'].values.astype('int64')
+    shape = (len(findex), max(attrs['date_time'], col.max() + 1 if len(col) > 0 else 0))
+
+    data_vars = dict()
+    for v in [c for c in df.columns if c in attrs['variables']]:
+        vattrs = dict(attrs['variables'][v])
+        dtype = np.dtype(attrs['dtypes'][v])
+        fillvalue = vattrs.get('_FillValue', b'' if dtype.kind == 'S' else None)
+        if v == 'time':
+            values = encode_time_days(df[v].values, vattrs['units'], fillvalue)
+        elif dtype.kind == 'S':
+            values = df[v].astype('object').fillna('').astype('str').values.astype(dtype)
+        else:
+            values = df[v].astype('float64').fillna(fillvalue).values.astype(dtype)
+        arr = np.full(shape, fillvalue, dtype=dtype)
+        arr[row, col] = values
+        data_vars[v] = (('storm', 'date_time'), arr, vattrs)
+
+    first = np.unique(row, return_index=True)[1]
+    for v, dtype in [('sid', 'S13'), ('name', 'S128')]:
+        if v in df.columns:
+            data_vars[v] = (('storm', ), df[v].astype('str').values[first].astype(dtype))
+
+    ds = xr.Dataset(data_vars, coords=dict(storm=findex))
+    if decode_times and 'time' in ds:
+        ds = decode_time_variable(ds)
+    return ds
+
+
+def open_tracks(path, variables=None, storms=None, filters=None, decode_times=True):
+    """
+    Opens IBTrACS track data from either the original NetCDF file or a Parquet track store. Only the requested
+    variables (plus sid and name) and storms are read, and the returned dataset is equivalent to
+    xr.open_dataset(f, mask_and_scale=False) with the storm coordinate set to the storm index in the NetCDF file
+    :param path: IBTrACS NetCDF file or track store directory
+    :param variables: optional list of storm x date_time variables to read, default is all variables
+    :param storms: optional list of storm indices (findex) to read, default is all storms
+    :param filters: optional list of additional pyarrow filter tuples (track store only)
+    :param decode_times: decode the time variable to datetime64 (NaT for fill values), default is True
+    """
+    if not os.path.isdir(path):
+        drop = None
+        if variables is not None:
+            with netCDF4.Dataset(path) as nc:
+                keep = list(variables) + ['sid', 'name']
+                drop = [v for v in nc.variables if v not in keep]
+        ds = xr.open_dataset(path, mask_and_scale=False, decode_times=False, drop_variables=drop)
+        if storms is not None:
+            ds = ds.assign_coords(storm=np.arange(ds.sizes['storm']))
+            ds = ds.isel(storm=np.unique(np.asarray(storms, dtype='int64')))
+        if decode_times and 'time' in ds.variables:
+            ds = decode_time_variable(ds)
+        return ds
+
+    filters = list(filters or [])
+    if storms is not None:
+        filters.append(('findex', 'in', [int(s) for s in storms]))
+    columns = None
+    if variables is not None:
+        columns = list(variables) + ['sid', 'name']
+    df = read_tracks(path, columns=columns, filters=filters or None)
+    return tracks_to_dataset(df, read_store_attrs(path), decode_times=decode_times)
+
+
+def _masked_array(values, attrs, name):
+    # dense array with fill values masked: NaT for time, '' for strings and NaN for numeric variables
+    fillvalue = attrs.get('_FillValue')
+    if name == 'time':
+        return decode_time_days(values, attrs['units'], fillvalue)
+    if values.dtype.kind == 'S':
+        return np.char.decode(values, 'utf-8')
+    values = values.astype('float64')
+    if fillvalue is not None:
+        values[values == fillvalue] = np.nan
+    return values
+
+
+def _read_netcdf(ncvar, index):
+    # read a netCDF4 variable, joining character arrays (last dimension is the string length) into fixed length strings
+    values = ncvar[index]
+    if values.dtype.kind == 'S' and ncvar.dimensions[-1] not in ['storm', 'date_time', 'quadrant']:
+        values = np.ascontiguousarray(values).view('S{}'.format(values.shape[-1]))[..., 0]
+    return values
+
+
+def _storm_selection(nstorms, storms, first_time, basin, years, basins):
+    # storm indices matching the storm indices, years (of the first observation) and basins (any observation)
+    rows = np.arange(nstorms) if storms is None else np.unique(np.asarray(storms, dtype='int64'))
+    keep = np.ones(len(rows), dtype=bool)
+    if years is not None:
+        keep = np.logical_and(keep, np.isin(pd.DatetimeIndex(first_time[rows]).year, years))
+    if basins is not None:
+        codes = np.array([b.encode('utf-8') for b in basins])
+        keep = np.logical_and(keep, np.any(np.isin(basin[rows], codes), axis=1))
+    return rows[keep]
+
+
+def load_track_arrays(path, variables, storms=None, years=None, basins=None):
+    """
+    Reads storm x date_time variables for a selection of storms as dense numpy arrays with the fill values already
+    masked (NaN for numeric variables, NaT for time, '' for strings). For a NetCDF file, only the hyperslab of the
+    selected storms of each requested variable is read (with netCDF4), instead of opening every variable in the file
+    :param path: IBTrACS NetCDF file or track store directory
+    :param variables: list of storm x date_time variables to read
+    :param storms: optional list of storm indices (findex) to read
+    :param years: optional list of years (year of the first observation of the storm)
+    :param basins: optional list of basin codes, storms that pass through any of the basins are read
+    :returns dictionary of variable: array (one row per storm), plus findex, sid and name (one value per storm)
+    """
+    variables = list(variables)
+    if os.path.isdir(path):
+        filters = [('year', 'in', [int(y) for y in years])] if years is not None else None
+        ds = open_tracks(path, variables=list(dict.fromkeys(variables + ['time', 'basin'])), storms=storms,
+                         filters=filters, decode_times=False)
+        first_time = decode_time_days(ds['time'].values[:, 0], ds['time'].attrs['units'],
+                                      ds['time'].attrs['_FillValue'])
+        pos = _storm_selection(ds.sizes['storm'], None, first_time, ds['basin'].values, years, basins)
+        arrays = dict(findex=ds['storm'].values[pos].astype('int64'), sid=ds['sid'].values[pos],
+                      name=ds['name'].values[pos])
+        for v in variables:
+            arrays[v] = _masked_array(ds[v].values[pos], ds[v].attrs, v)
+    else:
+        with netCDF4.Dataset(path) as nc:
+            nc.set_auto_maskandscale(False)
+            nstorms = len(nc.dimensions['storm'])
+            tvar = nc['time']
+            first_time = None
+            basin = None
+            if years is not None:
+                first_time = decode_time_days(tvar[:, 0], tvar.units, tvar.getncattr('_FillValue'))
+            if basins is not None:
+                basin = _read_netcdf(nc['basin'], slice(None))
+            rows = _storm_selection(nstorms, storms, first_time, basin, years, basins)
+
+            # read the block of storms spanning the selection once per variable, then keep the selected rows
+            span = slice(rows.min(), rows.max() + 1) if len(rows) > 0 else slice(0, 0)
+            sel = rows - span.start
+            arrays = dict(findex=rows)
+            for v in ['sid', 'name']:
+                arrays[v] = _read_netcdf(nc[v], span)[sel]
+            for v in variables:
+                ncvar = nc[v]
+                attrs = {key: ncvar.getncattr(key) for key in ncvar.ncattrs()}
+                arrays[v] = _masked_array(_read_netcdf(ncvar, span)[sel], attrs, v)
+
+    for v in ['sid', 'name']:
+        arrays[v] = np.char.decode(arrays[v], 'utf-8')
+    return arrays
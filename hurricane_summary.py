@@ -2,55 +2,101 @@
 
 """
 Author: Lori Garzio on 7/9/2020
-Last modified: 7/9/2020
+Last modified: 10/18/2026
 Creates a summary of all hurricanes in the years and ocean basin defined by the user
 """
 
 import numpy as np
 import os
-import cftime
 import pandas as pd
-import xarray as xr
+from functions.track_store import open_tracks, decode_time_days, datetime_year
+from functions.trace import span, traced
 pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
 
 
-def append_data(data_dict, ncfile_sel, yrs_lst, findex):
-    t0 = min(t for t in ncfile_sel['time'].values if t > cftime.DatetimeGregorian(1800, 1, 1, 0, 0, 0, 0))
-    if t0.year in yrs_lst:
-        data_dict['name'].append(ncfile_sel['name'].values.tostring().decode('utf-8'))
-        data_dict['basin'].append(extract_basin(ncfile_sel))
-        tf = max(ncfile_sel['time'].values)
-        data_dict['t0'].append(t0)
-        data_dict['tf'].append(tf)
-        data_dict['year'].append(t0.year)
-        data_dict['findex'].append(findex)
+def extract_basins(basin):
+    """
+    Finds the set of basins each storm passes through
+    :param basin: 2-D (storm x date_time) array of basin codes
+    :returns list of basin lists (one per storm, sorted) and dictionary of basin code: boolean array (one per storm)
+    """
+    codes = np.unique(basin)
+    codes = codes[codes != b'']
+    present = np.zeros((basin.shape[0], len(codes)), dtype=bool)
+    for ci, c in enumerate(codes):
+        present[:, ci] = np.any(basin == c, axis=1)
 
+    codes = np.array([c.decode('utf-8') for c in codes])
+    basin_list = [codes[row].tolist() for row in present]
+    return basin_list, dict(zip(codes, present.T))
 
-def extract_basin(ncfile_sel):
-    fbasin = np.unique(ncfile_sel['basin'].values)
-    basin_list = []
-    for b in fbasin:
-        if len(b.decode('utf-8')) > 0:
-            basin_list.append(b.decode('utf-8'))
-    return basin_list
 
+def storm_times(tm, units, fillvalue):
+    """
+    Finds the first and last valid time of each storm with masked reductions over the full numeric time array, and
+    converts only the results to datetime64
+    :param tm: 2-D (storm x date_time) array of numeric times (decode_times=False)
+    :param units: time units attribute
+    :param fillvalue: time fill value
+    :returns arrays of first time, last time (as datetime64), and a boolean array that is False for storms with no
+    valid times
+    """
+    ok = tm != fillvalue
+    has_time = np.any(ok, axis=1)
 
+    t0 = np.where(ok, tm, np.inf).min(axis=1)[has_time]
+    tf = np.where(ok, tm, -np.inf).max(axis=1)[has_time]
+    return decode_time_days(t0, units, fillvalue), decode_time_days(tf, units, fillvalue), has_time
+
+
+def summarize_storms(ncfile, yrs, bsin, storms=None):
+    """
+    Creates a summary of every storm in an IBTrACS file in one pass: time, basin and name are loaded once as
+    storm x date_time arrays instead of selecting each storm individually
+    :param ncfile: IBTrACS dataset opened with mask_and_scale=False and decode_times=False, or from open_tracks
+    :param yrs: list or array of years to include
+    :param bsin: ocean basin code (e.g. 'NA'), or 'all'
+    :param storms: optional array of storm positions to summarize, default is all storms in the dataset
+    :returns pandas dataframe with columns name, basin, year, t0, tf, findex
+    """
+    if storms is None:
+        storms = np.arange(ncfile.sizes['storm'])
+    storms = np.asarray(storms)
+    findex = ncfile['storm'].values[storms]
+    nc = ncfile[['time', 'basin', 'name']].isel(storm=storms)
+
+    tvar = nc['time']
+    t0, tf, has_time = storm_times(tvar.values, tvar.attrs['units'], tvar.attrs['_FillValue'])
+    year = datetime_year(t0)
+
+    basin_list, basin_present = extract_basins(nc['basin'].values[has_time])
+    names = np.char.decode(nc['name'].values[has_time], 'utf-8')
+
+    keep = np.isin(year, yrs)
+    if bsin != 'all':
+        keep = np.logical_and(keep, basin_present.get(bsin, np.zeros(len(year), dtype=bool)))
+
+    storm_summary = dict(name=names[keep],
+                         basin=[b for b, k in zip(basin_list, keep) if k],
+                         year=year[keep],
+                         t0=t0[keep],
+                         tf=tf[keep],
+                         findex=findex[has_time][keep])
+    return pd.DataFrame(storm_summary)
+
+
+@traced()
 def main(f, years, bsin):
     sDir = os.path.dirname(f)
-    ncfile = xr.open_dataset(f, mask_and_scale=False)
+    with span('open tracks'):
+        ncfile = open_tracks(f, variables=['time', 'basin'], decode_times=False)
 
     yrs = np.arange(years[0], years[1] + 1, 1)
-    storm_summary = dict(name=[], basin=[], year=[], t0=[], tf=[], findex=[])
-    for i, s in enumerate(ncfile['storm']):
-        stm = ncfile.sel(storm=i)
-        if bsin == 'all':
-            append_data(storm_summary, stm, yrs, i)
-        else:
-            basin_lst = extract_basin(stm)
-            if bsin in basin_lst:
-                append_data(storm_summary, stm, yrs, i)
-    df = pd.DataFrame(storm_summary)
-    df.to_csv(os.path.join(sDir, 'summary_1970-2019.csv'), index=False)
+    with span('summarize storms', storms=ncfile.sizes['storm']) as sp:
+        df = summarize_storms(ncfile, yrs, bsin)
+        sp.count(selected=len(df))
+    with span('write csv'):
+        df.to_csv(os.path.join(sDir, 'summary_1970-2019.csv'), index=False)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Command line interface to the hurricane-tools scripts. Each subcommand imports its script only when it runs, so CSV
+tasks (summary, landfalls, counts, match) don't load matplotlib or cartopy. Output files are written to the directory
+of the input file, as in the scripts.
+
+Subcommands:
+  summary     storm summary of the years and basin (hurricane_summary.py)
+  landfalls   landfall summary of the storms in summary_1970-2019.csv (storms_1970-2019_summary.py)
+  counts      yearly counts of landfalling storms and major hurricanes, optionally with the track maps
+              (storms_1970-2019_analysis.py)
+  match       closest landfall to each location of a .csv file (effect_size_storms.py)
+  map-na      North Atlantic hurricane track map (plot_hurricane_tracks.py)
+  map-global  global storm track map (plot_storm_tracks_global.py)
+  kml         export storm tracks to KML, GeoJSON or GeoParquet (export_storm_tracks.py)
+
+Examples:
+  hurricane-tools summary IBTrACS.NA.v04r00.nc --years 1970 2019 --basin NA
+  hurricane-tools match specific_landfall_storms-raw.csv NA_landfall_summary_1970-2019.csv -k 3
+  hurricane-tools map-na IBTrACS.NA.v04r00.nc --years 2000 2019 --impact US
+  hurricane-tools map-global IBTrACS.last3years.v04r00.nc --years 2019 --tiles global_storms2019.mbtiles --zooms 0 7
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+REPO = os.path.dirname(os.path.realpath(__file__))
+sys.path.append(REPO)
+sys.path.append(os.path.join(REPO, 'storms_1970-2019'))
+
+
+def year_range(years):
+    # [year] or [start year, end year] to [start year, end year]
+    return [years[0], years[-1]]
+
+
+def zoom_levels(zooms):
+    # [zoom] or [min zoom, max zoom] to the range of zoom levels
+    return range(zooms[0], zooms[-1] + 1)
+
+
+def use_agg():
+    # maps are saved to files, so no display is needed (e.g. when run from cron)
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def run_summary(args):
+    import hurricane_summary
+    hurricane_summary.main(args.file, year_range(args.years), args.basin)
+
+
+def run_landfalls(args):
+    storms_summary = importlib.import_module('storms_1970-2019_summary')
+    storms_summary.main(args.file, year_range(args.years))
+
+
+def run_counts(args):
+    import numpy as np
+    import pandas as pd
+    from functions.track_store import open_tracks
+    storms_analysis = importlib.import_module('storms_1970-2019_analysis')
+    sDir = os.path.dirname(args.file)
+    years = year_range(args.years)
+
+    if args.maps:
+        # the maps are drawn from the same storm table as the counts
+        use_agg()
+        storms_all, storms_major = storms_analysis.main(args.file, years, args.threshold, args.lon_cutoff)
+    else:
+        sf = pd.read_csv(os.path.join(sDir, 'summary_1970-2019.csv'))
+        hindex = sf['findex'].values
+        ncfile = open_tracks(args.file, variables=['time', 'lon', 'landfall', 'usa_sshs'], storms=hindex)
+        storms_all, storms_major = storms_analysis.landfall_counts(ncfile, hindex, np.arange(years[0], years[1] + 1),
+                                                                   args.threshold, args.lon_cutoff)
+    storms_analysis.export_df(storms_all, os.path.join(sDir, 'NA_landfalling_storms_all_1970-2019.csv'))
+    storms_analysis.export_df(storms_major, os.path.join(sDir, 'NA_landfalling_storms_major_1970-2019.csv'))
+
+
+def run_match(args):
+    effect_size_storms = importlib.import_module('effect_size_storms')
+    effect_size_storms.main(args.locations, args.landfalls, args.k)
+
+
+def run_map_na(args):
+    use_agg()
+    import plot_hurricane_tracks
+    plot_hurricane_tracks.main(args.file, args.years, args.impact, args.basemap_cache, projection=args.projection,
+                               basin=args.basin, savefile=args.savefile, tiles=args.tiles,
+                               zooms=zoom_levels(args.zooms), workers=args.workers, index_file=args.country_index)
+
+
+def run_map_global(args):
+    use_agg()
+    import plot_storm_tracks_global
+    savefile = args.savefile or 'global_storms{}'.format('-'.join([str(y) for y in args.years]))
+    plot_storm_tracks_global.main(args.file, args.years, savefile, args.basemap_cache, tiles=args.tiles,
+                                  zooms=zoom_levels(args.zooms), workers=args.workers)
+
+
+def run_kml(args):
+    import export_storm_tracks
+    savefile = args.savefile or '{}_tracks.kml'.format(os.path.splitext(args.file.rstrip(os.sep))[0])
+    years = None if args.years is None else range(args.years[0], args.years[-1] + 1)
+    export_storm_tracks.main(args.file, savefile, years, args.basins, args.tolerance)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='hurricane-tools', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    def add_command(name, func, help_text):
+        sub = subparsers.add_parser(name, help=help_text, description=help_text)
+        sub.set_defaults(func=func)
+        return sub
+
+    def add_years(sub, required=True, help_text='year or start and end year'):
+        sub.add_argument('--years', type=int, nargs='+', required=required, metavar='YEAR', help=help_text)
+
+    def add_tiles(sub):
+        sub.add_argument('--tiles', default=None,
+                         help='optional tile directory or .mbtiles file: also write the tracks as XYZ web map tiles')
+        sub.add_argument('--zooms', type=int, nargs='+', default=[0, 6], metavar='ZOOM',
+                         help='zoom level or min and max zoom level of the tiles (default: 0 6)')
+        sub.add_argument('--workers', type=int, default=None,
+                         help='number of processes that render the tiles (default: all cores)')
+
+    sub = add_command('summary', run_summary, 'Storm summary (summary_1970-2019.csv)')
+    sub.add_argument('file', help='IBTrACS NetCDF file or track store directory')
+    add_years(sub)
+    sub.add_argument('--basin', default='NA', help="ocean basin code, or 'all' (default: NA)")
+
+    sub = add_command('landfalls', run_landfalls, 'Landfall summary (NA_landfall_summary_1970-2019.csv)')
+    sub.add_argument('file', help='IBTrACS NetCDF file or track store directory, in the directory of the summary')
+    add_years(sub)
+
+    sub = add_command('counts', run_counts, 'Yearly counts of landfalling storms and major hurricanes')
+    sub.add_argument('file', help='IBTrACS NetCDF file or track store directory, in the directory of the summary')
+    add_years(sub)
+    sub.add_argument('--threshold', type=float, default=111, help='landfall distance from shore in km (default: 111)')
+    sub.add_argument('--lon-cutoff', type=float, default=-40,
+                     help='count landfalls west of this longitude (default: -40)')
+    sub.add_argument('--maps', action='store_true', help='also draw the track maps')
+
+    sub = add_command('match', run_match, 'Closest landfall of the same storm to each location')
+    sub.add_argument('locations', help='.csv file of locations with columns Year, Name, Lat, Lon (degrees west)')
+    sub.add_argument('landfalls', help='landfall summary file (NA_landfall_summary_1970-2019.csv)')
+    sub.add_argument('-k', type=int, default=1, help='number of closest landfalls exported for each location')
+
+    sub = add_command('map-na', run_map_na, 'North Atlantic hurricane track map')
+    sub.add_argument('file', help='IBTrACS NetCDF file or track store directory, in the directory of '
+                                  'summary_northatlantic2000_2019_mod.csv')
+    add_years(sub)
+    sub.add_argument('--impact', default='US', help="impact country 'US' or 'na' (default: US)")
+    sub.add_argument('--basin', default='all', help='basin code used to filter the summary (default: all)')
+    sub.add_argument('--projection', default='PlateCarree', help='cartopy projection (default: PlateCarree)')
+    sub.add_argument('--country-index', default=None,
+                     help='country index file from build_country_index.py (default: country_index.pkl in the '
+                          'directory of the file)')
+    sub.add_argument('--savefile', default=None, help='output file name (default: hurricanes2000-2019.png)')
+    sub.add_argument('--basemap-cache', default=None, help='optional directory for pre-rendered basemaps')
+    add_tiles(sub)
+
+    sub = add_command('map-global', run_map_global, 'Global storm track map and KML file')
+    sub.add_argument('file', help='IBTrACS NetCDF file or track store directory, in the directory of '
+                                  'summary_globalstorms2019_2020.csv')
+    add_years(sub)
+    sub.add_argument('--savefile', default=None, help='output file name without extension (default: global_storms'
+                                                      '<years>)')
+    sub.add_argument('--basemap-cache', default=None, help='optional directory for pre-rendered basemaps')
+    add_tiles(sub)
+
+    sub = add_command('kml', run_kml, 'Export storm tracks to KML, GeoJSON (.geojson) or GeoParquet (.parquet)')
+    sub.add_argument('file', help='IBTrACS NetCDF file or track store directory')
+    sub.add_argument('savefile', nargs='?', default=None, help='output file (default: <file>_tracks.kml)')
+    add_years(sub, required=False, help_text='optional year or start and end year (default: all years)')
+    sub.add_argument('--basins', nargs='+', default=None, help='optional basin codes (default: all basins)')
+    sub.add_argument('--tolerance', type=float, default=None,
+                     help='optional Douglas-Peucker tolerance in degrees (default: no simplification)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
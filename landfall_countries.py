@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Finds the country of every landfall of the storms in a summary file created by hurricane_summary.py by intersecting the
+storm tracks with Natural Earth country polygons (functions/countries.py), and adds the usimpact, canadaimpact and
+mexicoimpact columns to the summary. Saves <summary>_mod.csv and a .csv file of all landfalls with their country.
+"""
+
+import os
+import pandas as pd
+from functions.ragged import get_ragged_tracks
+from functions.countries import get_country_index, track_crossings, impact_flags
+from functions.trace import span, traced
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+
+
+@traced()
+def main(f, summary_file, index_file=None, shapefile=None):
+    """
+    :param f: IBTrACS NetCDF file or track store directory
+    :param summary_file: storm summary file created by hurricane_summary.py
+    :param index_file: optional country index file, default is country_index.pkl in the directory of f
+    :param shapefile: optional local Natural Earth admin 0 countries shapefile used to build the country index
+    """
+    sDir = os.path.dirname(f)
+    with span('load country index'):
+        index = get_country_index(index_file or os.path.join(sDir, 'country_index.pkl'), shapefile)
+
+    # keep_default_na=False so the basin code 'NA' isn't read as NaN
+    sf = pd.read_csv(summary_file, keep_default_na=False, na_values=[''])
+    sf = sf.drop(columns=['usimpact', 'canadaimpact', 'mexicoimpact'], errors='ignore')
+
+    with span('track crossings', storms=len(sf)) as sp:
+        tracks = get_ragged_tracks(f, ['time', 'lat', 'lon']).select(sf['findex'].values)
+        crossings = track_crossings(index, tracks)
+        sp.count(crossings=len(crossings))
+
+    fname = os.path.splitext(summary_file)[0]
+    crossings.to_csv('{}_landfall_countries.csv'.format(fname), index=False)
+    sf = sf.merge(impact_flags(crossings, sf['findex'].values), on='findex', how='left')
+    sf.to_csv('{}_mod.csv'.format(fname), index=False)
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/congress_brief2020/IBTrACS.NA.v04r00.nc'
+    summary = '/Users/lgarzio/Documents/rucool/hurricanes/congress_brief2020/summary_northatlantic2000_2019.csv'
+    main(fpath, summary)
@@ -2,7 +2,7 @@
 
 """
 Author: Lori Garzio on 1/12/2020
-Last modified: 1/12/2020
+Last modified: 10/18/2026
 Creates plot of global storm tracks
 """
 
@@ -10,57 +10,67 @@ import numpy as np
 import os
 import cmocean
 import pandas as pd
-import xarray as xr
-import simplekml
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
+from functions.ragged import get_ragged_tracks
+from functions.plotting import add_tracks, add_cached_basemap
+from functions.export import export_tracks
+from functions.tiles import write_track_tiles
+from functions.bathymetry import get_bathymetry
+from functions.trace import span, traced
 pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
 plt.rcParams.update({'font.size': 12})
 
+BATH_FILE = '/home/lgarzio/bathymetry_files/gebco_2020_netcdf/GEBCO_2020.nc'  # on server
+#BATH_FILE = '/Users/lgarzio/Documents/rucool/hurricanes/hurricane_tracks_global_jan2021/gebco_2020_netcdf/GEBCO_2020.nc'
 
-def add_map_features(ax, axes_limits=None):
+
+def add_map_features(ax, axes_limits=None, dpi=300):
     """
     Adds bathymetry and coastlines to a cartopy map object
     :param ax: plotting axis object
     :param axes_limits: optional list of axis limits [min lon, max lon, min lat, max lat]
+    :param dpi: resolution of the saved figure, used to choose the bathymetry resolution
     """
     if axes_limits is not None:
         ax.set_extent(axes_limits)
+        extent = axes_limits
+    else:
+        extent = [-180, 180, -90, 90]
 
-    # add bathymetry
-    bath_file = '/home/lgarzio/bathymetry_files/gebco_2020_netcdf/GEBCO_2020.nc'  # on server
-    #bath_file = '/Users/lgarzio/Documents/rucool/hurricanes/hurricane_tracks_global_jan2021/gebco_2020_netcdf/GEBCO_2020.nc'
-    ncbath = xr.open_dataset(bath_file)
-    elev = ncbath.elevation
-
-    # subset every nth point
-    n = 100
-    elev_sub = elev[::n, ::n]
+    # add bathymetry (read from the bathymetry cache, which is built the first time the file is used)
+    # use the coarsest bathymetry level with at least one grid point for every two pixels
+    npixels = ax.get_window_extent().width / ax.figure.dpi * dpi / 2
+    with span('read bathymetry') as sp:
+        bath_lon, bath_lat, bath_elev = get_bathymetry(BATH_FILE, extent, npixels)
+        sp.count(points=bath_elev.size)
 
     lev = np.arange(-9000, 9100, 100)
-    ax.contourf(elev_sub.lon.values, elev_sub.lat.values, elev_sub.values, lev, cmap=cmocean.cm.topo,
-                transform=ccrs.PlateCarree())
-    # ax.pcolormesh(elev_sub.lon.values, elev_sub.lat.values, elev_sub.values, cmap=cmocean.cm.topo,
-    #               transform=ccrs.PlateCarree())
-
-    coast = cfeature.NaturalEarthFeature('physical', 'coastline', '110m')
-    ax.add_feature(coast, edgecolor='black', facecolor='none')
+    with span('contourf', levels=len(lev)):
+        ax.contourf(bath_lon, bath_lat, bath_elev, lev, cmap=cmocean.cm.topo, transform=ccrs.PlateCarree())
+    # ax.pcolormesh(bath_lon, bath_lat, bath_elev, cmap=cmocean.cm.topo, transform=ccrs.PlateCarree())
 
-    ax.add_feature(cfeature.BORDERS)
+    with span('coastlines'):
+        coast = cfeature.NaturalEarthFeature('physical', 'coastline', '110m')
+        ax.add_feature(coast, edgecolor='black', facecolor='none')
 
+        ax.add_feature(cfeature.BORDERS)
 
-def subset_dataset(data_dict, ind):
-    d = dict()
-    for key, value in data_dict.items():
-        d[key] = value[ind]
 
-    return d
-
-
-def main(f, years, savefile):
+@traced()
+def main(f, years, savefile, basemap_cache=None, tiles=None, zooms=range(7), workers=None):
+    """
+    :param f: IBTrACS NetCDF file or track store directory
+    :param years: [year] or [start year, end year]
+    :param savefile: output file name without extension (.png and .kml files)
+    :param basemap_cache: optional directory for pre-rendered basemaps
+    :param tiles: optional tile directory or .mbtiles file, in the directory of f: the tracks are also written as XYZ
+    tiles for web maps (see functions/tiles.py)
+    :param zooms: zoom levels of the tiles, default is 0 - 6
+    :param workers: number of worker processes that render the tiles, default is all cores
+    """
     sDir = os.path.dirname(f)
-    ncfile = xr.open_dataset(f, mask_and_scale=False)
 
     summary_file = pd.read_csv(os.path.join(sDir, 'summary_globalstorms2019_2020.csv'))
     if len(years) == 1:
@@ -73,42 +83,50 @@ def main(f, years, savefile):
     hnames = list(sf['name'])
     hindex = list(sf['findex'])
 
+    with span('load ragged tracks', storms=len(hindex)):
+        tracks = get_ragged_tracks(f, ['time', 'lat', 'lon']).select(hindex)
+
     #fig, ax = plt.subplots(subplot_kw=dict(projection=ccrs.PlateCarree()))
     fig, ax = plt.subplots(subplot_kw=dict(projection=ccrs.Robinson()))
     #plt.title(ttl)
     ax.set_global()
 
-    kml = simplekml.Kml()
-
-    for i, hi in enumerate(hindex):
+    track_lons = []
+    track_lats = []
+    for i, full_track in enumerate(tracks):
         if i == 0:
-            add_map_features(ax)
-
-        ncf = ncfile.sel(storm=hi)
-        stm_name = ncf.name.values.tostring().decode('utf-8')
-        data = dict(tm=ncf['time'].values,
-                    lat=ncf['lat'].values,
-                    lon=ncf['lon'].values)
-
-        lat_ind = np.where(data['lat'] != -9999.)
-        full_track = subset_dataset(data, lat_ind)
-
-        coords = []
-        for ilon, longitude in enumerate(full_track['lon']):
-            coords.append((longitude, full_track['lat'][ilon]))
-
-        # add the track to the kml file
-        lin = kml.newlinestring(name=stm_name, coords=coords)
-
-        # plot full hurricane track
-        ax.plot(full_track['lon'], full_track['lat'], c='red', lw=.8, transform=ccrs.PlateCarree())
+            with span('add map features', cached=basemap_cache is not None):
+                if basemap_cache is None:
+                    add_map_features(ax)
+                else:
+                    # re-use the rendered bathymetry and coastlines from previous maps with the same layout
+                    add_cached_basemap(ax, add_map_features, basemap_cache, sources=[BATH_FILE])
+
+        # full_track is a dictionary of views of the valid observations of the storm
+        # full hurricane tracks are plotted together after the loop
+        track_lons.append(full_track['lon'])
+        track_lats.append(full_track['lat'])
+
+    layer = dict(lons=track_lons, lats=track_lats, style=dict(color='red', linewidth=.8))
+    with span('draw tracks', storms=len(track_lons)) as sp:
+        if sp:
+            sp.count(points=sum([len(x) for x in track_lons]))
+        add_tracks(ax, track_lons, track_lats, **layer['style'])
 
     sfile_png = os.path.join(sDir, '{}.png'.format(savefile))
-    plt.savefig(sfile_png, dpi=300)
+    with span('savefig', dpi=300):
+        plt.savefig(sfile_png, dpi=300)
     print(sfile_png)
     plt.close()
 
-    kml.save(os.path.join(sDir, '{}.kml'.format(savefile)))
+    # the tracks are streamed to the kml file one storm at a time
+    with span('export kml', storms=len(hindex)):
+        export_tracks(tracks, os.path.join(sDir, '{}.kml'.format(savefile)))
+
+    if tiles is not None:
+        # the same tracks as web map tiles
+        write_track_tiles([layer], os.path.join(sDir, tiles), zooms, name='{} {}'.format(savefile, ttl),
+                          workers=workers)
 
 
 if __name__ == '__main__':
@@ -116,4 +134,5 @@ if __name__ == '__main__':
     fpath = '/home/lgarzio/repo/lgarzio/hurricane-tools/files/IBTrACS.last3years.v04r00.nc'  # on server
     yrs = [2019]  # [2019]  [2010, 2019]
     sfilename = 'global_storms2019'
-    main(fpath, yrs, sfilename)
+    bmcache = None  # optional directory for pre-rendered basemaps, e.g. os.path.join(os.path.dirname(fpath), 'basemaps')
+    main(fpath, yrs, sfilename, bmcache)
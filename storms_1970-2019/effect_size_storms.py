@@ -2,13 +2,16 @@
 
 """
 Author: Lori Garzio on 2/17/2021
-Last modified: 2/17/2021
+Last modified: 10/18/2026
 """
 
 import numpy as np
 import os
+import sys
 import pandas as pd
-from geopy.distance import geodesic
+from pyproj import Geod
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functions.trace import span, traced
 pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
 
 
@@ -19,45 +22,67 @@ def return_clean_array(nc, varname):
     return ncvar_values
 
 
-def main(f1, f2):
+def match_landfalls(df1, df2, k=1):
+    """
+    Finds the k closest landfalls of the same storm (year and case-insensitive name) to each location in df1. Landfalls
+    are grouped by (year, lowercase name) with a hash join and all geodesic distances (WGS-84) are calculated in one
+    vectorized call
+    :param df1: dataframe of locations with columns Year, Name, Lat, Lon (degrees west, positive)
+    :param df2: landfall summary dataframe created by storms_1970-2019_summary.py
+    :param k: number of closest landfalls returned for each location, default is 1
+    :returns dataframe with one row per matched landfall (up to k per location), including the df1 index (row),
+    the distance rank (1 = closest) and max_usa_sshs of all landfalls of the storm
+    """
+    locs = pd.DataFrame(dict(row=df1.index, year=df1['Year'].values, key=df1['Name'].astype(str).str.lower().values,
+                             loc_lat=df1['Lat'].values, loc_lon=-df1['Lon'].values))
+    landfalls = df2.assign(key=df2['name'].astype(str).str.lower(), lf_order=np.arange(len(df2)))
+    pairs = locs.merge(landfalls, on=['year', 'key'], how='inner')
+
+    geod = Geod(ellps='WGS84')
+    _, _, dist = geod.inv(pairs['loc_lon'].values, pairs['loc_lat'].values, pairs['landfall_lon'].values,
+                          pairs['landfall_lat'].values)
+    pairs['dist'] = np.round(dist / 1000).astype(int)
+    pairs['storm_max_usa_sshs'] = pairs.groupby('row')['max_usa_sshs'].transform('max')
+
+    # ties are broken by the order of the landfalls in df2
+    pairs = pairs.sort_values(['row', 'dist', 'lf_order'], kind='mergesort')
+    pairs['rank'] = pairs.groupby('row').cumcount() + 1
+    return pairs[pairs['rank'] <= k].reset_index(drop=True)
+
+
+@traced()
+def main(f1, f2, k=1):
     sDir = os.path.dirname(f1)
     df1 = pd.read_csv(f1)
-    addcols = ['Landfall_lat', 'Landfall_lon', 'Landfall_dist_km', 'Landfall_intensity', 'Landfall_wspd_kts',
-               'Landfall_pres', 'max_usa_sshs']
-    for ac in addcols:
-        df1[ac] = ''
     df2 = pd.read_csv(f2)
 
-    for i, row in df1.iterrows():
-        ecosys_loc = [row['Lat'], -row['Lon']]
-
-        df2_filt = df2[(df2['year'] == row['Year']) & (df2['name'].str.lower() == row['Name'].lower())]
-        if len(df2_filt) > 0:
-            distances = dict(dist=[], landfall_cat=[], landfall_wspd_kts=[], landfall_pres=[], lat=[], lon=[])
-            for ii, rowi in df2_filt.iterrows():
-                lf_loc = [rowi['landfall_lat'], rowi['landfall_lon']]
-                diff_loc = round(geodesic(ecosys_loc, lf_loc).kilometers)
-                distances['dist'].append(diff_loc)
-                distances['landfall_cat'].append(rowi['landfall_cat'])
-                distances['landfall_wspd_kts'].append(rowi['landfall_wspd_kts'])
-                distances['landfall_pres'].append(rowi['landfall_pres'])
-                distances['lat'].append(rowi['landfall_lat'])
-                distances['lon'].append(rowi['landfall_lon'])
-
-            # find the closest landfall distance to ecosystem and add values to dataframe
-            mindist_idx = np.argmin(distances['dist'])
-            df1.at[i, 'Landfall_intensity'] = distances['landfall_cat'][mindist_idx]
-            df1.at[i, 'Landfall_wspd_kts'] = distances['landfall_wspd_kts'][mindist_idx]
-            df1.at[i, 'Landfall_pres'] = distances['landfall_pres'][mindist_idx]
-            df1.at[i, 'Landfall_lat'] = distances['lat'][mindist_idx]
-            df1.at[i, 'Landfall_lon'] = distances['lon'][mindist_idx]
-            df1.at[i, 'Landfall_dist_km'] = distances['dist'][mindist_idx]
-            df1.at[i, 'max_usa_sshs'] = np.max(df2_filt['max_usa_sshs'])
+    with span('match landfalls', locations=len(df1), landfalls=len(df2)) as sp:
+        matches = match_landfalls(df1, df2, k)
+        sp.count(matches=len(matches))
+
+    # find the closest landfall distance to ecosystem and add values to dataframe
+    closest = matches[matches['rank'] == 1]
+    pos = df1.index.get_indexer(closest['row'])
+    addcols = dict(Landfall_lat='landfall_lat', Landfall_lon='landfall_lon', Landfall_dist_km='dist',
+                   Landfall_intensity='landfall_cat', Landfall_wspd_kts='landfall_wspd_kts',
+                   Landfall_pres='landfall_pres', max_usa_sshs='storm_max_usa_sshs')
+    for ac, mc in addcols.items():
+        values = np.full(len(df1), '', dtype=object)
+        values[pos] = closest[mc].values
+        df1[ac] = values
 
     df1.to_csv(os.path.join(sDir, 'specific_landfall_storms-final.csv'), index=False)
 
+    if k > 1:
+        # export the k closest landfalls for each ecosystem location
+        knearest = df1.drop(columns=list(addcols)).join(
+            matches.set_index('row')[['rank'] + list(addcols.values())].rename(
+                columns={v: ac for ac, v in addcols.items()}), how='inner')
+        knearest.to_csv(os.path.join(sDir, 'specific_landfall_storms-{}nearest.csv'.format(k)), index=False)
+
 
 if __name__ == '__main__':
     file1 = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/specific_landfall_storms-raw.csv'
     file2 = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/NA_landfall_summary_1970-2019.csv'
-    main(file1, file2)
+    nearest = 1  # number of closest landfalls exported for each location
+    main(file1, file2, nearest)
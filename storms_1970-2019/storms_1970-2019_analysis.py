@@ -2,7 +2,7 @@
 
 """
 Author: Lori Garzio on 2/11/2021
-Last modified: 2/11/2021
+Last modified: 10/18/2026
 Creates two summary .csv files containing 1) a count of the number of landfalling storms (tropical storm to cat 5), and
 2) a count of the number of landfalling major hurricanes (cat 3+) by year from 1970-2019 in the North Atlantic basin.
 Landfall is defined as the eye of the storm < 60 nmile from land.
@@ -12,14 +12,13 @@ highlighted red, and 2) landfalling major hurricane (cat 3+) highlighted red.
 
 import numpy as np
 import os
+import sys
 import pandas as pd
-import xarray as xr
-import cftime
-import matplotlib.pyplot as plt
-import cartopy.crs as ccrs
-import cartopy.feature as cfeature
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functions.track_store import first_last_times, datetime_year
+from functions.ragged import get_ragged_tracks
+from functions.trace import span, traced
 pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
-plt.rcParams.update({'font.size': 12})
 
 
 def add_map_features(ax, axes_limits):
@@ -28,6 +27,7 @@ def add_map_features(ax, axes_limits):
     :param ax: plotting axis object
     :param axes_limits: optional list of axis limits [min lon, max lon, min lat, max lat]
     """
+    import cartopy.feature as cfeature
     ax.set_extent(axes_limits)
     coast = cfeature.NaturalEarthFeature('physical', 'coastline', '10m')
     ax.add_feature(coast, edgecolor='black', facecolor='none')
@@ -42,85 +42,151 @@ def export_df(dictionary, savefile):
     df.to_csv(savefile, index=False)
 
 
-def main(f, years):
-    sDir = os.path.dirname(f)
-    ncfile = xr.open_dataset(f, mask_and_scale=False)
+def yearly_counts(year, category, landfall, yrs):
+    """
+    Counts the landfalling storms (tropical storm to cat 5) and landfalling major hurricanes (cat 3+) by year
+    :param year: array of the year of each storm (year of the first observation)
+    :param category: array of the lifetime maximum category (usa_sshs) of each storm
+    :param landfall: boolean array, True if the storm makes landfall
+    :param yrs: list or array of years
+    :returns dictionaries of year: storm count for all landfalling storms and major hurricanes
+    """
+    counted = np.logical_and(category >= 0, landfall)
+    major = np.logical_and(counted, category >= 3)
+    storms_all = dict()
+    storms_major = dict()
+    for yr in yrs:
+        storms_all[yr] = int(np.sum(year[counted] == yr))
+        storms_major[yr] = int(np.sum(year[major] == yr))
+    return storms_all, storms_major
 
-    yrs = np.arange(years[0], years[1] + 1, 1)
 
-    sf = pd.read_csv(os.path.join(sDir, 'summary_1970-2019.csv'))
-    hindex = list(sf['findex'])
+def landfall_counts(ncfile, hindex, yrs, threshold=111, lon_cutoff=-40):
+    """
+    Counts the landfalling storms and landfalling major hurricanes by year (same criteria as plot_track_maps) for all
+    storms in one pass, without drawing the maps
+    :param ncfile: IBTrACS dataset from open_tracks (time decoded to datetime64)
+    :param hindex: list of storm indices (findex) to count
+    :param yrs: list or array of years
+    :param threshold: landfall distance from shore (km), default is 111 (60 nmile)
+    :param lon_cutoff: storms with a landfall west of this longitude are counted, default is -40
+    :returns dictionaries of year: storm count for all landfalling storms and major hurricanes
+    """
+    nc = ncfile.sel(storm=np.asarray(hindex))
+    lon = nc['lon'].values.astype('float')
+    lon[lon == -9999] = np.nan
+    lf = nc['landfall'].values.astype('float')
+    lf[lf == -9999] = np.nan  # convert fill values to nan
 
-    storms_all = dict()
-    storms_major = dict()
+    category = np.max(nc['usa_sshs'].values, axis=1)
+    with np.errstate(invalid='ignore'):
+        landfall = np.any(np.logical_and(lf < threshold, lon < lon_cutoff), axis=1)
 
-    for yr in yrs:
-        storms_all[yr] = 0
-        storms_major[yr] = 0
+    t0_year = datetime_year(first_last_times(nc['time'].values)[0])
+    return yearly_counts(t0_year, category, landfall, yrs)
+
+
+# maps of all storms as gray tracks with the storms selected by the filters of the spec (columns of storm_table)
+# highlighted red: 1) landfalling storms (tropical storm to cat 5), 2) landfalling major hurricanes (cat 3+). Other
+# variants only need another spec (see functions/figures.py)
+TRACK_MAP_SPECS = [
+    dict(name='NA_storms_all_1970-2019-test40deg.png', title='Landfalling storms',
+         filters=dict(category=(0, None), landfall=[True])),
+    dict(name='NA_storms_major_1970-2019-test40deg.png', title='Landfalling major hurricanes',
+         filters=dict(category=(3, None), landfall=[True]))
+]
+
+
+def storm_table(tracks, threshold=111, lon_cutoff=-40):
+    """
+    Calculates the values used to select storms for the maps in one pass over the track points
+    :param tracks: RaggedTracks of the storms (time, lat, lon, landfall, usa_sshs)
+    :param threshold: landfall distance from shore (km), default is 111 (60 nmile)
+    :param lon_cutoff: landfalls west of this longitude are counted, default is -40
+    :returns dataframe with one row per storm: findex, year (year of the first observation), category (lifetime
+    maximum usa_sshs) and landfall (True if the storm comes within the threshold distance of land west of lon_cutoff)
+    """
+    _, flat = tracks.flat_index()
+    starts = np.cumsum(tracks.lengths) - tracks.lengths
+    with np.errstate(invalid='ignore'):
+        lf_west = np.logical_and(tracks.data['landfall'][flat] < threshold, tracks.data['lon'][flat] < lon_cutoff)
+    return pd.DataFrame(dict(findex=tracks.findex,
+                             year=datetime_year(tracks.first('time')),
+                             category=np.fmax.reduceat(tracks.data['usa_sshs'][flat], starts),
+                             landfall=np.logical_or.reduceat(lf_west, starts)))
 
-    # fig_all, ax_all = plt.subplots(subplot_kw=dict(projection=ccrs.PlateCarree()))
-    # fig_major, ax_major = plt.subplots(subplot_kw=dict(projection=ccrs.PlateCarree()))
 
-    fig_all, ax_all = plt.subplots(subplot_kw=dict(projection=ccrs.Robinson()))
-    fig_major, ax_major = plt.subplots(subplot_kw=dict(projection=ccrs.Robinson()))
+def plot_track_maps(tracks, yrs, sDir, threshold=111, lon_cutoff=-40, specs=None, workers=None):
+    """
+    Counts the landfalling storms and landfalling major hurricanes by year, and maps all storms as gray tracks with
+    the storms selected by each map spec highlighted red
+    :param tracks: RaggedTracks of the storms to map (time, lat, lon, landfall, usa_sshs)
+    :param yrs: list or array of years
+    :param sDir: output directory for the maps
+    :param threshold: landfall distance from shore (km), default is 111 (60 nmile)
+    :param lon_cutoff: storms with a landfall west of this longitude are highlighted, default is -40
+    :param specs: optional list of figure specs, default is TRACK_MAP_SPECS
+    :param workers: number of worker processes used to save the maps, default is all cores
+    :returns dictionaries of year: storm count for all landfalling storms and major hurricanes, and list of map files
+    """
+    # the plotting libraries are imported here so landfall_counts and export_df can be used without them
+    import matplotlib.pyplot as plt
+    import cartopy.crs as ccrs
+    from functions.plotting import add_tracks
+    from functions.figures import spec_masks, render_figures
+    plt.rcParams.update({'font.size': 12})
+
+    specs = specs or TRACK_MAP_SPECS
     ax_lims = [-120, 0, 0, 55]
 
-    for i, hi in enumerate(hindex):
-        # set up map axes
-        if i == 0:
-            add_map_features(ax_all, ax_lims)
-            add_map_features(ax_major, ax_lims)
-
-        ncf = ncfile.sel(storm=hi)
-        lat = ncf.lat.values
-        lat[lat == -9999] = np.nan
-        lon = ncf.lon.values
-        lon[lon == -9999] = np.nan
-
-        category = np.nanmax(ncf.usa_sshs.values)
-
-        # distance from land is < 60 nmile (111 km)
-        lf = ncf.landfall.values.astype('float')
-        lf[lf == -9999] = np.nan  # convert fill values to nan
-        minlf = np.nanmin(lf)
-        lf_ind = np.where(lf < 111)[0]
-        lf_lon = lon[lf_ind]
-
-        # choose when landfall is < 60 nmile and the storm is west of 40 degrees W
-        #if np.logical_and(minlf < 111, any(lf_lon < -60)):
-        if np.logical_and(minlf < 111, any(lf_lon < -40)):
-            nsamerica_lf = 'yes'
-        else:
-            nsamerica_lf = 'no'
-
-        lw = 1
-        bc = 'darkgray'
-        alpha = .6
-        mk = 'None'
-
-        # count the storms that make landfall west of 40 degrees W each year
-        if np.logical_and(category >= 0, nsamerica_lf == 'yes'):
-            t0 = min(t for t in ncf.time.values if t > cftime.DatetimeGregorian(1800, 1, 1, 0, 0, 0, 0))
-            storms_all[t0.year] = storms_all[t0.year] + 1
-            ax_all.plot(lon, lat, c='r', marker=mk, linewidth=lw, transform=ccrs.PlateCarree())
-
-            if category >= 3:
-                storms_major[t0.year] = storms_major[t0.year] + 1
-                ax_major.plot(lon, lat, c='r', marker=mk, linewidth=lw, transform=ccrs.PlateCarree())
-            else:
-                ax_major.plot(lon, lat, c=bc, marker=mk, linewidth=lw, alpha=alpha, transform=ccrs.PlateCarree())
-        else:
-            ax_all.plot(lon, lat, c=bc, marker=mk, linewidth=lw, alpha=alpha, transform=ccrs.PlateCarree())
-            ax_major.plot(lon, lat, c=bc, marker=mk, linewidth=lw, alpha=alpha, transform=ccrs.PlateCarree())
+    # count the storms that make landfall west of 40 degrees W each year
+    st = storm_table(tracks, threshold, lon_cutoff)
+    storms_all, storms_major = yearly_counts(st['year'].values, st['category'].values, st['landfall'].values, yrs)
 
-    # export_df(storms_all, os.path.join(sDir, 'NA_landfalling_storms_all_1970-2019-test.csv'))
-    # export_df(storms_major, os.path.join(sDir, 'NA_landfalling_storms_major_1970-2019-test.csv'))
+    # views of the valid observations of each storm, missing values are nan
+    lons = [trk['lon'] for trk in tracks]
+    lats = [trk['lat'] for trk in tracks]
+
+    def draw(ax, mask, spec):
+        with span('add map features'):
+            add_map_features(ax, ax_lims)
+        with span('draw tracks', storms=len(mask)):
+            gray = np.flatnonzero(~mask)
+            red = np.flatnonzero(mask)
+            add_tracks(ax, [lons[k] for k in gray], [lats[k] for k in gray], 'darkgray', linewidth=1, alpha=.6,
+                       marker='None')
+            add_tracks(ax, [lons[k] for k in red], [lats[k] for k in red], 'r', linewidth=1, marker='None')
 
-    fig_all.savefig(os.path.join(sDir, 'NA_storms_all_1970-2019-test40deg.png'), dpi=300)
-    plt.close(fig_all)
+    sfiles = render_figures(specs, spec_masks(st, specs), draw, sDir, subplot_kw=dict(projection=ccrs.Robinson()),
+                            workers=workers)
 
-    fig_major.savefig(os.path.join(sDir, 'NA_storms_major_1970-2019-test40deg.png'), dpi=300)
-    plt.close(fig_major)
+    return storms_all, storms_major, sfiles
+
+
+@traced()
+def main(f, years, threshold=111, lon_cutoff=-40):
+    """
+    Maps the storms of summary_1970-2019.csv
+    :param f: IBTrACS NetCDF file or track store directory, in the directory of the summary
+    :param years: [start year, end year]
+    :param threshold: landfall distance from shore (km), default is 111 (60 nmile)
+    :param lon_cutoff: storms with a landfall west of this longitude are counted and highlighted, default is -40
+    :returns dictionaries of year: storm count for all landfalling storms and major hurricanes
+    """
+    sDir = os.path.dirname(f)
+
+    yrs = np.arange(years[0], years[1] + 1, 1)
+
+    sf = pd.read_csv(os.path.join(sDir, 'summary_1970-2019.csv'))
+    hindex = list(sf['findex'])
+    with span('load ragged tracks', storms=len(hindex)):
+        tracks = get_ragged_tracks(f, ['time', 'lat', 'lon', 'landfall', 'usa_sshs']).select(hindex)
+
+    storms_all, storms_major, _ = plot_track_maps(tracks, yrs, sDir, threshold, lon_cutoff)
+
+    # export_df(storms_all, os.path.join(sDir, 'NA_landfalling_storms_all_1970-2019-test.csv'))
+    # export_df(storms_major, os.path.join(sDir, 'NA_landfalling_storms_major_1970-2019-test.csv'))
+    return storms_all, storms_major
 
 
 if __name__ == '__main__':
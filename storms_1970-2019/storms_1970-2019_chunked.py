@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Chunked version of the storms_1970-2019 processing for large IBTrACS files (e.g. IBTrACS.ALL.v04r00.nc). The storm
+summary (hurricane_summary.py), landfall summary (storms_1970-2019_summary.py) and yearly landfall counts
+(storms_1970-2019_analysis.py) are calculated for chunks of storms by a pool of worker processes. Each chunk only
+reads the variables listed in CHUNK_VARIABLES. Writes summary_1970-2019.csv, NA_landfall_summary_1970-2019.csv and the
+yearly landfall counts.
+"""
+
+import numpy as np
+import os
+import sys
+import importlib
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hurricane_summary
+from functions.chunked import map_storm_chunks
+from functions.track_store import decode_time_variable
+from functions.trace import span, traced
+storms_summary = importlib.import_module('storms_1970-2019_summary')
+storms_analysis = importlib.import_module('storms_1970-2019_analysis')
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+
+# the only variables read from the IBTrACS file
+CHUNK_VARIABLES = ['time', 'lat', 'lon', 'landfall', 'usa_sshs', 'usa_wind', 'usa_pres', 'basin', 'name']
+
+
+def process_chunk(chunk, yrs, bsin, threshold, lon_cutoff, map_lon_cutoff):
+    """
+    Calculates the storm summary, landfall summary and yearly landfall counts for one chunk of storms
+    """
+    with span('process chunk', storms=chunk.sizes['storm']) as sp:
+        sf = hurricane_summary.summarize_storms(chunk, yrs, bsin)
+        hindex = sf['findex'].values
+
+        decoded = decode_time_variable(chunk)
+        lf = storms_summary.landfall_summary(decoded, hindex, yrs, threshold, lon_cutoff)
+        storms_all, storms_major = storms_analysis.landfall_counts(decoded, hindex, yrs, threshold, map_lon_cutoff)
+        sp.count(selected=len(hindex), landfalls=len(lf))
+    return sf, lf, storms_all, storms_major
+
+
+@traced()
+def main(f, years, bsin='NA', chunk_size=1000, workers=None, threshold=111, lon_cutoff=-60, map_lon_cutoff=-40):
+    sDir = os.path.dirname(f)
+
+    yrs = np.arange(years[0], years[1] + 1, 1)
+
+    with span('map storm chunks', chunk_size=chunk_size):
+        results = map_storm_chunks(f, process_chunk, CHUNK_VARIABLES,
+                                   args=(yrs, bsin, threshold, lon_cutoff, map_lon_cutoff),
+                                   chunk_size=chunk_size, workers=workers)
+
+    sf = pd.concat([r[0] for r in results], ignore_index=True)
+    sf.to_csv(os.path.join(sDir, 'summary_1970-2019.csv'), index=False)
+
+    lf = pd.concat([r[1] for r in results], ignore_index=True)
+    lf.to_csv(os.path.join(sDir, 'NA_landfall_summary_1970-2019.csv'), index=False)
+
+    storms_all = dict()
+    storms_major = dict()
+    for yr in yrs:
+        storms_all[yr] = sum([r[2][yr] for r in results])
+        storms_major[yr] = sum([r[3][yr] for r in results])
+    storms_analysis.export_df(storms_all, os.path.join(sDir, 'NA_landfalling_storms_all_1970-2019.csv'))
+    storms_analysis.export_df(storms_major, os.path.join(sDir, 'NA_landfalling_storms_major_1970-2019.csv'))
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/IBTrACS.ALL.v04r00.nc'
+    yrs = [1970, 2019]  # start and end year
+    basin = 'NA'  # 'NA', 'all'
+    main(fpath, yrs, basin, chunk_size=1000, workers=None)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Creates a gridded climatology of North Atlantic storms from 1970-2019 (functions/climatology.py): track points, storm
+counts and landfalls (from the landfall summary created by storms_1970-2019_summary.py) binned into a lat/lon grid by
+year and category, saved as NA_climatology_1970-2019.nc. Creates heatmaps of 1) storm track density (TS+),
+2) major hurricane (cat 3+) track density and 3) landfall frequency (TS+ at landfall).
+"""
+
+import os
+import sys
+import importlib
+import pandas as pd
+import matplotlib.pyplot as plt
+import cartopy.crs as ccrs
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functions.climatology import track_climatology, landfall_climatology, write_climatology
+from functions.plotting import add_heatmap
+from functions.trace import span, traced
+storms_analysis = importlib.import_module('storms_1970-2019_analysis')
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+plt.rcParams.update({'font.size': 12})
+
+
+def plot_heatmaps(ds, sDir, ax_lims, dpi=300):
+    """
+    Creates the track density and landfall frequency heatmaps, summed over all years in the climatology
+    :param ds: climatology dataset with storm_count and landfall_count
+    :param sDir: output directory for the plots
+    :param ax_lims: axis limits [min lon, max lon, min lat, max lat]
+    :param dpi: resolution of the plots, default is 300
+    :returns list of plot files
+    """
+    yr_range = '{}-{}'.format(ds['year'].values.min(), ds['year'].values.max())
+    maps = [('storm_count', 0, 'Storms (TS+)', 'NA_track_density_all_{}.png'.format(yr_range)),
+            ('storm_count', 3, 'Major hurricanes (cat 3+)', 'NA_track_density_major_{}.png'.format(yr_range)),
+            ('landfall_count', 0, 'Landfalls (TS+)', 'NA_landfall_frequency_{}.png'.format(yr_range))]
+
+    sfiles = []
+    for var, cat, label, fname in maps:
+        fig, ax = plt.subplots(subplot_kw=dict(projection=ccrs.Robinson()))
+        with span('add map features'):
+            storms_analysis.add_map_features(ax, ax_lims)
+        with span('add heatmap', cells=ds.sizes['lat'] * ds.sizes['lon']):
+            add_heatmap(ax, ds[var].sel(category=cat).sum(dim='year'), label=label)
+        ax.set_title('{} {}'.format(label, yr_range), fontsize=12)
+
+        sfile = os.path.join(sDir, fname)
+        with span('savefig', dpi=dpi):
+            fig.savefig(sfile, dpi=dpi)
+        plt.close(fig)
+        sfiles.append(sfile)
+
+    return sfiles
+
+
+@traced()
+def main(f, resolution=1, workers=None):
+    sDir = os.path.dirname(f)
+    ax_lims = [-120, 0, 0, 55]
+
+    sf = pd.read_csv(os.path.join(sDir, 'summary_1970-2019.csv'))
+    lf = pd.read_csv(os.path.join(sDir, 'NA_landfall_summary_1970-2019.csv'))
+
+    with span('track climatology', storms=len(sf)):
+        ds = track_climatology(f, sf['findex'].values, ax_lims, resolution, workers=workers)
+    with span('landfall climatology', landfalls=len(lf)):
+        ds['landfall_count'] = landfall_climatology(lf, ds)
+    with span('write climatology'):
+        write_climatology(ds, os.path.join(sDir, 'NA_climatology_1970-2019.nc'))
+
+    plot_heatmaps(ds, sDir, ax_lims)
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/IBTrACS.NA.v04r00.nc'
+    grid_resolution = 1  # degrees
+    nworkers = None  # number of worker processes, None is all cores
+    main(fpath, grid_resolution, nworkers)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Creates a summary .csv file of the intensity changes of each storm in the summary file created by hurricane_summary.py:
+maximum 24 and 48 hour windspeed change, maximum 24 hour pressure change, rapid intensification (RI) episodes (windspeed
+increase >= 30 kt in 24 hours), RI episodes that end within 48 hours before a landfall, and hours spent at each storm
+category. The file is saved next to the landfall summary created by storms_1970-2019_summary.py.
+"""
+
+import numpy as np
+import os
+import sys
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functions.track_store import load_track_arrays, first_last_times, datetime_year
+from functions.intensity import INTENSITY_VARIABLES, intensity_summary
+from functions.trace import span, traced
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+
+
+def storm_intensity(f, hindex, threshold=111):
+    """
+    Summarizes the intensity changes of the storms in hindex
+    :param f: IBTrACS NetCDF file or track store directory
+    :param hindex: array of storm indices (findex)
+    :param threshold: landfall distance from shore (km), default is 111 (60 nmile)
+    :returns pandas dataframe with one row per storm
+    """
+    with span('load track arrays', storms=len(hindex)):
+        arrays = load_track_arrays(f, INTENSITY_VARIABLES, storms=hindex)
+    with span('intensity summary', storms=len(hindex)):
+        df = intensity_summary(arrays, lf_threshold=threshold)
+    t0, _ = first_last_times(arrays['time'])
+    df.insert(3, 'year', datetime_year(t0))
+    return df
+
+
+@traced()
+def main(f, threshold=111):
+    sDir = os.path.dirname(f)
+
+    sf = pd.read_csv(os.path.join(sDir, 'summary_1970-2019.csv'))
+    hindex = np.array(sf['findex'])
+
+    df = storm_intensity(f, hindex, threshold)
+    df.to_csv(os.path.join(sDir, 'NA_intensity_summary_1970-2019.csv'), index=False)
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/IBTrACS.NA.v04r00.nc'
+    lf_threshold = 111  # landfall distance from shore (km)
+    main(fpath, lf_threshold)
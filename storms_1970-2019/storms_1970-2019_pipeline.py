@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Runs the storms_1970-2019 scripts as one pipeline with a cached artifact for each step (see functions/pipeline.py):
+storm summary (hurricane_summary.py) -> landfall summary (storms_1970-2019_summary.py) -> landfall latitude plots
+(storms_1970-2019_plotting.py), and storm summary -> intensity summary (storms_1970-2019_intensity.py) and track maps
+(storms_1970-2019_analysis.py). A step only runs again when the IBTrACS file, its parameters or one of its inputs
+change, e.g. changing the plot dpi only redraws the plots.
+The summaries are also exported to summary_1970-2019.csv, NA_landfall_summary_1970-2019.csv and
+NA_intensity_summary_1970-2019.csv.
+"""
+
+import numpy as np
+import os
+import sys
+import importlib
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hurricane_summary
+from functions.track_store import open_tracks
+from functions.ragged import get_ragged_tracks
+from functions.pipeline import run_pipeline
+from functions.trace import traced
+storms_summary = importlib.import_module('storms_1970-2019_summary')
+storms_intensity = importlib.import_module('storms_1970-2019_intensity')
+storms_analysis = importlib.import_module('storms_1970-2019_analysis')
+storms_plotting = importlib.import_module('storms_1970-2019_plotting')
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+
+
+def year_range(years):
+    return np.arange(years[0], years[1] + 1, 1)
+
+
+def to_table(df):
+    # basin lists are stored as they are written to the .csv files
+    if 'basin' in df.columns:
+        df['basin'] = [str(x) for x in df['basin']]
+    return df
+
+
+def storm_summary(source, inputs, params, outdir):
+    ncfile = open_tracks(source, variables=['time', 'basin'], decode_times=False)
+    return to_table(hurricane_summary.summarize_storms(ncfile, year_range(params['years']), params['basin']))
+
+
+def landfall_summary(source, inputs, params, outdir):
+    hindex = inputs['summary']['findex'].values
+    ncfile = open_tracks(source, variables=storms_summary.LANDFALL_VARIABLES, storms=hindex)
+    df = storms_summary.landfall_summary(ncfile, hindex, year_range(params['years']), params['threshold'],
+                                         params['lon_cutoff'])
+    return to_table(df)
+
+
+def intensity_summary(source, inputs, params, outdir):
+    return storms_intensity.storm_intensity(source, inputs['summary']['findex'].values, params['threshold'])
+
+
+def export_csv(fname, step):
+    def export(source, inputs, params, outdir):
+        sfile = os.path.join(outdir, fname)
+        inputs[step].to_csv(sfile, index=False)
+        return [sfile]
+    return export
+
+
+def track_maps(source, inputs, params, outdir):
+    tracks = get_ragged_tracks(source, ['time', 'lat', 'lon', 'landfall', 'usa_sshs'])
+    tracks = tracks.select(inputs['summary']['findex'].values)
+    _, _, sfiles = storms_analysis.plot_track_maps(tracks, year_range(params['years']), outdir, params['threshold'],
+                                                   params['map_lon_cutoff'])
+    return sfiles
+
+
+def landfall_plots(source, inputs, params, outdir):
+    return storms_plotting.plot_landfall_latitudes(inputs['landfalls'], outdir, params['dpi'])
+
+
+STEPS = dict(
+    summary=dict(func=storm_summary, params=['years', 'basin']),
+    landfalls=dict(func=landfall_summary, inputs=['summary'], params=['years', 'threshold', 'lon_cutoff']),
+    summary_csv=dict(func=export_csv('summary_1970-2019.csv', 'summary'), inputs=['summary'], kind='files',
+                     source=False),
+    landfall_csv=dict(func=export_csv('NA_landfall_summary_1970-2019.csv', 'landfalls'), inputs=['landfalls'],
+                      kind='files', source=False),
+    intensity=dict(func=intensity_summary, inputs=['summary'], params=['threshold']),
+    intensity_csv=dict(func=export_csv('NA_intensity_summary_1970-2019.csv', 'intensity'), inputs=['intensity'],
+                       kind='files', source=False),
+    track_maps=dict(func=track_maps, inputs=['summary'], params=['years', 'threshold', 'map_lon_cutoff'],
+                    kind='files'),
+    landfall_plots=dict(func=landfall_plots, inputs=['landfalls'], params=['dpi'], kind='files', source=False)
+)
+
+
+@traced()
+def main(f, params, targets=None, cache_dir=None):
+    sDir = os.path.dirname(f)
+    cache_dir = cache_dir or os.path.join(sDir, 'pipeline_cache')
+    _, status = run_pipeline(STEPS, f, params, sDir, cache_dir, targets)
+    for name, st in status.items():
+        print('{}: {}'.format(name, st if st == 'cached' else 'ran ({} s)'.format(st)))
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/IBTrACS.NA.v04r00.nc'
+    pipeline_params = dict(years=[1970, 2019],  # start and end year
+                           basin='NA',  # 'NA', 'all'
+                           threshold=111,  # landfall distance from shore (km)
+                           lon_cutoff=-60,  # landfall summary: landfalls west of this longitude
+                           map_lon_cutoff=-40,  # track maps: storms with a landfall west of this longitude are red
+                           dpi=300)  # landfall latitude plots
+    main(fpath, pipeline_params)
@@ -2,74 +2,77 @@
 
 """
 Author: Lori Garzio on 2/17/2021
-Last modified: 2/18/2021
+Last modified: 10/18/2026
 Create scatter plots for the latitude at landfall for NA storms for 1) all storms TS+, 2) all storms based on category
 at landfall, 3) major storms only (lifetime category >=3), 4) major storms only (category at landfall >=3),
 5) minor storms only (lifetime category < 3), and 6) minor storms only (category at landfall >=0 and <3).
 """
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functions.figures import spec_masks, render_figures
+from functions.trace import span, traced
 pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
 plt.rcParams.update({'font.size': 12})
 
 
-def plot_scatter(yrs, latitudes, sfile_png):
-    fig, ax = plt.subplots()
-    ax.scatter(yrs, latitudes, s=5, c='k')
-    ax.set_ylabel('Latitude')
-    ax.set_xlabel('Year')
-    plt.savefig(sfile_png, dpi=300)
-    plt.close()
+# landfall latitude plots: 1) all storms TS+ (lifetime category), 2) all storms TS+ at landfall, 3) major storms
+# (lifetime category >= 3), 4) major storms at landfall, 5) minor storms (lifetime category < 3), 6) minor storms at
+# landfall (category at landfall >= 0 and < 3). Other variants only need another spec (see functions/figures.py), e.g.
+# dict(name='landfall_lats_major_gulf.png', filters=dict(max_usa_sshs=(3, None), landfall_lon=(-98, -81)))
+LANDFALL_LATITUDE_SPECS = [
+    dict(name='landfall_lats_all_lifetimecat.png', title='All (lifetime category)'),
+    dict(name='landfall_lats_all_landfallcat.png', title='All (landfall category)',
+         filters=dict(landfall_cat=(0, None))),
+    dict(name='landfall_lats_major_lifetimecat.png', title='Major (lifetime category)',
+         filters=dict(max_usa_sshs=(3, None))),
+    dict(name='landfall_lats_major_landfallcat.png', title='Major (landfall category)',
+         filters=dict(landfall_cat=(3, None))),
+    dict(name='landfall_lats_minor_lifetimecat.png', title='Minor (lifetime category)',
+         filters=dict(max_usa_sshs=(None, 3))),
+    dict(name='landfall_lats_minor_landfallcat.png', title='Minor (landfall category)',
+         filters=dict(landfall_cat=(0, 3)))
+]
 
 
-def main(f):
-    sDir = os.path.dirname(f)
-    sf = pd.read_csv(f)
-
-    # plot all landfall latitudes (TS and higher category, based on lifetime category)
-    year = sf['year']
-    lats = sf['landfall_lat']
-    sfile = os.path.join(sDir, 'landfall_lats_all_lifetimecat.png')
-    plot_scatter(year, lats, sfile)
+def plot_landfall_latitudes(sf, sDir, dpi=300, specs=None, layout='files', workers=None):
+    """
+    Creates the landfall latitude scatter plots. The filters of all plots are evaluated in one pass and the plots are
+    saved by a pool of worker processes
+    :param sf: landfall summary dataframe created by storms_1970-2019_summary.py
+    :param sDir: output directory for the plots
+    :param dpi: resolution of the plots, default is 300
+    :param specs: optional list of figure specs, default is LANDFALL_LATITUDE_SPECS
+    :param layout: 'files' (default) for one file per spec, or 'panels' for all specs in landfall_lats_panels.png
+    :param workers: number of worker processes used to save the plots, default is all cores
+    :returns list of plot files
+    """
+    specs = specs or LANDFALL_LATITUDE_SPECS
+    masks = spec_masks(sf, specs)
+    year = sf['year'].values
+    lats = sf['landfall_lat'].values
 
-    # plot all landfall latitudes (TS and higher category, based on category at landfall)
-    sf_filt = sf[sf['landfall_cat'] >= 0]
-    year = sf_filt['year']
-    lats = sf_filt['landfall_lat']
-    sfile = os.path.join(sDir, 'landfall_lats_all_landfallcat.png')
-    plot_scatter(year, lats, sfile)
+    def draw(ax, mask, spec):
+        ax.scatter(year[mask], lats[mask], s=5, c='k')
+        ax.set_ylabel('Latitude')
+        ax.set_xlabel('Year')
 
-    # plot landfall latitudes for major storms only (lifetime category >= 3)
-    sf_filt = sf[sf['max_usa_sshs'] >= 3]
-    year = sf_filt['year']
-    lats = sf_filt['landfall_lat']
-    sfile = os.path.join(sDir, 'landfall_lats_major_lifetimecat.png')
-    plot_scatter(year, lats, sfile)
+    return render_figures(specs, masks, draw, sDir, layout, panel_file='landfall_lats_panels.png', dpi=dpi,
+                          workers=workers)
 
-    # plot landfall latitudes for major storms only (category at landfall >= 3)
-    sf_filt = sf[sf['landfall_cat'] >= 3]
-    year = sf_filt['year']
-    lats = sf_filt['landfall_lat']
-    sfile = os.path.join(sDir, 'landfall_lats_major_landfallcat.png')
-    plot_scatter(year, lats, sfile)
 
-    # plot landfall latitudes for minor storms only (lifetime category < 3)
-    sf_filt = sf[sf['max_usa_sshs'] < 3]
-    year = sf_filt['year']
-    lats = sf_filt['landfall_lat']
-    sfile = os.path.join(sDir, 'landfall_lats_minor_lifetimecat.png')
-    plot_scatter(year, lats, sfile)
-
-    # plot landfall latitudes for minor storms only (category at landfall >= 0, < 3)
-    sf_filt = sf[(sf['landfall_cat'] >= 0) & (sf['landfall_cat'] < 3)]
-    year = sf_filt['year']
-    lats = sf_filt['landfall_lat']
-    sfile = os.path.join(sDir, 'landfall_lats_minor_landfallcat.png')
-    plot_scatter(year, lats, sfile)
+@traced()
+def main(f, layout='files', workers=None):
+    sDir = os.path.dirname(f)
+    sf = pd.read_csv(f)
+    with span('plot landfall latitudes', landfalls=len(sf)):
+        plot_landfall_latitudes(sf, sDir, layout=layout, workers=workers)
 
 
 if __name__ == '__main__':
     fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/NA_landfall_summary_1970-2019.csv'
-    main(fpath)
+    plot_layout = 'files'  # 'files' or 'panels'
+    main(fpath, plot_layout)
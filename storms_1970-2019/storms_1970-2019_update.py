@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+"""
+Author: Lori Garzio on 10/18/2026
+Last modified: 10/18/2026
+Incremental update of the storms_1970-2019 outputs for a new IBTrACS release. Each storm is fingerprinted by SID and a
+hash of its track data (saved to storm_fingerprints.json). Only new or changed storms are summarized again, and their
+rows are merged into the existing summary_1970-2019.csv and NA_landfall_summary_1970-2019.csv. The track maps
+(storms_1970-2019_analysis.py) and landfall latitude plots (storms_1970-2019_plotting.py) are only regenerated when
+the file they are made from changes. Everything is rebuilt if there are no previous outputs or the years or basin
+are different.
+"""
+
+import numpy as np
+import os
+import sys
+import importlib
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hurricane_summary
+from functions.track_store import open_tracks
+from functions.incremental import storm_fingerprints, read_fingerprints, write_fingerprints, compare_fingerprints, \
+    merge_rows
+from functions.trace import span, traced
+storms_summary = importlib.import_module('storms_1970-2019_summary')
+storms_analysis = importlib.import_module('storms_1970-2019_analysis')
+storms_plotting = importlib.import_module('storms_1970-2019_plotting')
+pd.set_option('display.width', 320, "display.max_columns", 10)  # for display in pycharm console
+
+# variables used by hurricane_summary.py and storms_1970-2019_summary.py
+FINGERPRINT_VARIABLES = ['time', 'basin', 'name'] + storms_summary.LANDFALL_VARIABLES[1:]
+
+
+def full_rebuild(f, years, bsin):
+    hurricane_summary.main(f, years, bsin)
+    storms_summary.main(f, years)
+    storms_analysis.main(f, years)
+    storms_plotting.main(os.path.join(os.path.dirname(f), 'NA_landfall_summary_1970-2019.csv'))
+
+
+@traced()
+def main(f, years, bsin='NA'):
+    sDir = os.path.dirname(f)
+    summary_file = os.path.join(sDir, 'summary_1970-2019.csv')
+    landfall_file = os.path.join(sDir, 'NA_landfall_summary_1970-2019.csv')
+    fp_file = os.path.join(sDir, 'storm_fingerprints.json')
+    params = dict(years=[int(y) for y in years], basin=bsin)
+
+    yrs = np.arange(years[0], years[1] + 1, 1)
+
+    with span('storm fingerprints'):
+        fingerprints = storm_fingerprints(open_tracks(f, variables=FINGERPRINT_VARIABLES, decode_times=False),
+                                          FINGERPRINT_VARIABLES)
+    old_params, old_fingerprints = read_fingerprints(fp_file)
+
+    if old_params != params or not all([os.path.isfile(x) for x in [summary_file, landfall_file]]):
+        print('Full rebuild')
+        full_rebuild(f, years, bsin)
+        write_fingerprints(fp_file, params, fingerprints)
+        return
+
+    updated, dropped, remap = compare_fingerprints(old_fingerprints, fingerprints)
+    print('{} new or changed storms, {} changed or removed storms'.format(len(updated), len(dropped)))
+    if len(updated) + len(dropped) == 0:
+        return
+
+    # summarize the new and changed storms
+    with span('summarize updated storms', storms=len(updated)):
+        ncfile = open_tracks(f, variables=['time', 'basin'], storms=updated, decode_times=False)
+        sf_new = hurricane_summary.summarize_storms(ncfile, yrs, bsin,
+                                                    storms=np.flatnonzero(np.isin(ncfile['storm'].values, updated)))
+        ncfile = open_tracks(f, variables=storms_summary.LANDFALL_VARIABLES, storms=sf_new['findex'].values)
+        lf_new = storms_summary.landfall_summary(ncfile, sf_new['findex'].values, yrs)
+
+    # merge into the existing outputs
+    affected_years = set(sf_new['year'])
+    changed = []
+    for fname, new_rows in [(summary_file, sf_new), (landfall_file, lf_new)]:
+        df = pd.read_csv(fname, keep_default_na=False, na_values=[''], float_precision='round_trip')
+        removed = df[~df['findex'].isin(list(remap))]
+        affected_years.update(removed['year'])
+        if len(removed) + len(new_rows) > 0:
+            merge_rows(df, new_rows, remap).to_csv(fname, index=False)
+            changed.append(fname)
+        elif not np.array_equal(df['findex'].values, df['findex'].map(remap).values):
+            # unchanged rows, but the storm indices are different in the new release
+            df['findex'] = df['findex'].map(remap).astype(int)
+            df.to_csv(fname, index=False)
+    print('Affected years: {}'.format(sorted([int(y) for y in affected_years])))
+
+    # regenerate the figures made from the outputs that changed
+    if summary_file in changed:
+        storms_analysis.main(f, years)
+    if landfall_file in changed:
+        storms_plotting.main(landfall_file)
+
+    write_fingerprints(fp_file, params, fingerprints)
+
+
+if __name__ == '__main__':
+    fpath = '/Users/lgarzio/Documents/rucool/hurricanes/storms_1970-2019/IBTrACS.NA.v04r00.nc'
+    yrs = [1970, 2019]  # start and end year
+    basin = 'NA'  # 'NA', 'all'
+    main(fpath, yrs, basin)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the tests import the functions package from the repository root, like the scripts
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import types
+import pytest
+import hurricane_tools
+from functions import track_store
+
+
+def fake_module(monkeypatch, name, calls, functions):
+    # script module that records the calls of its functions instead of running them
+    module = types.ModuleType(name)
+    for func, result in functions.items():
+        def record(*args, func=func, result=result, **kwargs):
+            calls.append(('{}.{}'.format(name, func), args, kwargs))
+            return result
+        setattr(module, func, record)
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    for name in ['hurricane_summary', 'storms_1970-2019_summary', 'effect_size_storms', 'plot_hurricane_tracks',
+                 'plot_storm_tracks_global', 'export_storm_tracks']:
+        fake_module(monkeypatch, name, calls, dict(main=None))
+    fake_module(monkeypatch, 'storms_1970-2019_analysis', calls,
+                dict(main=({1970: 1}, {1970: 0}), landfall_counts=({1970: 2}, {1970: 1}), export_df=None))
+    monkeypatch.setattr(track_store, 'open_tracks', lambda *args, **kwargs: None)
+    return calls
+
+
+@pytest.mark.parametrize('argv, expected', [
+    (['summary', 'IBTrACS.nc', '--years', '1970', '2019'], 'hurricane_summary.main'),
+    (['landfalls', 'IBTrACS.nc', '--years', '1970', '2019'], 'storms_1970-2019_summary.main'),
+    (['match', 'locations.csv', 'landfalls.csv', '-k', '3'], 'effect_size_storms.main'),
+    (['map-na', 'IBTrACS.nc', '--years', '2000', '2019', '--country-index', 'country_index.pkl'],
+     'plot_hurricane_tracks.main'),
+    (['map-global', 'IBTrACS.nc', '--years', '2019', '--tiles', 'tiles.mbtiles', '--zooms', '0', '7'],
+     'plot_storm_tracks_global.main'),
+    (['kml', 'IBTrACS.nc', '--years', '2019', '--basins', 'NA', 'EP'], 'export_storm_tracks.main'),
+])
+def test_subcommand_runs_its_script(calls, argv, expected):
+    hurricane_tools.main(argv)
+    assert [c[0] for c in calls] == [expected]
+
+
+def test_counts(calls, tmp_path):
+    (tmp_path / 'summary_1970-2019.csv').write_text('findex\n0\n1\n')
+    hurricane_tools.main(['counts', str(tmp_path / 'IBTrACS.nc'), '--years', '1970', '2019'])
+    assert [c[0] for c in calls] == ['storms_1970-2019_analysis.landfall_counts', 'storms_1970-2019_analysis.export_df',
+                                     'storms_1970-2019_analysis.export_df']
+    assert calls[1][1][0] == {1970: 2}
+
+
+def test_counts_with_maps(calls, tmp_path):
+    hurricane_tools.main(['counts', str(tmp_path / 'IBTrACS.nc'), '--years', '1970', '2019', '--maps'])
+    # the counts of the maps are exported, they aren't counted again
+    assert [c[0] for c in calls] == ['storms_1970-2019_analysis.main', 'storms_1970-2019_analysis.export_df',
+                                     'storms_1970-2019_analysis.export_df']
+    assert calls[1][1][0] == {1970: 1}
+
+
+def test_csv_tasks_dont_load_the_plotting_libraries():
+    # in a new process, the other tests may have loaded matplotlib already
+    code = ('import sys, importlib, hurricane_tools\n'
+            'from functions.track_store import open_tracks\n'
+            'importlib.import_module("storms_1970-2019_analysis")\n'
+            'print(sorted(m for m in sys.modules if m.startswith(("matplotlib", "cartopy"))))')
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, '-c', code], cwd=repo, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import shapely
+from functions.countries import country_index, load_country_index, track_crossings, impact_flags
+from functions.ragged import RaggedTracks
+
+
+def make_index():
+    # USA and Mexico share a border at 100W, Bahamas has two islands, XXX is on the path of a straight line between
+    # 179.5E and 179.5W drawn the wrong way around the globe
+    boxes = [('USA', 'United States', (-100, 25, -80, 40)),
+             ('MEX', 'Mexico', (-110, 15, -100, 30)),
+             ('BHS', 'Bahamas', (-78, 24, -77.5, 24.5)),
+             ('BHS', 'Bahamas', (-77, 24, -76.5, 24.5)),
+             ('XXX', 'Somewhere', (0, -20, 10, -10))]
+    return country_index([shapely.box(*b) for _, _, b in boxes], [c for c, _, _ in boxes], [n for _, n, _ in boxes])
+
+
+def make_tracks(tracks):
+    # tracks: list of lists of (lon, lat), 6-hourly observations starting on 2020-09-01
+    lon = np.concatenate([[p[0] for p in t] for t in tracks]).astype('float32')
+    lat = np.concatenate([[p[1] for p in t] for t in tracks]).astype('float32')
+    tm = np.concatenate([np.datetime64('2020-09-01T00') + np.arange(len(t)) * np.timedelta64(6, 'h') for t in tracks])
+    offsets = np.concatenate([[0], np.cumsum([len(t) for t in tracks])]).astype('int64')
+    n = len(tracks)
+    sid = np.array(['SID{}'.format(i) for i in range(n)])
+    name = np.array(['STORM{}'.format(i) for i in range(n)])
+    data = dict(time=tm.astype('datetime64[ns]'), lon=lon, lat=lat)
+    return RaggedTracks(data, offsets, np.arange(n) + 100, sid, name)
+
+
+def test_ocean_to_land_landfall():
+    crossings = track_crossings(make_index(), make_tracks([[(-75, 30), (-85, 30), (-90, 32)]]))
+    assert len(crossings) == 1
+    row = crossings.iloc[0]
+    assert (row['findex'], row['country'], row['obs'], bool(row['landfall'])) == (100, 'USA', 0, True)
+    assert np.isclose(row['lon'], -80) and np.isclose(row['lat'], 30)
+    # half way between the observations at 00:00 and 06:00
+    assert row['time'] == np.datetime64('2020-09-01T03:00')
+
+
+def test_land_border_crossing():
+    crossings = track_crossings(make_index(), make_tracks([[(-115, 20), (-105, 25), (-95, 27)]]))
+    assert crossings['country'].tolist() == ['MEX', 'USA']
+    assert crossings['obs'].tolist() == [0, 1]
+    assert crossings['landfall'].tolist() == [True, False]
+    assert np.isclose(crossings['lon'].iloc[1], -100)
+
+
+def test_island_country_is_one_crossing_per_segment():
+    crossings = track_crossings(make_index(), make_tracks([[(-79, 24.25), (-76, 24.25)]]))
+    assert len(crossings) == 1
+    assert crossings['country'].iloc[0] == 'BHS'
+    # the first island the segment enters
+    assert np.isclose(crossings['lon'].iloc[0], -78)
+
+
+def test_antimeridian_segment_is_skipped():
+    crossings = track_crossings(make_index(), make_tracks([[(179, -17), (179.5, -17), (-179.5, -17), (-179, -17)]]))
+    assert len(crossings) == 0
+
+
+def test_crossings_of_several_storms_and_impact_flags():
+    tracks = make_tracks([[(-75, 30), (-85, 30)],
+                          [(-79, 24.25), (-76, 24.25)],
+                          [(-115, 20), (-105, 25), (-95, 27)]])
+    crossings = track_crossings(make_index(), tracks)
+    assert crossings['findex'].tolist() == [100, 101, 102, 102]
+    assert crossings['sid'].tolist() == ['SID0', 'SID1', 'SID2', 'SID2']
+
+    flags = impact_flags(crossings, [100, 101, 102, 103])
+    assert flags['usimpact'].tolist() == ['yes', 'no', 'yes', 'no']
+    assert flags['mexicoimpact'].tolist() == ['no', 'no', 'yes', 'no']
+    assert flags['canadaimpact'].tolist() == ['no', 'no', 'no', 'no']
+
+
+def test_missing_country_index_is_not_built(tmp_path):
+    # the maps don't download Natural Earth, the index is built with build_country_index.py
+    with pytest.raises(FileNotFoundError, match='build_country_index.py'):
+        load_country_index(str(tmp_path / 'country_index.pkl'))
+    assert not (tmp_path / 'country_index.pkl').exists()
@@ -0,0 +1,56 @@
+import numpy as np
+from functions.intensity import window_change, intensity_summary
+
+NAT = np.datetime64('NaT', 'ns')
+
+
+def hours(*h):
+    return [np.datetime64('2020-09-01T00', 'ns') + np.timedelta64(int(x), 'h') if x is not None else NAT for x in h]
+
+
+def test_change_over_window():
+    tm = np.array([hours(0, 6, 12, 18, 24, 30)])
+    wind = np.array([[30., 35., 45., 60., 70., 65.]])
+    change = window_change(tm, wind, 24)
+    np.testing.assert_array_equal(change, [[40., 30., np.nan, np.nan, np.nan, np.nan]])
+
+
+def test_off_synoptic_observation_does_not_shift_the_window():
+    # landfall observation at 09:00 between the synoptic times
+    tm = np.array([hours(0, 6, 9, 12, 18, 24, 30)])
+    wind = np.array([[30., 35., 40., 45., 60., 70., 65.]])
+    change = window_change(tm, wind, 24)
+    # 00:00 -> 24:00 and 06:00 -> 30:00, there is no observation 24 hours after 09:00
+    np.testing.assert_array_equal(change[0, :3], [40., 30., np.nan])
+
+
+def test_missing_values_and_padding():
+    tm = np.array([hours(0, 6, 12, 18, None, None)])
+    wind = np.array([[30., np.nan, 45., 60., np.nan, np.nan]])
+    change = window_change(tm, wind, 6)
+    np.testing.assert_array_equal(change, [[np.nan, np.nan, 15., np.nan, np.nan, np.nan]])
+
+
+def test_window_stays_in_its_storm():
+    # the second storm starts 24 hours after the first one, the change is never taken across storms
+    tm = np.array([hours(0, 6, 12, None), hours(24, 30, 36, 42)])
+    wind = np.array([[30., 35., 40., np.nan], [80., 85., 90., 95.]])
+    change = window_change(tm, wind, 24)
+    assert np.all(np.isnan(change[0]))
+    assert np.all(np.isnan(change[1]))
+    np.testing.assert_array_equal(window_change(tm, wind, 12), [[10., np.nan, np.nan, np.nan],
+                                                                  [10., 10., np.nan, np.nan]])
+
+
+def test_off_synoptic_observation_does_not_split_an_ri_episode():
+    # RI (>= 30 kt in 24 hours) from 00:00 through 18:00, the 09:00 landfall observation has no window match
+    tm = np.array([hours(0, 6, 9, 12, 18, 24, 30, 36, 42, 48)])
+    wind = np.array([[30., 35., 38., 40., 45., 60., 70., 75., 80., 80.]])
+    arrays = dict(time=tm, usa_wind=wind, usa_pres=1000 - wind, usa_sshs=np.zeros(wind.shape),
+                  landfall=np.array([[500., 500., 50., 500., 500., 500., 500., 500., 500., 0.]]),
+                  findex=np.array([0]), sid=np.array(['SID0']), name=np.array(['STORM0']))
+    summary = intensity_summary(arrays)
+    assert summary['ri_episodes'][0] == 1
+    assert summary['first_ri_time'][0] == tm[0, 0]
+    # the episode ends at 18:00 + 24 hours, within 48 hours before the landfall at 48:00
+    assert summary['ri_before_landfall'][0] == 1
@@ -0,0 +1,46 @@
+import numpy as np
+from functions.landfall import prelandfall_windows, window_index
+
+
+def hours(*h):
+    return np.datetime64('2020-09-01T00', 'ns') + np.array(h) * np.timedelta64(1, 'h')
+
+
+# storm 0: 6-hourly from 2020-09-01 00:00 to 09-02 00:00, storm 1 starts 12 hours earlier and overlaps it in time
+TM = np.concatenate([hours(0, 6, 12, 18, 24), hours(-12, -6, 0, 6)])
+OFFSETS = np.array([0, 5, 9])
+
+
+def test_window_before_landfall():
+    start, stop = prelandfall_windows(TM, OFFSETS, [0], [4], days=0.5)
+    # 12 hours before the landfall at 24:00 to the landfall
+    assert (start.tolist(), stop.tolist()) == ([2], [5])
+
+
+def test_window_ends_at_last_point_of_landfall():
+    start, stop = prelandfall_windows(TM, OFFSETS, [0], [2], last=[3], days=0.25)
+    assert (start.tolist(), stop.tolist()) == ([1], [4])
+
+
+def test_window_stays_in_its_storm():
+    # 3 days before the 06:00 point of storm 1 would include all of storm 0 if the storms weren't separated
+    start, stop = prelandfall_windows(TM, OFFSETS, [1, 0], [8, 1], days=3)
+    assert (start.tolist(), stop.tolist()) == ([5, 0], [9, 2])
+
+
+def test_off_synoptic_landfall_time():
+    tm = np.concatenate([hours(0, 6, 9, 12)])
+    start, stop = prelandfall_windows(tm, np.array([0, 4]), [0], [2], days=0.125)
+    # 3 hours before the landfall at 09:00 is 06:00
+    assert (start.tolist(), stop.tolist()) == ([1], [3])
+
+
+def test_no_landfalls():
+    start, stop = prelandfall_windows(TM, OFFSETS, [], [])
+    assert len(start) == 0 and len(stop) == 0
+
+
+def test_window_index():
+    window, ind = window_index(np.array([2, 5]), np.array([5, 7]))
+    assert window.tolist() == [0, 0, 0, 1, 1]
+    assert ind.tolist() == [2, 3, 4, 5, 6]
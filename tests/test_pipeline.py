@@ -0,0 +1,29 @@
+import os
+from functions.pipeline import file_digest
+
+
+def test_file_digest_of_a_track_store_directory(tmp_path):
+    store = tmp_path / 'store.parquet'
+    (store / 'storm_basin=NA' / 'year=2020').mkdir(parents=True)
+    (store / '_attrs.json').write_text('{}')
+    part = store / 'storm_basin=NA' / 'year=2020' / 'part-0-0.parquet'
+    part.write_bytes(b'points')
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+
+    digest = file_digest(str(store), str(cache_dir))
+    assert digest == file_digest(str(store), str(cache_dir))
+
+    # rebuilding a partition changes the digest
+    part.write_bytes(b'more points')
+    assert file_digest(str(store), str(cache_dir)) != digest
+
+
+def test_file_digest_of_a_file(tmp_path):
+    f = tmp_path / 'IBTrACS.nc'
+    f.write_bytes(b'tracks')
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    digest = file_digest(str(f), str(cache_dir))
+    assert len(digest) == 40
+    assert os.path.isfile(cache_dir / 'digests.json')
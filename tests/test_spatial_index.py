@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from functions.spatial_index import query_box, query_polygon
+
+
+def make_index():
+    points = pd.DataFrame(dict(sid=['A', 'A', 'B', 'C'], findex=[0, 0, 1, 2], obs=[0, 1, 0, 0],
+                               time=pd.to_datetime(['2019-09-01', '2019-09-02', '2020-09-01', '2020-09-01']),
+                               lat=[-10., -12., -10., 50.], lon=[175., -175., 0., 179.9]))
+    return dict(points=points)
+
+
+def test_query_box():
+    assert query_box(make_index(), [-10, 10, -30, 0])['sid'].tolist() == ['B']
+
+
+def test_query_box_across_antimeridian():
+    result = query_box(make_index(), [170, -170, -30, 0])
+    np.testing.assert_array_equal(result['lon'], [175, -175])
+
+
+def test_query_box_time_window():
+    result = query_box(make_index(), [170, -170, -30, 0], t0='2019-09-02')
+    assert result['obs'].tolist() == [1]
+
+
+def test_query_polygon():
+    result = query_polygon(make_index(), [[-10, -30], [10, -30], [10, 0], [-10, 0]])
+    assert result['sid'].tolist() == ['B']
+
+
+def test_query_polygon_across_antimeridian():
+    # the same polygon with the longitudes on either side of the antimeridian, or past 180
+    for polygon in [[[170, -30], [-170, -30], [-170, 0], [170, 0]], [[170, -30], [190, -30], [190, 0], [170, 0]],
+                    [[-170, -30], [170, -30], [170, 0], [-170, 0]]]:
+        result = query_polygon(make_index(), polygon)
+        np.testing.assert_array_equal(result['lon'], [175, -175])
@@ -0,0 +1,13 @@
+import json
+import numpy as np
+from functions.tiles import write_track_tiles
+
+
+def test_metadata_bounds_are_wrapped_to_180(tmp_path):
+    # track in 0 to 360 degrees east, from 178.2W to 171.3W
+    layer = dict(lons=[np.array([181.8, 185., 188.7])], lats=[np.array([-37.7, 10., 55.8])], style=dict(color='r'))
+    write_track_tiles([layer], str(tmp_path / 'tiles'), zooms=[0, 1], workers=1)
+    with open(tmp_path / 'tiles' / 'metadata.json') as fp:
+        metadata = json.load(fp)
+    assert metadata['bounds'] == '-178.2000,-37.7000,-171.3000,55.8000'
+    assert metadata['center'] == '-174.7500,9.0500,0'